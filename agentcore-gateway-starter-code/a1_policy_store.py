@@ -0,0 +1,320 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Store of deployed A1 policies with idempotent upserts.
+
+Each policy is keyed by a content hash of its type, slice and parameters,
+so deploying an identical policy again only adds a consumer to the
+existing one. A slice holds one policy per type; deploying a different
+one is a conflict unless the caller replaces (supersedes) it, which is
+what plan executions do: the newest plan's policy wins. Consumers are
+reference counted like E2 subscriptions: the policy is deleted from the
+RIC with its last one.
+
+Policies live in the plan store, one record per slice plus one record per
+policy id pointing back to its slice, so every Lambda container sees the
+same ones. Records change only through conditional writes, retried on
+conflict.
+"""
+
+import hashlib
+import json
+import threading
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from plan_store import CONDITIONAL_WRITE_ATTEMPTS, PlanConflictError, get_plan_store
+
+# Plan store record types
+A1_SLICE_RECORD = "a1_slice"
+A1_POLICY_RECORD = "a1_policy"
+
+
+def policy_hash(policy_type: str, s_nssai: str, policy_params: Dict[str, Any]) -> str:
+    body = json.dumps({"type": policy_type, "slice": s_nssai, "params": policy_params}, sort_keys=True, default=str)
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+def changed_params(current: Dict[str, Any], params: Dict[str, Any]) -> List[str]:
+    return sorted(k for k in set(current) | set(params) if current.get(k) != params.get(k))
+
+
+def _slice_record_id(s_nssai: str) -> str:
+    return f"a1-slice#{s_nssai}"
+
+
+class A1PolicyConflictError(Exception):
+    """A different policy of the same type is already deployed on the slice, or requested in the same batch"""
+
+    def __init__(self, policy_type: str, s_nssai: str, existing_id: Optional[str], parameters: List[str]):
+        if existing_id is None:
+            message = f"{policy_type} policies for slice {s_nssai} in the same batch disagree on {parameters}"
+        else:
+            message = f"{policy_type} policy {existing_id} on slice {s_nssai} already sets {parameters}"
+        super().__init__(message)
+        self.policy_id = existing_id
+        self.parameters = parameters
+
+
+class A1Policy:
+    def __init__(self, policy_id: str, policy_type: str, s_nssai: str, policy_params: Dict[str, Any],
+                 content_hash: str, consumers: Iterable[str] = ()):
+        self.policy_id = policy_id
+        self.policy_type = policy_type
+        self.s_nssai = s_nssai
+        self.policy_params = policy_params
+        self.content_hash = content_hash
+        self.consumers = set(consumers)
+        # Policies this one replaced when it was deployed
+        self.superseded: List["A1Policy"] = []
+
+    @classmethod
+    def from_entry(cls, policy_type: str, s_nssai: str, entry: dict) -> "A1Policy":
+        return cls(entry["policyId"], policy_type, s_nssai, entry["params"], entry["contentHash"], entry["consumers"])
+
+    def entry(self) -> dict:
+        return {"policyId": self.policy_id, "params": self.policy_params, "contentHash": self.content_hash,
+                "consumers": sorted(self.consumers)}
+
+    def describe(self) -> dict:
+        return {
+            "policyId": self.policy_id,
+            "policyType": self.policy_type,
+            "sNssai": self.s_nssai,
+            "params": self.policy_params,
+            "consumers": len(self.consumers),
+        }
+
+
+class A1PolicyStore:
+    """Deployed policies per (slice, policy type), kept in the shared plan store"""
+
+    def __init__(self, deploy: Optional[Callable[[List[Tuple[str, str, Dict[str, Any]]]], List[str]]] = None,
+                 delete: Optional[Callable[[str], None]] = None, store=None):
+        # Southbound calls; deploy takes a batch and returns one policy id per entry
+        self._deploy = deploy or _deploy_on_ric
+        self._delete = delete or _delete_on_ric
+        self.store = store or get_plan_store()
+        self._lock = threading.Lock()
+        # Counted per process
+        self.deployed = 0
+        self.unchanged = 0
+
+    def _slice_record(self, s_nssai: str) -> Optional[dict]:
+        return self.store.get(_slice_record_id(s_nssai), A1_SLICE_RECORD, consistent=True)
+
+    def conflict(self, policy_type: str, s_nssai: str, policy_params: Dict[str, Any]) -> Optional[A1Policy]:
+        """The deployed policy this one would contradict, if any"""
+        entry = ((self._slice_record(s_nssai) or {}).get("policies") or {}).get(policy_type)
+        if entry is None or entry["contentHash"] == policy_hash(policy_type, s_nssai, policy_params):
+            return None
+        return A1Policy.from_entry(policy_type, s_nssai, entry)
+
+    def upsert(self, policy_type: str, s_nssai: str, policy_params: Dict[str, Any],
+               consumer: Optional[str] = None, replace: bool = False) -> Tuple[A1Policy, bool]:
+        """Deploy a policy unless an identical one exists; returns (policy, unchanged)"""
+        return self.upsert_batch([(policy_type, s_nssai, policy_params)], consumer, replace)[0]
+
+    def upsert_batch(self, policies: List[Tuple[str, str, Dict[str, Any]]], consumer: Optional[str] = None,
+                     replace: bool = False) -> List[Tuple[A1Policy, bool]]:
+        """Deploy several policies in one southbound call.
+
+        Raises A1PolicyConflictError before deploying anything when two
+        entries of the batch disagree, or when one contradicts a deployed
+        policy unless replace is set, in which case the contradicted
+        policies are superseded and removed. Each slice's record is
+        written separately, so the batch is all or nothing per slice.
+        """
+        consumer = consumer or f"anonymous-{uuid.uuid4().hex[:8]}"
+        return self._upsert(policies, [consumer], replace)
+
+    def restore(self, policy: A1Policy) -> A1Policy:
+        """Deploy a superseded policy again for its former consumers"""
+        restored, _ = self._upsert([(policy.policy_type, policy.s_nssai, policy.policy_params)],
+                                   sorted(policy.consumers), replace=True)[0]
+        return restored
+
+    def _upsert(self, policies: List[Tuple[str, str, Dict[str, Any]]], consumers: List[str],
+                replace: bool) -> List[Tuple[A1Policy, bool]]:
+        hashes = [policy_hash(*policy) for policy in policies]
+        batch_slots: Dict[Tuple[str, str], Tuple[str, Dict[str, Any]]] = {}
+        by_slice: Dict[str, List[int]] = {}
+        for i, ((policy_type, s_nssai, params), content_hash) in enumerate(zip(policies, hashes)):
+            first_hash, first_params = batch_slots.setdefault((s_nssai, policy_type), (content_hash, params))
+            if first_hash != content_hash:
+                raise A1PolicyConflictError(policy_type, s_nssai, None, changed_params(first_params, params))
+            by_slice.setdefault(s_nssai, []).append(i)
+
+        # Content hash -> policy id deployed by this call, and the ids it ended up using
+        deployed: Dict[str, str] = {}
+        used = set()
+        superseded: List[A1Policy] = []
+        results: Dict[int, Tuple[A1Policy, bool]] = {}
+        pending = list(by_slice)
+        try:
+            for _ in range(CONDITIONAL_WRITE_ATTEMPTS):
+                records = {s_nssai: self._slice_record(s_nssai) for s_nssai in pending}
+                missing = {}
+                for s_nssai in pending:
+                    current = (records[s_nssai] or {}).get("policies") or {}
+                    for i in by_slice[s_nssai]:
+                        policy_type, _, params = policies[i]
+                        entry = current.get(policy_type)
+                        if entry is not None and entry["contentHash"] != hashes[i] and not replace:
+                            raise A1PolicyConflictError(policy_type, s_nssai, entry["policyId"],
+                                                        changed_params(entry["params"], params))
+                        if (entry is None or entry["contentHash"] != hashes[i]) and hashes[i] not in deployed:
+                            missing[hashes[i]] = policies[i]
+                if missing:
+                    policy_ids = self._deploy(list(missing.values()))
+                    deployed.update(zip(missing, policy_ids))
+                    with self._lock:
+                        self.deployed += len(missing)
+                for s_nssai in list(pending):
+                    if not self._write_slice(s_nssai, records[s_nssai], policies, hashes, by_slice[s_nssai],
+                                             consumers, deployed, used, superseded, results):
+                        break
+                    pending.remove(s_nssai)
+                if not pending:
+                    break
+            else:
+                raise PlanConflictError(f"A1 policies of slices {pending} kept changing; gave up after "
+                                        f"{CONDITIONAL_WRITE_ATTEMPTS} attempts")
+        finally:
+            # Deployed for an attempt that lost to an identical policy written concurrently
+            for content_hash, policy_id in deployed.items():
+                if policy_id not in used:
+                    self._delete(policy_id)
+        for old in superseded:
+            self._forget_index(old.policy_id)
+            self._delete(old.policy_id)
+        with self._lock:
+            self.unchanged += sum(unchanged for _, unchanged in results.values())
+        return [results[i] for i in range(len(policies))]
+
+    def _write_slice(self, s_nssai: str, record: Optional[dict], policies, hashes, indexes: List[int],
+                     consumers: List[str], deployed: Dict[str, str], used: set, superseded: List[A1Policy],
+                     results: Dict[int, Tuple[A1Policy, bool]]) -> bool:
+        """Apply this call's policies to one slice record; False if it changed since it was read"""
+        entries = dict((record or {}).get("policies") or {})
+        replaced, created, slice_results = [], [], {}
+        for i in indexes:
+            policy_type, _, params = policies[i]
+            entry = entries.get(policy_type)
+            same = entry is not None and entry["contentHash"] == hashes[i]
+            if entry is not None and not same:
+                replaced.append(A1Policy.from_entry(policy_type, s_nssai, entry))
+            if same:
+                policy = A1Policy.from_entry(policy_type, s_nssai, entry)
+            else:
+                policy = A1Policy(deployed[hashes[i]], policy_type, s_nssai, params, hashes[i])
+                created.append(policy)
+            # A repeat within the batch of a policy this call deployed is not "unchanged"
+            unchanged = same and entry["policyId"] != deployed.get(hashes[i])
+            policy.consumers.update(consumers)
+            entries[policy_type] = policy.entry()
+            slice_results[i] = (policy, unchanged)
+        try:
+            if record is None:
+                self.store.create({"planId": _slice_record_id(s_nssai), "type": A1_SLICE_RECORD,
+                                   "sNssai": s_nssai, "policies": entries})
+            elif entries != record.get("policies"):
+                self.store.update(record, policies=entries)
+        except PlanConflictError:
+            return False
+        for policy in created:
+            used.add(policy.policy_id)
+            self.store.create({"planId": policy.policy_id, "type": A1_POLICY_RECORD, "sNssai": s_nssai,
+                               "policyType": policy.policy_type})
+        for policy, _ in slice_results.values():
+            policy.superseded = [old for old in replaced if old.policy_type == policy.policy_type]
+        superseded.extend(replaced)
+        results.update(slice_results)
+        return True
+
+    def _forget_index(self, policy_id: str):
+        index = self.store.get(policy_id, A1_POLICY_RECORD, consistent=True)
+        if index is not None:
+            try:
+                self.store.delete(index)
+            except PlanConflictError:
+                pass
+
+    def release(self, policy_id: str, consumer: Optional[str] = None) -> Optional[int]:
+        """Drop a consumer, or every consumer when none is given.
+
+        Returns the consumers left (0 once deleted), or None for an
+        unknown policy.
+        """
+        index = self.store.get(policy_id, A1_POLICY_RECORD, consistent=True)
+        if index is None:
+            return None
+        policy_type = index["policyType"]
+        for _ in range(CONDITIONAL_WRITE_ATTEMPTS):
+            record = self._slice_record(index["sNssai"])
+            entries = dict((record or {}).get("policies") or {})
+            entry = entries.get(policy_type)
+            if entry is None or entry["policyId"] != policy_id:
+                return None
+            if consumer is not None and consumer not in entry["consumers"]:
+                return len(entry["consumers"])
+            consumers = [] if consumer is None else [c for c in entry["consumers"] if c != consumer]
+            if consumers:
+                entries[policy_type] = dict(entry, consumers=consumers)
+            else:
+                del entries[policy_type]
+            try:
+                self.store.update(record, policies=entries)
+            except PlanConflictError:
+                continue
+            if consumers:
+                return len(consumers)
+            self._forget_index(policy_id)
+            self._delete(policy_id)
+            return 0
+        raise PlanConflictError(f"A1 policy {policy_id} kept changing; gave up after "
+                                f"{CONDITIONAL_WRITE_ATTEMPTS} attempts")
+
+    def get(self, policy_id: str) -> Optional[dict]:
+        index = self.store.get(policy_id, A1_POLICY_RECORD, consistent=True)
+        if index is None:
+            return None
+        entry = ((self._slice_record(index["sNssai"]) or {}).get("policies") or {}).get(index["policyType"])
+        if entry is None or entry["policyId"] != policy_id:
+            return None
+        return A1Policy.from_entry(index["policyType"], index["sNssai"], entry).describe()
+
+    def slice_policies(self, s_nssai: str) -> List[dict]:
+        entries = (self._slice_record(s_nssai) or {}).get("policies") or {}
+        return [A1Policy.from_entry(policy_type, s_nssai, entry).describe()
+                for policy_type, entry in sorted(entries.items())]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"deployed": self.deployed, "unchanged": self.unchanged}
+
+
+def _deploy_on_ric(policies: List[Tuple[str, str, Dict[str, Any]]]) -> List[str]:
+    policy_ids = []
+    for policy_type, s_nssai, _ in policies:
+        policy_id = f"policy-{uuid.uuid4().hex[:8]}"
+        print(f"A1: Deployed policy {policy_id} for slice {s_nssai}")
+        policy_ids.append(policy_id)
+    return policy_ids
+
+
+def _delete_on_ric(policy_id: str):
+    print(f"A1: Deleted policy {policy_id}")
+
+
+_a1_policy_store: Optional[A1PolicyStore] = None
+_a1_policy_store_lock = threading.Lock()
+
+
+def get_a1_policy_store() -> A1PolicyStore:
+    """Process-wide store, kept across invocations of a warm Lambda container"""
+    global _a1_policy_store
+    with _a1_policy_store_lock:
+        if _a1_policy_store is None:
+            _a1_policy_store = A1PolicyStore()
+        return _a1_policy_store
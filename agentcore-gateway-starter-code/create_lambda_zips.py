@@ -3,6 +3,24 @@ import os
 import zipfile
 import json
 import ast
+import re
+
+# Local modules the generated handlers import, copied into every zip under their file name;
+# telemetry.py is shared with the MCP servers in the repository root
+SUPPORT_MODULES = [os.path.join("..", "telemetry.py"), "plan_store.py", "plan_executor.py", "oran_interfaces.py", "plan_optimizer.py", "e2_registry.py", "a1_policy_store.py", "v2x_predictor.py", "uav_allocator.py", "traffic_steering.py", "mimo_kernel.py", "energy_optimizer.py"]
+
+def extract_helper_functions():
+    """Extract the module-level _private helpers of smo_planner_extended.py that tools call"""
+    with open('smo_planner_extended.py', 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    tree = ast.parse(content)
+    lines = content.split('\n')
+    return {
+        node.name: '\n'.join(lines[node.lineno - 1:node.end_lineno])
+        for node in tree.body
+        if isinstance(node, ast.FunctionDef) and node.name.startswith('_') and not node.decorator_list
+    }
 
 def extract_tool_functions():
     """Extract all @tool decorated functions from smo_planner_extended.py"""
@@ -32,11 +50,10 @@ def extract_tool_functions():
                                                lines[actual_start - 1].strip() == ''):
                         actual_start -= 1
                     
-                    # Find actual end (next function or end of file)
-                    actual_end = func_end
+                    # Find actual end (next module-level statement or end of file)
+                    actual_end = len(lines)
                     for i in range(func_end, len(lines)):
-                        if lines[i].startswith('@tool') or lines[i].startswith('def ') or \
-                           lines[i].startswith('class ') or lines[i].startswith('if __name__'):
+                        if lines[i].strip() and not lines[i][0].isspace():
                             actual_end = i
                             break
                     
@@ -45,43 +62,40 @@ def extract_tool_functions():
     
     return tool_functions
 
-def create_lambda_handler(tool_name, tool_source):
+def create_lambda_handler(tool_name, tool_source, helpers=None):
     """Generate complete Lambda handler with actual tool function"""
     # Remove @tool decorator and add necessary imports
     clean_source = tool_source.replace('@tool\n', '').replace('@tool ', '')
+    # Shared helpers the tool calls, e.g. _execute_plan
+    helper_source = '\n\n'.join(
+        source for name, source in (helpers or {}).items() if re.search(rf'\b{name}\(', tool_source)
+    )
     
     return f'''import json
 import uuid
 from typing import Dict, List, Any, Optional
+from telemetry import configure_telemetry, instrument_tool
+from plan_store import PlanTooLargeError, get_plan_store
+from plan_executor import get_plan_executor
+# A1/E2/O1/O2 operations the tools depend on
+import oran_interfaces
+from plan_optimizer import merge_plans, merged_steps, plan_steps, plan_type_for
+
+configure_telemetry(server="{tool_name}")
 
 # Global storage (in production, use DynamoDB/RDS)
 active_plans = {{}}
 slice_registry = {{}}
 optimization_jobs = {{}}
-handover_policies = {{}}
-energy_profiles = {{}}
-interference_maps = {{}}
-
-# Helper functions that tools depend on
-def deploy_a1_policy(policy_type: str, s_nssai: str, policy_params: Dict[str, Any]):
-    policy_id = f"policy-{{uuid.uuid4().hex[:8]}}"
-    print(f"A1: Deployed policy {{policy_id}} for slice {{s_nssai}}")
-    return {{"policyId": policy_id, "status": "DEPLOYED"}}
 
-def configure_e2_subscription(node_id: str, metrics: List[str], reporting_period: int):
-    sub_id = f"e2sub-{{uuid.uuid4().hex[:8]}}"
-    print(f"E2: Configured subscription {{sub_id}} for node {{node_id}}")
-    return {{"subscriptionId": sub_id, "status": "ACTIVE"}}
+# Plans created by one Lambda are executed by another: set PLAN_TABLE_NAME to share them through DynamoDB
+plan_store = get_plan_store()
 
-def configure_slice_parameters(node_id: str, s_nssai: str, slice_config: Dict[str, Any]):
-    config_id = f"o1cfg-{{uuid.uuid4().hex[:8]}}"
-    print(f"O1: Applied slice config {{config_id}} to node {{node_id}}")
-    return {{"configId": config_id, "status": "APPLIED"}}
+# Runs plan steps concurrently, with per-interface rate limits and rollback
+plan_executor = get_plan_executor()
 
-def instantiate_vnf(vnf_type: str, flavor: str, slice_id: str):
-    vnf_id = f"vnf-{{uuid.uuid4().hex[:8]}}"
-    print(f"O2: Instantiated VNF {{vnf_id}} of type {{vnf_type}}")
-    return {{"vnfId": vnf_id, "status": "INSTANTIATED"}}
+# Helpers shared by the tools
+{helper_source}
 
 # Main tool function
 {clean_source}
@@ -121,20 +135,22 @@ def lambda_handler(event, context):
         }}
 '''
 
-def create_zip_for_tool(tool_name, tool_source):
+def create_zip_for_tool(tool_name, tool_source, helpers=None):
     """Create deployment zip for a single tool"""
     zip_dir = f"lambda_zips/{tool_name}"
     os.makedirs(zip_dir, exist_ok=True)
     
     # Create lambda_function.py with actual tool code
-    handler_code = create_lambda_handler(tool_name, tool_source)
+    handler_code = create_lambda_handler(tool_name, tool_source, helpers)
     with open(f"{zip_dir}/lambda_function.py", "w", encoding='utf-8') as f:
         f.write(handler_code)
     
-    # Create deployment zip
+    # Create deployment zip, bundling the support modules the handler imports
     zip_path = f"lambda_zips/{tool_name}.zip"
     with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
         zipf.write(f"{zip_dir}/lambda_function.py", "lambda_function.py")
+        for module in SUPPORT_MODULES:
+            zipf.write(module, os.path.basename(module))
     
     print(f"Created {zip_path}")
     return zip_path
@@ -145,6 +161,7 @@ def main():
     
     try:
         tool_functions = extract_tool_functions()
+        helpers = extract_helper_functions()
         print(f"Found {len(tool_functions)} tool functions")
         
         os.makedirs("lambda_zips", exist_ok=True)
@@ -152,7 +169,7 @@ def main():
         created_zips = []
         for tool_name, tool_source in tool_functions.items():
             print(f"Processing {tool_name}...")
-            zip_path = create_zip_for_tool(tool_name, tool_source)
+            zip_path = create_zip_for_tool(tool_name, tool_source, helpers)
             created_zips.append(zip_path)
         
         print(f"\nSuccessfully created {len(created_zips)} Lambda deployment packages:")
@@ -0,0 +1,215 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Reference-counted registry of active E2 subscriptions.
+
+A subscription is identified by its node, its canonical metric set (trimmed,
+lower-cased, de-duplicated and sorted) and its reporting period. Asking
+for one that is already active returns the existing subscription and adds
+the caller as a consumer; the subscription is only torn down on the RIC
+when its last consumer releases it.
+
+Subscriptions and their consumers live in the plan store, so every Lambda
+container sees the same ones: one record per node holds that node's
+subscriptions, and one record per subscription id points back to its node.
+Records change only through conditional writes, retried on conflict.
+"""
+
+import threading
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from plan_store import CONDITIONAL_WRITE_ATTEMPTS, PlanConflictError, get_plan_store
+
+SubscriptionKey = Tuple[str, Tuple[str, ...], float]
+
+# Plan store record types
+E2_NODE_RECORD = "e2_node"
+E2_SUBSCRIPTION_RECORD = "e2_subscription"
+
+
+def canonical_metrics(metrics: Iterable[str]) -> Tuple[str, ...]:
+    return tuple(sorted({metric.strip().lower() for metric in metrics if metric.strip()}))
+
+
+def subscription_key(node_id: str, metrics: Iterable[str], reporting_period: float) -> SubscriptionKey:
+    return (node_id, canonical_metrics(metrics), float(reporting_period))
+
+
+def _slot(key: SubscriptionKey) -> str:
+    """Field of a subscription within its node record"""
+    return f"{','.join(key[1])}@{key[2]}"
+
+
+def _node_record_id(node_id: str) -> str:
+    return f"e2-node#{node_id}"
+
+
+class E2Subscription:
+    def __init__(self, subscription_id: str, key: SubscriptionKey, consumers: Iterable[str] = ()):
+        self.subscription_id = subscription_id
+        self.key = key
+        self.consumers: Set[str] = set(consumers)
+
+    @classmethod
+    def from_entry(cls, node_id: str, entry: dict) -> "E2Subscription":
+        key = (node_id, tuple(entry["metrics"]), float(entry["reportingPeriod"]))
+        return cls(entry["subscriptionId"], key, entry["consumers"])
+
+    def describe(self) -> dict:
+        node_id, metrics, period = self.key
+        return {
+            "subscriptionId": self.subscription_id,
+            "nodeId": node_id,
+            "metrics": list(metrics),
+            "reportingPeriod": period,
+            "consumers": len(self.consumers),
+        }
+
+
+class E2SubscriptionRegistry:
+    """Active subscriptions per node, kept in the shared plan store"""
+
+    def __init__(self, create: Optional[Callable[[str, List[str], float], str]] = None,
+                 delete: Optional[Callable[[str], None]] = None, store=None):
+        # Southbound calls; default to the simulated RIC
+        self._create = create or _create_on_ric
+        self._delete = delete or _delete_on_ric
+        self.store = store or get_plan_store()
+        self._lock = threading.Lock()
+        # Counted per process
+        self.created = 0
+        self.reused = 0
+
+    def _node_record(self, node_id: str) -> Optional[dict]:
+        return self.store.get(_node_record_id(node_id), E2_NODE_RECORD, consistent=True)
+
+    def acquire(self, node_id: str, metrics: Iterable[str], reporting_period: float,
+                consumer: Optional[str] = None) -> Tuple[E2Subscription, bool]:
+        """Return (subscription, reused) with consumer added to it"""
+        key = subscription_key(node_id, metrics, reporting_period)
+        slot = _slot(key)
+        consumer = consumer or f"anonymous-{uuid.uuid4().hex[:8]}"
+        # Created on the RIC by an attempt that then lost the write; reused by the next one
+        pending_id = None
+        for _ in range(CONDITIONAL_WRITE_ATTEMPTS):
+            record = self._node_record(node_id)
+            subscriptions = dict(record["subscriptions"]) if record else {}
+            entry = subscriptions.get(slot)
+            if entry is not None and pending_id is not None:
+                # Another container created it first
+                self._delete(pending_id)
+                pending_id = None
+            if entry is None:
+                pending_id = pending_id or self._create(node_id, list(key[1]), reporting_period)
+                entry = {"subscriptionId": pending_id, "metrics": list(key[1]), "reportingPeriod": key[2],
+                         "consumers": []}
+            if consumer not in entry["consumers"]:
+                entry = dict(entry, consumers=entry["consumers"] + [consumer])
+            subscriptions[slot] = entry
+            try:
+                if record is None:
+                    self.store.create({"planId": _node_record_id(node_id), "type": E2_NODE_RECORD,
+                                       "nodeId": node_id, "subscriptions": subscriptions})
+                else:
+                    self.store.update(record, subscriptions=subscriptions)
+            except PlanConflictError:
+                continue
+            reused = pending_id is None
+            if not reused:
+                self.store.create({"planId": pending_id, "type": E2_SUBSCRIPTION_RECORD, "nodeId": node_id})
+            with self._lock:
+                if reused:
+                    self.reused += 1
+                else:
+                    self.created += 1
+            return E2Subscription.from_entry(node_id, entry), reused
+        if pending_id is not None:
+            self._delete(pending_id)
+        raise PlanConflictError(f"E2 subscriptions of node {node_id} kept changing; gave up after "
+                                f"{CONDITIONAL_WRITE_ATTEMPTS} attempts")
+
+    def release(self, subscription_id: str, consumer: Optional[str] = None) -> Optional[int]:
+        """Drop a consumer, or every consumer when none is given.
+
+        Returns the consumers left (0 once torn down), or None for an
+        unknown subscription.
+        """
+        index = self.store.get(subscription_id, E2_SUBSCRIPTION_RECORD, consistent=True)
+        if index is None:
+            return None
+        for _ in range(CONDITIONAL_WRITE_ATTEMPTS):
+            record = self._node_record(index["nodeId"])
+            subscriptions = dict(record["subscriptions"]) if record else {}
+            slot = next((s for s, e in subscriptions.items() if e["subscriptionId"] == subscription_id), None)
+            if slot is None:
+                return None
+            entry = subscriptions[slot]
+            if consumer is not None and consumer not in entry["consumers"]:
+                return len(entry["consumers"])
+            consumers = [] if consumer is None else [c for c in entry["consumers"] if c != consumer]
+            if consumers:
+                subscriptions[slot] = dict(entry, consumers=consumers)
+            else:
+                del subscriptions[slot]
+            try:
+                self.store.update(record, subscriptions=subscriptions)
+            except PlanConflictError:
+                continue
+            if consumers:
+                return len(consumers)
+            try:
+                self.store.delete(index)
+            except PlanConflictError:
+                pass
+            self._delete(subscription_id)
+            return 0
+        raise PlanConflictError(f"E2 subscription {subscription_id} kept changing; gave up after "
+                                f"{CONDITIONAL_WRITE_ATTEMPTS} attempts")
+
+    def teardown_node(self, node_id: str) -> List[str]:
+        """Tear down every subscription on a node regardless of consumers"""
+        record = self._node_record(node_id)
+        ids = [e["subscriptionId"] for e in (record or {}).get("subscriptions", {}).values()]
+        return [sid for sid in ids if self.release(sid) == 0]
+
+    def get(self, subscription_id: str) -> Optional[dict]:
+        index = self.store.get(subscription_id, E2_SUBSCRIPTION_RECORD, consistent=True)
+        if index is None:
+            return None
+        return next((s.describe() for s in self._subscriptions(index["nodeId"])
+                     if s.subscription_id == subscription_id), None)
+
+    def node_subscriptions(self, node_id: str) -> List[dict]:
+        return [s.describe() for s in sorted(self._subscriptions(node_id), key=lambda s: s.subscription_id)]
+
+    def _subscriptions(self, node_id: str) -> List[E2Subscription]:
+        record = self._node_record(node_id)
+        return [E2Subscription.from_entry(node_id, e) for e in (record or {}).get("subscriptions", {}).values()]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"created": self.created, "reused": self.reused}
+
+
+def _create_on_ric(node_id: str, metrics: List[str], reporting_period: float) -> str:
+    sub_id = f"e2sub-{uuid.uuid4().hex[:8]}"
+    print(f"E2: Configured subscription {sub_id} for node {node_id}")
+    return sub_id
+
+
+def _delete_on_ric(subscription_id: str):
+    print(f"E2: Deleted subscription {subscription_id}")
+
+
+_e2_registry: Optional[E2SubscriptionRegistry] = None
+_e2_registry_lock = threading.Lock()
+
+
+def get_e2_registry() -> E2SubscriptionRegistry:
+    """Process-wide registry, kept across invocations of a warm Lambda container"""
+    global _e2_registry
+    with _e2_registry_lock:
+        if _e2_registry is None:
+            _e2_registry = E2SubscriptionRegistry()
+        return _e2_registry
@@ -0,0 +1,294 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Cell sleep scheduling from per-cell traffic load time series.
+
+Load samples arrive as columnar (cell, hour, load) arrays. The forecast
+keeps one exponentially weighted average per cell and hour of the day
+(or of the week), updated period by period, so a month of history and
+a single new batch of E2 samples go through the same ingest().
+
+Scheduling works on the whole (cells x hours) forecast at once. Cells in
+a coverage group hand their traffic to the group's awake cells, so
+within each group and hour cells may sleep, lightest load first, while
+the awake cells still carry the group's load under the load threshold
+and enough of them stay on for coverage. Runs of such hours at least
+MIN_SLEEP_HOURS long become candidate sleep windows, and windows are
+taken lightest first until the saving reaches the energy target.
+"""
+
+import re
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+SEASON_HOURS = 24
+# Weight of the newest period in the per-hour averages
+FORECAST_ALPHA = 0.3
+DEFAULT_TARGET_REDUCTION = 0.3
+# Awake cells of a group may carry up to this share of their capacity
+DEFAULT_MAX_LOAD = 0.7
+# Share of each coverage group that always stays awake (at least one cell)
+DEFAULT_MIN_AWAKE_SHARE = 0.25
+# Shorter sleep windows save too little for the switching they cost
+MIN_SLEEP_HOURS = 2
+# Power draw per cell: idle, extra at full load, and asleep by sleep mode
+IDLE_POWER_W = 400.0
+FULL_LOAD_POWER_W = 300.0
+SLEEP_POWER_W = {"light": 200.0, "advanced": 80.0, "deep": 30.0}
+DEFAULT_SLEEP_MODE = "advanced"
+# Sleep windows listed in a plan result, longest first; the totals cover all of them
+SLEEP_WINDOW_LIMIT = 50
+
+
+def parse_ratio(value: Any, default: float) -> float:
+    """0.3, 30 or "30%" as 0.3"""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float(value) / 100.0 if value > 1 else float(value)
+    match = re.fullmatch(r"\s*([0-9.]+)\s*(%?)\s*", str(value))
+    if not match:
+        return default
+    ratio = float(match.group(1))
+    return ratio / 100.0 if match.group(2) or ratio > 1 else ratio
+
+
+class SleepSchedule:
+    """Chosen sleep hours as a (cells, hours) mask with its energy figures"""
+
+    def __init__(self, sleep: np.ndarray, baseline_wh: float, saved_wh: float, target: float):
+        self.sleep = sleep
+        self.baseline_wh = baseline_wh
+        self.saved_wh = saved_wh
+        self.target = target
+
+    @property
+    def reduction(self) -> float:
+        return self.saved_wh / self.baseline_wh if self.baseline_wh else 0.0
+
+    def windows(self, cell_ids: Optional[Sequence[str]] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Sleep windows, longest first, as [start, end) hours of the season; end may wrap past 0"""
+        cell, start, length = _runs(self.sleep)
+        order = np.lexsort((start, cell, -length))[:limit]
+        name = (lambda i: cell_ids[i]) if cell_ids is not None else int
+        return [{"cell": name(cell[i]), "startHour": int(start[i]), "endHour": int((start[i] + length[i]) % self.sleep.shape[1]),
+                 "hours": int(length[i])}
+                for i in order]
+
+
+def _runs(mask: np.ndarray):
+    """(row, start, length) of every run of True along the rows of a 2D mask.
+
+    Rows are cyclic, so a run through the last column continues into the
+    first (a 22:00 to 06:00 night is one run).
+    """
+    padded = np.zeros((mask.shape[0], mask.shape[1] + 2), dtype=bool)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded.astype(np.int8), axis=1)
+    row, start = np.nonzero(edges == 1)
+    _, end = np.nonzero(edges == -1)
+    length = end - start
+    # Join the wrapping runs of rows that are not asleep throughout
+    wraps = mask[:, 0] & mask[:, -1] & ~mask.all(axis=1)
+    last = np.flatnonzero(np.r_[row[1:] != row[:-1], True]) if len(row) else row
+    first = np.flatnonzero(np.r_[True, row[1:] != row[:-1]]) if len(row) else row
+    joined = wraps[row[last]]
+    start[first[joined]] = start[last[joined]]
+    length[first[joined]] += length[last[joined]]
+    keep = np.ones(len(row), dtype=bool)
+    keep[last[joined]] = False
+    return row[keep], start[keep], length[keep]
+
+
+class EnergyOptimizer:
+    """Per-hour load forecast of a set of cells and sleep scheduling over it.
+
+    capacity is each cell's capacity in any common unit (loads are
+    fractions of it); cells sharing a group cover each other; coverage
+    cells never sleep.
+    """
+
+    def __init__(self, cells: int, capacity: Any = 1.0, group: Any = 0, coverage: Any = False,
+                 sleep_power_w: float = SLEEP_POWER_W[DEFAULT_SLEEP_MODE], season_hours: int = SEASON_HOURS,
+                 alpha: float = FORECAST_ALPHA):
+        self.capacity = np.broadcast_to(np.asarray(capacity, dtype=np.float64), (cells,)).copy()
+        self.group = np.unique(np.broadcast_to(np.asarray(group), (cells,)), return_inverse=True)[1].ravel()
+        self.coverage = np.broadcast_to(np.asarray(coverage, dtype=bool), (cells,)).copy()
+        self.sleep_power_w = sleep_power_w
+        self.season_hours = season_hours
+        self.alpha = alpha
+        # Forecast load per (cell, hour of season); NaN until first seen
+        self.forecast = np.full((cells, season_hours), np.nan)
+        # Sums and counts of the newest period, folded in once a later period starts
+        self.period = -1
+        self._sum = np.zeros(cells * season_hours)
+        self._count = np.zeros(cells * season_hours)
+
+    def _fold(self, total: np.ndarray, count: np.ndarray, out: np.ndarray) -> None:
+        """EWMA step of the per-slot means into out; first observations set the slot"""
+        seen = np.flatnonzero(count)
+        mean = total[seen] / count[seen]
+        previous = self.forecast.reshape(-1)[seen]
+        out[seen] = np.where(np.isnan(previous), mean, (1 - self.alpha) * previous + self.alpha * mean)
+
+    def ingest(self, cell: Any, hour: Any, load: Any) -> int:
+        """Add load samples, oldest period first; returns the periods folded in.
+
+        hour counts hours from any fixed origin, so hour // season_hours
+        is the period (day or week) of a sample. Samples of one cell and
+        hour within a period are averaged before they update the forecast,
+        so E2 reports can arrive in any batches: the newest period is held
+        open until samples of a later one arrive.
+        """
+        cell = np.asarray(cell, dtype=np.int64)
+        hour = np.asarray(hour, dtype=np.int64)
+        load = np.asarray(load, dtype=np.float64)
+        period = hour // self.season_hours
+        slot = cell * self.season_hours + hour % self.season_hours
+        order = np.argsort(period, kind='stable')
+        period, slot, load = period[order], slot[order], load[order]
+        bounds = np.flatnonzero(np.r_[True, period[1:] != period[:-1], True]) if len(period) else [0]
+        flat = self.forecast.reshape(-1)
+        folded = 0
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            total = np.bincount(slot[first:last], weights=load[first:last], minlength=flat.size)
+            count = np.bincount(slot[first:last], minlength=flat.size)
+            if period[first] > self.period:
+                if self.period >= 0:
+                    self._fold(self._sum, self._count, flat)
+                    folded += 1
+                self.period = int(period[first])
+                self._sum, self._count = total, count.astype(np.float64)
+            elif period[first] == self.period:
+                self._sum += total
+                self._count += count
+            else:
+                # Late samples of an already folded period
+                self._fold(total, count, flat)
+                folded += 1
+        return folded
+
+    def current(self) -> np.ndarray:
+        """The forecast with the open period's samples so far folded in"""
+        current = self.forecast.copy()
+        self._fold(self._sum, self._count, current.reshape(-1))
+        return current
+
+    def schedule(self, target: float = DEFAULT_TARGET_REDUCTION, max_load: float = DEFAULT_MAX_LOAD,
+                 min_awake_share: float = DEFAULT_MIN_AWAKE_SHARE) -> SleepSchedule:
+        """Sleep windows over the forecast season that save `target` of the energy"""
+        forecast = self.current()
+        cells, hours = forecast.shape
+        known = ~np.isnan(forecast)
+        load = np.where(known, forecast, 0.0)
+        absolute = load * self.capacity[:, None]
+        groups = int(self.group.max()) + 1 if cells else 0
+        members = np.bincount(self.group, minlength=groups)
+        min_awake = np.maximum(np.ceil(members * min_awake_share), 1)
+
+        # Within each (group, hour), sleep the lightest eligible cells first
+        # while the rest carry the group's load and keep coverage
+        eligible = known & ~self.coverage[:, None]
+        pair = (self.group[:, None] * hours + np.arange(hours)).ravel()
+        rank_load = np.where(eligible, load, np.inf).ravel()
+        order = np.lexsort((rank_load, pair))
+        pair_sorted = pair[order]
+        capacity = np.repeat(self.capacity, hours)[order]
+        starts = np.flatnonzero(np.r_[True, pair_sorted[1:] != pair_sorted[:-1]])
+        sizes = np.diff(np.r_[starts, len(order)])
+        asleep_capacity = np.cumsum(capacity)
+        asleep_capacity -= np.repeat(asleep_capacity[starts] - capacity[starts], sizes)
+        asleep_count = np.arange(len(order)) - np.repeat(starts, sizes) + 1
+        group_sorted = pair_sorted // hours
+        total_capacity = np.bincount(pair, weights=np.repeat(self.capacity, hours), minlength=groups * hours)
+        total_load = np.bincount(pair, weights=absolute.ravel(), minlength=groups * hours)
+        fits = ((total_capacity[pair_sorted] - asleep_capacity) * max_load >= total_load[pair_sorted] - 1e-9)
+        fits &= members[group_sorted] - asleep_count >= min_awake[group_sorted]
+        fits &= eligible.ravel()[order]
+        # Only an unbroken prefix of each (group, hour) may sleep together
+        broken = np.cumsum(~fits)
+        fits &= broken - np.repeat(broken[starts] - (~fits[starts]), sizes) == 0
+        candidate = np.zeros(cells * hours, dtype=bool)
+        candidate[order] = fits
+        candidate = candidate.reshape(cells, hours)
+
+        # Windows long enough to be worth it, lightest first, until the target is met
+        saving_w = IDLE_POWER_W - self.sleep_power_w
+        baseline_wh = float(cells * hours * IDLE_POWER_W + FULL_LOAD_POWER_W * load.sum())
+        cell, start, length = _runs(candidate)
+        keep = length >= MIN_SLEEP_HOURS
+        cell, start, length = cell[keep], start[keep], length[keep]
+        prefix = np.concatenate([np.zeros((cells, 1)), np.cumsum(np.tile(load, 2), axis=1)], axis=1)
+        mean_load = (prefix[cell, start + length] - prefix[cell, start]) / np.maximum(length, 1)
+        order = np.lexsort((-length, mean_load))
+        saved = np.cumsum(length[order] * saving_w)
+        needed = target * baseline_wh
+        chosen = order[:int(np.searchsorted(saved, needed - 1e-9)) + 1]
+        sleep = np.zeros((cells, hours), dtype=bool)
+        if len(chosen):
+            offsets = np.arange(hours)
+            window = (offsets - start[chosen, None]) % hours < length[chosen, None]
+            np.logical_or.at(sleep, cell[chosen], window)
+        return SleepSchedule(sleep, baseline_wh, float(sleep.sum() * saving_w), target)
+
+
+def optimize_for_plan(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Forecast an energy plan's traffic and schedule cell sleep to meet its target.
+
+    optimization_scope lists cell ids or {id, group, capacity, coverage};
+    energy_targets holds reduction ("30%"), maxLoad, minAwakeShare,
+    sleepMode (light, advanced or deep), seasonHours (24 or 168) and the
+    load history as columns: "traffic": {cell, hour, load} with load as a
+    fraction of capacity and hour counted from any fixed origin.
+    """
+    targets = plan.get("targets") or {}
+    scope = [cell if isinstance(cell, dict) else {"id": cell} for cell in plan.get("scope") or []]
+    traffic = targets.get("traffic") or {}
+    if not scope or not traffic.get("cell"):
+        return {"status": "SKIPPED", "reason": "plan has no cells in scope or traffic history"}
+
+    start = time.perf_counter()
+    cell_ids = [str(cell.get("id", i)) for i, cell in enumerate(scope)]
+    cell_index = {cell_id: i for i, cell_id in enumerate(cell_ids)}
+    sleep_mode = str(targets.get("sleepMode", DEFAULT_SLEEP_MODE)).lower()
+    optimizer = EnergyOptimizer(
+        len(scope),
+        capacity=[float(cell.get("capacity", 1.0)) for cell in scope],
+        group=[str(cell.get("group", "")) for cell in scope],
+        coverage=[bool(cell.get("coverage", False)) for cell in scope],
+        sleep_power_w=SLEEP_POWER_W.get(sleep_mode, SLEEP_POWER_W[DEFAULT_SLEEP_MODE]),
+        season_hours=int(targets.get("seasonHours", SEASON_HOURS)),
+    )
+    # Samples of cells outside the scope are dropped
+    sample_cell = np.array([cell_index.get(str(cell), -1) for cell in traffic["cell"]], dtype=np.int64)
+    hour = np.asarray(traffic.get("hour", []), dtype=np.int64)[:len(sample_cell)]
+    load = np.asarray(traffic.get("load", []), dtype=np.float64)[:len(sample_cell)]
+    in_scope = sample_cell >= 0
+    optimizer.ingest(sample_cell[in_scope], hour[in_scope], load[in_scope])
+
+    target = parse_ratio(targets.get("reduction", targets.get("energyReduction")), DEFAULT_TARGET_REDUCTION)
+    schedule = optimizer.schedule(
+        target,
+        parse_ratio(targets.get("maxLoad"), DEFAULT_MAX_LOAD),
+        parse_ratio(targets.get("minAwakeShare"), DEFAULT_MIN_AWAKE_SHARE),
+    )
+    windows = schedule.windows(cell_ids)
+    return {
+        "status": "SCHEDULED",
+        "cells": len(scope),
+        "samples": int(np.count_nonzero(in_scope)),
+        "seasonHours": optimizer.season_hours,
+        "targetReduction": target,
+        "achievedReduction": round(schedule.reduction, 4),
+        "targetMet": schedule.reduction >= target - 1e-9,
+        "sleepMode": sleep_mode,
+        "sleepingCellHours": int(schedule.sleep.sum()),
+        "cellsWithSleep": int(np.count_nonzero(schedule.sleep.any(axis=1))),
+        "baselineKwh": round(schedule.baseline_wh / 1000, 1),
+        "savedKwh": round(schedule.saved_wh / 1000, 1),
+        "windows": windows[:SLEEP_WINDOW_LIMIT],
+        "truncated": len(windows) > SLEEP_WINDOW_LIMIT,
+        "computeMs": round((time.perf_counter() - start) * 1000, 1),
+    }
@@ -0,0 +1,164 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""A1, E2, O1 and O2 operations behind the SMO planner tools.
+
+Shared by smo_planner_extended.py and every generated Lambda handler. Each
+operation has an undo counterpart, and the *_step helpers wrap them as
+plan_executor Steps that roll themselves back when a plan fails.
+"""
+
+import uuid
+from typing import Any, Dict, List, Optional
+
+from a1_policy_store import A1Policy, A1PolicyConflictError, get_a1_policy_store, policy_hash
+from e2_registry import get_e2_registry
+from plan_executor import Step
+
+# Consumer of policies deployed directly through the deploy_a1_policy tool, so they can be released
+A1_OPERATOR_CONSUMER = "operator"
+
+
+def _a1_conflict(e: A1PolicyConflictError) -> Dict[str, Any]:
+    result = {"error": str(e), "parameters": e.parameters}
+    if e.policy_id is not None:
+        result["conflictsWith"] = e.policy_id
+    return result
+
+
+def deploy_a1_policy(policy_type: str, s_nssai: str, policy_params: Dict[str, Any], consumer: Optional[str] = None,
+                     replace: bool = False):
+    # Identical policies are deployed once; a different one on the same slice and type
+    # is a conflict unless replace supersedes it
+    try:
+        policy, unchanged = get_a1_policy_store().upsert(
+            policy_type, s_nssai, policy_params, consumer or A1_OPERATOR_CONSUMER, replace)
+    except A1PolicyConflictError as e:
+        return _a1_conflict(e)
+    result = {"policyId": policy.policy_id, "status": "DEPLOYED"}
+    if unchanged:
+        print(f"A1: Policy {policy.policy_id} already deployed for slice {s_nssai}")
+        result["unchanged"] = True
+    if policy.superseded:
+        # Kept whole so a rollback can deploy them again
+        result["superseded"] = [dict(old.describe(), consumers=sorted(old.consumers)) for old in policy.superseded]
+    return result
+
+
+def delete_a1_policy(policy_id: str, consumer: Optional[str] = None):
+    """Release the consumer's reference; the policy is deleted with the last one"""
+    remaining = get_a1_policy_store().release(policy_id, consumer)
+    if remaining:
+        return {"policyId": policy_id, "status": "DEPLOYED", "consumers": remaining}
+    return {"policyId": policy_id, "status": "DELETED"}
+
+
+def undo_a1_policy(result: Dict[str, Any], consumer: str):
+    """Release a deployed policy and put back the policies it superseded"""
+    deleted = delete_a1_policy(result["policyId"], consumer)
+    store = get_a1_policy_store()
+    for old in result.get("superseded", ()):
+        policy = A1Policy(old["policyId"], old["policyType"], old["sNssai"], old["params"],
+                          policy_hash(old["policyType"], old["sNssai"], old["params"]), old["consumers"])
+        restored = store.restore(policy)
+        print(f"A1: Restored superseded policy as {restored.policy_id} for slice {old['sNssai']}")
+    return deleted
+
+
+def configure_e2_subscription(node_id: str, metrics: List[str], reporting_period: int, consumer: Optional[str] = None):
+    # Identical active subscriptions are shared rather than created again
+    subscription, reused = get_e2_registry().acquire(node_id, metrics, reporting_period, consumer)
+    result = {"subscriptionId": subscription.subscription_id, "status": "ACTIVE"}
+    if reused:
+        print(f"E2: Reusing subscription {subscription.subscription_id} for node {node_id}")
+        result["reused"] = True
+    return result
+
+
+def delete_e2_subscription(subscription_id: str, consumer: Optional[str] = None):
+    """Release the consumer's reference; the RIC subscription goes with the last one"""
+    remaining = get_e2_registry().release(subscription_id, consumer)
+    if remaining:
+        return {"subscriptionId": subscription_id, "status": "ACTIVE", "consumers": remaining}
+    return {"subscriptionId": subscription_id, "status": "DELETED"}
+
+
+def configure_slice_parameters(node_id: str, s_nssai: str, slice_config: Dict[str, Any]):
+    config_id = f"o1cfg-{uuid.uuid4().hex[:8]}"
+    print(f"O1: Applied slice config {config_id} to node {node_id}")
+    return {"configId": config_id, "status": "APPLIED"}
+
+
+def revert_slice_parameters(config_id: str):
+    print(f"O1: Reverted slice config {config_id}")
+    return {"configId": config_id, "status": "REVERTED"}
+
+
+def configure_beam_tracking(beam_type: str):
+    """Configure massive MIMO beamforming on the O-RU"""
+    beam_id = f"beam-{uuid.uuid4().hex[:8]}"
+    print(f"O1: Configured {beam_type} beam {beam_id}")
+    return {"beamId": beam_id, "type": beam_type}
+
+
+def configure_shared_oru(sharing_mode: str):
+    """Configure an O-RU shared between operators"""
+    oru_id = f"shared-oru-{uuid.uuid4().hex[:8]}"
+    print(f"O1: Configured shared O-RU {oru_id} for {sharing_mode}")
+    return {"oruId": oru_id, "sharing_mode": sharing_mode}
+
+
+def instantiate_vnf(vnf_type: str, flavor: str, slice_id: str):
+    vnf_id = f"vnf-{uuid.uuid4().hex[:8]}"
+    print(f"O2: Instantiated VNF {vnf_id} of type {vnf_type}")
+    return {"vnfId": vnf_id, "status": "INSTANTIATED"}
+
+
+def terminate_vnf(vnf_id: str):
+    print(f"O2: Terminated VNF {vnf_id}")
+    return {"vnfId": vnf_id, "status": "TERMINATED"}
+
+
+def deploy_model(prefix: str, model_type: str):
+    """Deploy a prediction model to the near-RT RIC"""
+    return {"modelId": f"{prefix}-model-{uuid.uuid4().hex[:8]}", "type": model_type}
+
+
+def undeploy_model(model_id: str):
+    print(f"ML: Undeployed model {model_id}")
+    return {"modelId": model_id, "status": "UNDEPLOYED"}
+
+
+def a1_policy_step(name: str, policy_type: str, s_nssai: str, policy_params: Dict[str, Any],
+                   consumer: Optional[str] = None, replace: bool = False, **options) -> Step:
+    # Rollback releases only this step's reference to a shared policy, and
+    # restores any policy the step superseded
+    consumer = consumer or f"{name}-{uuid.uuid4().hex[:8]}"
+    return Step(name, "A1", deploy_a1_policy, (policy_type, s_nssai, policy_params, consumer, replace),
+                rollback=lambda result: undo_a1_policy(result, consumer), **options)
+
+
+def e2_subscription_step(name: str, node_id: str, metrics: List[str], reporting_period: int,
+                         consumer: Optional[str] = None, **options) -> Step:
+    # Rollback releases only this step's reference to a shared subscription
+    consumer = consumer or f"{name}-{uuid.uuid4().hex[:8]}"
+    return Step(name, "E2", configure_e2_subscription, (node_id, metrics, reporting_period, consumer),
+                rollback=lambda result: delete_e2_subscription(result["subscriptionId"], consumer), **options)
+
+
+def slice_config_step(name: str, node_id: str, s_nssai: str, slice_config: Dict[str, Any], **options) -> Step:
+    return Step(name, "O1", configure_slice_parameters, (node_id, s_nssai, slice_config),
+                rollback=lambda result: revert_slice_parameters(result["configId"]), **options)
+
+
+def model_step(name: str, prefix: str, model_type: str, **options) -> Step:
+    return Step(name, "ML", deploy_model, (prefix, model_type),
+                rollback=lambda result: undeploy_model(result["modelId"]), **options)
+
+
+def beam_config_step(name: str, beam_type: str, **options) -> Step:
+    return Step(name, "O1", configure_beam_tracking, (beam_type,), **options)
+
+
+def shared_oru_step(name: str, sharing_mode: str, **options) -> Step:
+    return Step(name, "O1", configure_shared_oru, (sharing_mode,), **options)
@@ -0,0 +1,232 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Concurrent execution of the A1, E2, O1 and O2 steps of an SMO plan.
+
+A plan's steps form a DAG: a step starts as soon as the steps it depends
+on have succeeded, so independent interface operations run in parallel.
+Calls per interface are rate limited, every step has a timeout, and when
+a step fails the steps that already succeeded are rolled back in reverse
+order. run() returns the step results and a per-step timing report.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Calls per second allowed per southbound interface, e.g. "A1=10,E2=20"
+PLAN_RATE_LIMITS = os.environ.get('PLAN_RATE_LIMITS', 'A1=10,E2=20,O1=10,O2=5')
+PLAN_STEP_TIMEOUT_SECONDS = float(os.environ.get('PLAN_STEP_TIMEOUT_SECONDS', '30'))
+PLAN_EXECUTOR_WORKERS = int(os.environ.get('PLAN_EXECUTOR_WORKERS', '8'))
+
+COMPLETED = "COMPLETED"
+ROLLED_BACK = "ROLLED_BACK"
+
+
+def parse_rate_limits(spec: str) -> Dict[str, float]:
+    limits = {}
+    for part in spec.split(','):
+        if '=' in part:
+            interface, rate = part.split('=', 1)
+            limits[interface.strip()] = float(rate)
+    return limits
+
+
+class TokenBucket:
+    """Blocking rate limiter allowing `rate` calls per second with bursts of `burst`"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until one is available; returns seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class Step:
+    """One interface operation of a plan"""
+
+    def __init__(self, name: str, interface: str, func: Callable, args: Sequence = (),
+                 kwargs: Optional[Dict[str, Any]] = None, depends_on: Sequence[str] = (),
+                 rollback: Optional[Callable[[Any], Any]] = None, timeout: Optional[float] = None):
+        self.name = name
+        self.interface = interface
+        self.func = func
+        self.args = tuple(args)
+        self.kwargs = kwargs or {}
+        self.depends_on = tuple(depends_on)
+        # Called with the step's result to undo it
+        self.rollback = rollback
+        self.timeout = timeout
+
+
+def _failed(result: Any) -> bool:
+    # Interface helpers report failures as {"error": ...} rather than raising
+    return isinstance(result, dict) and "error" in result
+
+
+class PlanExecutor:
+    """Runs plan steps concurrently with rate limits, timeouts and rollback"""
+
+    def __init__(self, rate_limits: Optional[Dict[str, float]] = None,
+                 step_timeout: float = PLAN_STEP_TIMEOUT_SECONDS, max_workers: int = PLAN_EXECUTOR_WORKERS):
+        limits = parse_rate_limits(PLAN_RATE_LIMITS) if rate_limits is None else rate_limits
+        self._buckets = {interface: TokenBucket(rate) for interface, rate in limits.items() if rate > 0}
+        self.step_timeout = step_timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='plan-step')
+
+    def _run_step(self, step: Step, timing: dict):
+        bucket = self._buckets.get(step.interface)
+        if bucket:
+            timing["waitMs"] = round(bucket.acquire() * 1000, 1)
+        timing["start"] = time.perf_counter()
+        try:
+            return step.func(*step.args, **step.kwargs)
+        finally:
+            timing["end"] = time.perf_counter()
+
+    def _undo(self, step: Step, result: Any, row: dict):
+        if step.rollback is None:
+            return
+        try:
+            step.rollback(result)
+            row["rolledBack"] = True
+        except Exception as e:
+            row["rollbackError"] = str(e)
+            print(f"Rollback of step {step.name} failed: {e}")
+
+    def run(self, steps: List[Step]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Execute the steps; returns (results by step name, timing report)"""
+        start = time.perf_counter()
+        by_name = {step.name: step for step in steps}
+        rows = {step.name: {"name": step.name, "interface": step.interface, "status": "PENDING"} for step in steps}
+        timings: Dict[str, dict] = {step.name: {} for step in steps}
+        results: Dict[str, Any] = {}
+        succeeded: List[str] = []
+        failure: Optional[str] = None
+        running = {}
+        timed_out = set()
+        lock = threading.Lock()
+
+        for step in steps:
+            unknown = [d for d in step.depends_on if d not in by_name]
+            if unknown:
+                rows[step.name].update(status="FAILED", error=f"Unknown dependencies {unknown}")
+                failure = failure or f"{step.name}: unknown dependencies {unknown}"
+
+        def late_result(step, future):
+            # A timed-out step that still completes is undone once it does
+            with lock:
+                late = step.name in timed_out
+            if late and not future.cancelled() and future.exception() is None and not _failed(future.result()):
+                self._undo(step, future.result(), rows[step.name])
+
+        while True:
+            if failure is None:
+                for step in steps:
+                    row = rows[step.name]
+                    if row["status"] != "PENDING" or not all(d in succeeded for d in step.depends_on):
+                        continue
+                    future = self._pool.submit(self._run_step, step, timings[step.name])
+                    future.add_done_callback(lambda f, s=step: late_result(s, f))
+                    deadline = time.perf_counter() + (step.timeout or self.step_timeout)
+                    running[future] = (step, deadline)
+                    row["status"] = "RUNNING"
+            if not running:
+                break
+            timeout = max(min(deadline for _, deadline in running.values()) - time.perf_counter(), 0)
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                step, _ = running.pop(future)
+                row = rows[step.name]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    row.update(status="FAILED", error=str(e))
+                    failure = failure or f"{step.name}: {e}"
+                    continue
+                if _failed(result):
+                    row.update(status="FAILED", error=str(result["error"]))
+                    failure = failure or f"{step.name}: {result['error']}"
+                    continue
+                row["status"] = "SUCCEEDED"
+                results[step.name] = result
+                succeeded.append(step.name)
+            now = time.perf_counter()
+            for future, (step, deadline) in list(running.items()):
+                if now < deadline:
+                    continue
+                with lock:
+                    # Checked under the lock so a result arriving now is either collected or undone
+                    if future.done():
+                        continue
+                    timed_out.add(step.name)
+                del running[future]
+                rows[step.name].update(status="TIMEOUT", error=f"no result after {step.timeout or self.step_timeout}s")
+                failure = failure or f"{step.name}: timed out"
+
+        # Steps still pending with nothing running are part of a dependency cycle
+        cycle = [name for name, row in rows.items() if row["status"] == "PENDING"]
+        if failure is None and cycle:
+            failure = f"dependency cycle between {cycle}"
+
+        status = COMPLETED
+        if failure is not None:
+            status = ROLLED_BACK
+            for name in reversed(succeeded):
+                self._undo(by_name[name], results[name], rows[name])
+            for row in rows.values():
+                if row["status"] == "PENDING":
+                    row["status"] = "SKIPPED"
+
+        for name, timing in timings.items():
+            if "start" in timing:
+                rows[name]["startMs"] = round((timing["start"] - start) * 1000, 1)
+                rows[name]["durationMs"] = round((timing.get("end", time.perf_counter()) - timing["start"]) * 1000, 1)
+            if timing.get("waitMs"):
+                rows[name]["waitMs"] = timing["waitMs"]
+        # Results in step order rather than completion order
+        results = {step.name: results[step.name] for step in steps if step.name in results}
+        report = {
+            "status": status,
+            "totalMs": round((time.perf_counter() - start) * 1000, 1),
+            # What the same steps would have taken one after another
+            "serialMs": round(sum(row.get("durationMs", 0.0) for row in rows.values()), 1),
+            "steps": list(rows.values()),
+        }
+        if failure is not None:
+            report["error"] = failure
+        return results, report
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+
+_plan_executor: Optional[PlanExecutor] = None
+_plan_executor_lock = threading.Lock()
+
+
+def get_plan_executor() -> PlanExecutor:
+    """Process-wide executor, so rate limits hold across concurrent tool calls"""
+    global _plan_executor
+    with _plan_executor_lock:
+        if _plan_executor is None:
+            _plan_executor = PlanExecutor()
+        return _plan_executor
@@ -0,0 +1,399 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Interface operations of each SMO use case, and merging of several plans into one batch.
+
+PLAN_OPERATIONS declares what executing a plan of each type does on the
+A1, E2, O1 and ML interfaces. plan_steps() turns one plan's operations
+into plan_executor Steps; merge_plans() combines the operations of several
+plans (e.g. V2X + Energy Saving) so each E2 node gets one subscription
+with the union of the requested metrics at the shortest period, identical
+A1 policies and O1 configs are deployed once, and A1 policies that
+contradict each other are reported as conflicts. A different policy of
+the same type already deployed on the slice (by an earlier plan) is a
+conflict too, unless the plan was created with supersede, in which case
+its policy replaces the deployed one and merge_plans() reports a warning.
+"""
+
+import copy
+import importlib
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from a1_policy_store import get_a1_policy_store
+from oran_interfaces import (a1_policy_step, beam_config_step, e2_subscription_step, model_step,
+                             shared_oru_step, slice_config_step)
+from plan_executor import Step
+
+PLAN_OPERATIONS: Dict[str, List[Dict[str, Any]]] = {
+    "v2x_handover": [
+        # Deploy ML model for handover prediction
+        {"name": "model", "action": "model", "prefix": "v2x", "model_type": "handover_prediction"},
+        # Configure E2 for real-time vehicle tracking
+        {"name": "subscription", "action": "e2_subscription", "node_id": "v2x-node",
+         "metrics": ["rsrp", "velocity", "direction"], "reporting_period": 1},
+        # Deploy A1 policy for dynamic handover
+        {"name": "policy", "action": "a1_policy", "policy_type": "V2X_Handover", "s_nssai": "v2x-slice",
+         "policy_params": {"prediction_window": "5s"}},
+        # Predict the handovers of the plan's vehicles over the window
+        {"name": "handoverSchedule", "action": "handover_prediction", "prediction_window": "5s",
+         "depends_on": ["model"]},
+    ],
+    "uav_resource_allocation": [
+        # Deploy ML model for UAV trajectory prediction
+        {"name": "model", "action": "model", "prefix": "uav", "model_type": "trajectory_prediction"},
+        # Configure massive MIMO beamforming
+        {"name": "beamConfig", "action": "beam_config", "beam_type": "adaptive_tracking"},
+        # Set up E2 subscription for UAV metrics
+        {"name": "subscription", "action": "e2_subscription", "node_id": "uav-node",
+         "metrics": ["altitude", "speed", "signal_quality"], "reporting_period": 2},
+        # Serving cell and beam for every segment of the flight paths
+        {"name": "allocation", "action": "uav_allocation", "depends_on": ["beamConfig"]},
+    ],
+    "traffic_steering": [
+        # Deploy load balancing policy
+        {"name": "policy", "action": "a1_policy", "policy_type": "Traffic_Steering", "s_nssai": "multi-access",
+         "policy_params": {"load_threshold": "80%"}},
+        # Configure E2 for load monitoring
+        {"name": "subscription", "action": "e2_subscription", "node_id": "steering-node",
+         "metrics": ["load", "throughput", "latency"], "reporting_period": 5},
+        # Assign the measured UEs to target cells under the policy's load threshold
+        {"name": "steering", "action": "traffic_steering", "depends_on": ["policy"]},
+    ],
+    "massive_mimo_optimization": [
+        # Deploy beamforming ML model
+        {"name": "model", "action": "model", "prefix": "mimo", "model_type": "beamforming_optimization"},
+        # Configure beam management
+        {"name": "policy", "action": "a1_policy", "policy_type": "MIMO_Beamforming", "s_nssai": "mimo-slice",
+         "policy_params": {"beam_count": "64", "optimization": "capacity"}},
+        # Set up CSI reporting
+        {"name": "subscription", "action": "e2_subscription", "node_id": "mimo-node",
+         "metrics": ["csi", "sinr", "beam_rsrp"], "reporting_period": 1},
+        # Pick the precoder and layer count that best meet the goals
+        {"name": "beamforming", "action": "mimo_optimization", "depends_on": ["model"]},
+    ],
+    "ran_sharing": [
+        # Configure shared O-RU
+        {"name": "oruConfig", "action": "shared_oru", "sharing_mode": "MORAN"},
+        # Set up isolation policies
+        {"name": "policy", "action": "a1_policy", "policy_type": "RAN_Isolation", "s_nssai": "shared-ran",
+         "policy_params": {"isolation_level": "strict"}},
+    ],
+    "dynamic_spectrum_sharing": [
+        # Deploy spectrum allocation ML model
+        {"name": "model", "action": "model", "prefix": "dss", "model_type": "spectrum_prediction"},
+        # Configure dynamic allocation policy
+        {"name": "policy", "action": "a1_policy", "policy_type": "DSS_Control", "s_nssai": "dss-slice",
+         "policy_params": {"4g_ratio": "60%", "5g_ratio": "40%"}},
+        # Monitor spectrum usage
+        {"name": "subscription", "action": "e2_subscription", "node_id": "dss-node",
+         "metrics": ["spectrum_usage", "interference"], "reporting_period": 3},
+    ],
+    "congestion_management": [
+        # Deploy congestion prediction model
+        {"name": "model", "action": "model", "prefix": "congestion", "model_type": "congestion_prediction"},
+        # Configure proactive load balancing
+        {"name": "policy", "action": "a1_policy", "policy_type": "Congestion_Control", "s_nssai": "congestion-slice",
+         "policy_params": {"prediction_horizon": "1h"}},
+        # Monitor cell load
+        {"name": "subscription", "action": "e2_subscription", "node_id": "congestion-node",
+         "metrics": ["prb_usage", "ue_count", "throughput"], "reporting_period": 10},
+    ],
+    "energy_saving": [
+        # Deploy energy prediction model
+        {"name": "model", "action": "model", "prefix": "energy", "model_type": "energy_optimization"},
+        # Configure sleep mode policies
+        {"name": "policy", "action": "a1_policy", "policy_type": "Energy_Saving", "s_nssai": "energy-slice",
+         "policy_params": {"sleep_mode": "advanced", "threshold": "10%"}},
+        # Monitor energy consumption
+        {"name": "subscription", "action": "e2_subscription", "node_id": "energy-node",
+         "metrics": ["power_consumption", "traffic_load"], "reporting_period": 30},
+        # Schedule cell sleep windows from the traffic history
+        {"name": "sleepSchedule", "action": "energy_schedule", "depends_on": ["model"]},
+    ],
+    "industrial_iot": [
+        # Configure URLLC slice for IIoT
+        {"name": "sliceConfig", "action": "slice_config", "node_id": "iiot-node", "s_nssai": "urllc-slice",
+         "slice_config": {"latency": "1ms", "reliability": "99.999%"}},
+        # Deploy predictive maintenance model
+        {"name": "model", "action": "model", "prefix": "iiot", "model_type": "predictive_maintenance"},
+        # Set up real-time monitoring once the slice exists
+        {"name": "subscription", "action": "e2_subscription", "node_id": "iiot-node",
+         "metrics": ["latency", "packet_loss", "jitter"], "reporting_period": 1, "depends_on": ["sliceConfig"]},
+    ],
+    "interference_management": [
+        # Deploy interference prediction model
+        {"name": "model", "action": "model", "prefix": "interference", "model_type": "interference_prediction"},
+        # Configure interference coordination
+        {"name": "policy", "action": "a1_policy", "policy_type": "Interference_Control",
+         "s_nssai": "interference-slice", "policy_params": {"coordination": "icic", "power_control": "adaptive"}},
+        # Monitor interference levels
+        {"name": "subscription", "action": "e2_subscription", "node_id": "interference-node",
+         "metrics": ["sinr", "interference_power", "prb_conflicts"], "reporting_period": 5},
+    ],
+}
+
+# Operations that work on their own plan's data and are never merged
+PLAN_ACTIONS = {"beam_config", "shared_oru", "handover_prediction", "uav_allocation", "traffic_steering",
+                "mimo_optimization", "energy_schedule"}
+
+
+def _antenna_count(value: Any) -> str:
+    """64 or "64T64R" as "64" """
+    match = re.match(r"\s*(\d+)", str(value))
+    return match.group(1) if match else str(value)
+
+
+# A1 policy parameters a plan can set:
+# policy type -> {parameter: (plan field, key, conversion or None)}
+# A later plan's policy conflicts with an earlier one with other values unless the
+# later plan supersedes it; benchmarks/check_repeated_plans.py runs two plans of each
+# of these types in a row, without and with supersede
+PLAN_POLICY_PARAMS = {
+    "Traffic_Steering": {"load_threshold": ("policy", "loadThreshold", None)},
+    "MIMO_Beamforming": {
+        "beam_count": ("antennaConfig", "antennas", _antenna_count),
+        "optimization": ("goals", "objective", None),
+    },
+    "Energy_Saving": {
+        "sleep_mode": ("targets", "sleepMode", None),
+        "energy_reduction": ("targets", "reduction", None),
+    },
+}
+
+# Plan id prefixes minted by the create_* tools
+PLAN_ID_PREFIXES = {
+    "v2x-ho-": "v2x_handover",
+    "uav-": "uav_resource_allocation",
+    "steering-": "traffic_steering",
+    "mimo-": "massive_mimo_optimization",
+    "sharing-": "ran_sharing",
+    "dss-": "dynamic_spectrum_sharing",
+    "congestion-": "congestion_management",
+    "energy-": "energy_saving",
+    "iiot-": "industrial_iot",
+    "interference-": "interference_management",
+}
+
+# A1 policy types that push the same cells towards opposite objectives
+OPPOSING_POLICY_TYPES = [
+    ("Energy_Saving", "Congestion_Control", "cell sleep removes the capacity congestion control relies on"),
+    ("Energy_Saving", "MIMO_Beamforming", "antenna muting conflicts with capacity-oriented beamforming"),
+    ("V2X_Handover", "Traffic_Steering", "both drive handovers between the same cells"),
+]
+
+
+def plan_type_for(plan_id: str) -> Optional[str]:
+    for prefix, plan_type in PLAN_ID_PREFIXES.items():
+        if plan_id.startswith(prefix):
+            return plan_type
+    return None
+
+
+def plan_operations(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    operations = copy.deepcopy(PLAN_OPERATIONS[plan["type"]])
+    for operation in operations:
+        if operation["action"] in PLAN_ACTIONS:
+            operation["plan"] = plan
+        elif operation["action"] == "a1_policy":
+            operation["replace"] = bool(plan.get("supersede"))
+            for param, (field, key, convert) in PLAN_POLICY_PARAMS.get(operation["policy_type"], {}).items():
+                value = (plan.get(field) or {}).get(key)
+                if value is not None:
+                    operation["policy_params"][param] = convert(value) if convert else value
+    return operations
+
+
+def _numpy_step(module: str, function: str, *args):
+    """Call an ML entry point, or skip it where NumPy is not installed (a Lambda without the layer)"""
+    # NumPy is only needed by the plans that predict or optimize, so it is imported lazily
+    try:
+        entry_point = getattr(importlib.import_module(module), function)
+    except ImportError as e:
+        if not (e.name or "").startswith("numpy"):
+            raise
+        print(f"ML: Skipped {module}.{function}, numpy is not available")
+        return {"status": "SKIPPED", "reason": "numpy not available"}
+    return entry_point(*args)
+
+
+def _predict_handovers(plan: Dict[str, Any], prediction_window: Any):
+    return _numpy_step("v2x_predictor", "predict_for_plan", plan, prediction_window)
+
+
+def _allocate_uav_resources(plan: Dict[str, Any]):
+    return _numpy_step("uav_allocator", "allocate_for_plan", plan)
+
+
+def _steer_traffic(plan: Dict[str, Any]):
+    return _numpy_step("traffic_steering", "steer_for_plan", plan)
+
+
+def _optimize_mimo(plan: Dict[str, Any]):
+    return _numpy_step("mimo_kernel", "optimize_for_plan", plan)
+
+
+def _schedule_energy(plan: Dict[str, Any]):
+    return _numpy_step("energy_optimizer", "optimize_for_plan", plan)
+
+
+def operation_step(operation: Dict[str, Any], name: Optional[str] = None, consumer: Optional[str] = None) -> Step:
+    """Build the executor step for one operation; consumer holds its E2 subscription"""
+    name = name or operation["name"]
+    options = {"depends_on": operation.get("depends_on", ())}
+    action = operation["action"]
+    if action == "a1_policy":
+        # Only a plan created with supersede replaces a different policy already on the slice
+        return a1_policy_step(name, operation["policy_type"], operation["s_nssai"], operation["policy_params"],
+                              consumer, replace=operation.get("replace", False), **options)
+    if action == "e2_subscription":
+        return e2_subscription_step(name, operation["node_id"], operation["metrics"], operation["reporting_period"],
+                                    consumer, **options)
+    if action == "slice_config":
+        return slice_config_step(name, operation["node_id"], operation["s_nssai"], operation["slice_config"], **options)
+    if action == "model":
+        return model_step(name, operation["prefix"], operation["model_type"], **options)
+    if action == "beam_config":
+        return beam_config_step(name, operation["beam_type"], **options)
+    if action == "shared_oru":
+        return shared_oru_step(name, operation["sharing_mode"], **options)
+    if action == "handover_prediction":
+        return Step(name, "ML", _predict_handovers, (operation["plan"], operation.get("prediction_window")), **options)
+    if action == "uav_allocation":
+        return Step(name, "ML", _allocate_uav_resources, (operation["plan"],), **options)
+    if action == "traffic_steering":
+        return Step(name, "ML", _steer_traffic, (operation["plan"],), **options)
+    if action == "mimo_optimization":
+        return Step(name, "ML", _optimize_mimo, (operation["plan"],), **options)
+    if action == "energy_schedule":
+        return Step(name, "ML", _schedule_energy, (operation["plan"],), **options)
+    raise ValueError(f"Unknown operation {action}")
+
+
+def plan_steps(plan: Dict[str, Any]) -> List[Step]:
+    """Executor steps for one plan; step names are the plan's result keys"""
+    return [operation_step(operation, consumer=plan["planId"]) for operation in plan_operations(plan)]
+
+
+def _merge_key(operation: Dict[str, Any]) -> Tuple:
+    """Operations with the same key are combined into one"""
+    action = operation["action"]
+    if action == "e2_subscription":
+        return (action, operation["node_id"])
+    if action == "a1_policy":
+        return (action, operation["s_nssai"], operation["policy_type"])
+    if action == "slice_config":
+        return (action, operation["node_id"], operation["s_nssai"])
+    if action == "model":
+        return (action, operation["prefix"], operation["model_type"])
+    # Beam and O-RU configs and predictions belong to their plan
+    return (action, operation["plan"]["planId"], operation["name"])
+
+
+def _param_conflicts(merged: Dict[str, Any], params: Dict[str, Any]) -> List[str]:
+    return sorted(key for key, value in params.items() if key in merged and merged[key] != value)
+
+
+def merge_plans(plans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge the operations of several plans into one batch.
+
+    Returns the merged operations (each with the plans and result keys it
+    serves), the A1/O1 conflicts that prevent merging (including deployed
+    policies the plans do not supersede), warnings for opposing policy
+    types and for deployed policies the batch supersedes, and before/after
+    operation counts.
+    """
+    merged: Dict[Tuple, Dict[str, Any]] = {}
+    # (planId, result key) -> merged step name
+    assignments: Dict[Tuple[str, str], str] = {}
+    conflicts: List[Dict[str, Any]] = []
+    requested: Dict[str, int] = {}
+
+    for plan in plans:
+        plan_id = plan["planId"]
+        local_names = {}
+        for operation in plan_operations(plan):
+            action = operation["action"]
+            requested[action] = requested.get(action, 0) + 1
+            key = _merge_key(operation)
+            current = merged.get(key)
+            if current is None:
+                current = dict(operation, name=f"{action}-{len(merged) + 1}", consumers=[], depends_on=[])
+                merged[key] = current
+            elif action == "e2_subscription":
+                # One subscription per node: union of metrics at the shortest period
+                current["metrics"] = sorted(set(current["metrics"]) | set(operation["metrics"]))
+                current["reporting_period"] = min(current["reporting_period"], operation["reporting_period"])
+            elif action in ("a1_policy", "slice_config"):
+                field = "policy_params" if action == "a1_policy" else "slice_config"
+                clashing = _param_conflicts(current[field], operation[field])
+                if clashing:
+                    conflicts.append({
+                        "kind": "parameter",
+                        "operation": action,
+                        "target": list(key[1:]),
+                        "parameters": clashing,
+                        "plans": sorted({c[0] for c in current["consumers"]} | {plan_id}),
+                    })
+                else:
+                    current[field] = dict(current[field], **operation[field])
+                if action == "a1_policy":
+                    # A shared policy supersedes only if every plan using it asks to
+                    current["replace"] = current["replace"] and operation["replace"]
+            # Dependencies are declared before their dependents, so they are already merged
+            for dependency in operation.get("depends_on", ()):
+                name = local_names[dependency]
+                if name != current["name"] and name not in current["depends_on"]:
+                    current["depends_on"].append(name)
+            current["consumers"].append((plan_id, operation["name"]))
+            local_names[operation["name"]] = current["name"]
+            assignments[(plan_id, operation["name"])] = current["name"]
+
+    operations = list(merged.values())
+    warnings = []
+    # Policies already on the RIC that the batch would replace
+    store = get_a1_policy_store()
+    for operation in operations:
+        if operation["action"] != "a1_policy":
+            continue
+        deployed = store.conflict(operation["policy_type"], operation["s_nssai"], operation["policy_params"])
+        if deployed is not None:
+            report = {
+                "kind": "supersedes" if operation["replace"] else "deployed",
+                "operation": "a1_policy",
+                "target": [operation["s_nssai"], operation["policy_type"]],
+                "parameters": _param_conflicts(deployed.policy_params, operation["policy_params"]),
+                "policyId": deployed.policy_id,
+                "plans": sorted({c[0] for c in operation["consumers"]}),
+            }
+            (warnings if operation["replace"] else conflicts).append(report)
+    policy_types = {}
+    for operation in operations:
+        if operation["action"] == "a1_policy":
+            policy_types.setdefault(operation["policy_type"], set()).update(c[0] for c in operation["consumers"])
+    for first, second, reason in OPPOSING_POLICY_TYPES:
+        if first in policy_types and second in policy_types:
+            warnings.append({
+                "kind": "objective",
+                "policies": [first, second],
+                "plans": sorted(policy_types[first] | policy_types[second]),
+                "reason": reason,
+            })
+
+    merged_counts: Dict[str, int] = {}
+    for operation in operations:
+        merged_counts[operation["action"]] = merged_counts.get(operation["action"], 0) + 1
+    return {
+        "operations": operations,
+        "assignments": assignments,
+        "conflicts": conflicts,
+        "warnings": warnings,
+        "optimization": {
+            action: {"requested": count, "merged": merged_counts.get(action, 0)}
+            for action, count in requested.items()
+        },
+    }
+
+
+def merged_steps(batch: Dict[str, Any], consumer: Optional[str] = None) -> List[Step]:
+    return [operation_step(operation, consumer=consumer) for operation in batch["operations"]]
@@ -0,0 +1,371 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Durable store for SMO planner plans, shared by the agent and every Lambda target.
+
+Plans are keyed by (planId, type). Set PLAN_TABLE_NAME to keep them in
+DynamoDB (PLAN_STORE_ENDPOINT points it at DynamoDB Local); otherwise they
+go to an embedded SQLite file, which is enough for a single process.
+DynamoDB items are capped at 400 KB, so with PLAN_BUCKET_NAME set larger
+plan bodies (trajectories, CSI, traffic series, schedules) go to S3 and
+the item keeps a pointer; without a bucket an execution result that does
+not fit is stored trimmed.
+Every write is conditional on the version read, so two containers can
+never both execute the same plan, and reads are served from a warm
+in-process cache that survives between invocations of a warm Lambda.
+The E2 subscription registry and the A1 policy store keep their records
+in the same table, under their own types, for the same reason.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+PLAN_TABLE_NAME = os.environ.get('PLAN_TABLE_NAME')
+PLAN_STORE_ENDPOINT = os.environ.get('PLAN_STORE_ENDPOINT')
+PLAN_STORE_PATH = os.environ.get('PLAN_STORE_PATH', os.path.join(tempfile.gettempdir(), 'smo_plans.db'))
+PLAN_CACHE_TTL_SECONDS = float(os.environ.get('PLAN_CACHE_TTL_SECONDS', '60'))
+PLAN_CACHE_MAX_ENTRIES = 1024
+PLAN_BUCKET_NAME = os.environ.get('PLAN_BUCKET_NAME')
+# Bodies above this go to S3; leaves room below DynamoDB's 400 KB item limit for the other attributes
+PLAN_ITEM_MAX_BYTES = int(os.environ.get('PLAN_ITEM_MAX_BYTES', '350000'))
+# Lists kept per field when an execution result has to be trimmed to fit
+TRIMMED_LIST_ITEMS = 10
+# An EXECUTING plan whose executor died can be claimed again after this long
+EXECUTION_LEASE_SECONDS = 300
+# Read-modify-write retries of records shared by many writers (E2 and A1 registries)
+CONDITIONAL_WRITE_ATTEMPTS = int(os.environ.get('PLAN_STORE_WRITE_ATTEMPTS', '10'))
+
+CREATED = "CREATED"
+EXECUTING = "EXECUTING"
+EXECUTED = "EXECUTED"
+FAILED = "FAILED"
+
+
+class PlanConflictError(Exception):
+    """A conditional write lost to a concurrent writer"""
+
+
+class PlanTooLargeError(Exception):
+    """A plan body exceeds the backend's item size and there is nowhere else to put it"""
+
+
+def trim_payload(value: Any, max_items: int = TRIMMED_LIST_ITEMS) -> Any:
+    """Copy of value with every list cut to max_items, noting how many were dropped"""
+    if isinstance(value, dict):
+        return {k: trim_payload(v, max_items) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        trimmed = [trim_payload(v, max_items) for v in value[:max_items]]
+        if len(value) > max_items:
+            trimmed.append({"truncated": len(value) - max_items})
+        return trimmed
+    return value
+
+
+class SQLitePlanBackend:
+    """Embedded backend; one row per (planId, type) holding the plan as JSON"""
+
+    def __init__(self, path: str = PLAN_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS plans (plan_id TEXT, plan_type TEXT, version INTEGER, body TEXT, "
+            "PRIMARY KEY (plan_id, plan_type))"
+        )
+
+    def get_item(self, plan_id: str, plan_type: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM plans WHERE plan_id = ? AND plan_type = ?", (plan_id, plan_type)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_item(self, item: dict, expected_version: Optional[int]):
+        """Insert when expected_version is None, else replace only that version"""
+        body = json.dumps(item, default=str)
+        with self._lock:
+            if expected_version is None:
+                try:
+                    self._conn.execute(
+                        "INSERT INTO plans VALUES (?, ?, ?, ?)", (item["planId"], item["type"], item["version"], body)
+                    )
+                except sqlite3.IntegrityError:
+                    raise PlanConflictError(f"plan {item['planId']} already exists")
+                return
+            cursor = self._conn.execute(
+                "UPDATE plans SET version = ?, body = ? WHERE plan_id = ? AND plan_type = ? AND version = ?",
+                (item["version"], body, item["planId"], item["type"], expected_version)
+            )
+            if cursor.rowcount == 0:
+                raise PlanConflictError(f"plan {item['planId']} changed since version {expected_version}")
+
+    def delete_item(self, plan_id: str, plan_type: str, expected_version: int):
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM plans WHERE plan_id = ? AND plan_type = ? AND version = ?",
+                (plan_id, plan_type, expected_version)
+            )
+            if cursor.rowcount == 0:
+                raise PlanConflictError(f"plan {plan_id} changed since version {expected_version}")
+
+
+class DynamoDBPlanBackend:
+    """DynamoDB table with partition key planId and sort key type"""
+
+    def __init__(self, table_name: str = PLAN_TABLE_NAME, endpoint_url: Optional[str] = PLAN_STORE_ENDPOINT,
+                 client=None, bucket: Optional[str] = PLAN_BUCKET_NAME, s3_client=None,
+                 max_item_bytes: int = PLAN_ITEM_MAX_BYTES):
+        import boto3
+        self.table_name = table_name
+        self.client = client or boto3.client('dynamodb', endpoint_url=endpoint_url)
+        self.bucket = bucket
+        self.s3 = s3_client or (boto3.client('s3') if bucket else None)
+        self.max_item_bytes = max_item_bytes
+
+    @staticmethod
+    def _body_key(plan_id: str, plan_type: str, version) -> str:
+        return f"plans/{plan_type}/{plan_id}/v{version}.json"
+
+    def create_table(self):
+        """Create the table on demand (deployment notebooks, DynamoDB Local)"""
+        try:
+            self.client.create_table(
+                TableName=self.table_name,
+                KeySchema=[{"AttributeName": "planId", "KeyType": "HASH"},
+                           {"AttributeName": "type", "KeyType": "RANGE"}],
+                AttributeDefinitions=[{"AttributeName": "planId", "AttributeType": "S"},
+                                      {"AttributeName": "type", "AttributeType": "S"}],
+                BillingMode="PAY_PER_REQUEST"
+            )
+            self.client.get_waiter('table_exists').wait(TableName=self.table_name)
+        except self.client.exceptions.ResourceInUseException:
+            pass
+
+    def get_item(self, plan_id: str, plan_type: str) -> Optional[dict]:
+        response = self.client.get_item(
+            TableName=self.table_name,
+            Key={"planId": {"S": plan_id}, "type": {"S": plan_type}},
+            ConsistentRead=True
+        )
+        item = response.get("Item")
+        if not item:
+            return None
+        if "bodyKey" in item:
+            body = self.s3.get_object(Bucket=self.bucket, Key=item["bodyKey"]["S"])["Body"].read()
+            return json.loads(body)
+        return json.loads(item["body"]["S"])
+
+    def put_item(self, item: dict, expected_version: Optional[int]):
+        # The plan travels as one JSON attribute; DynamoDB rejects Python floats
+        body = json.dumps(item, default=str)
+        attributes = {
+            "planId": {"S": item["planId"]},
+            "type": {"S": item["type"]},
+            "version": {"N": str(item["version"])},
+            "status": {"S": item.get("status", "")},
+        }
+        key = None
+        if len(body.encode('utf-8')) <= self.max_item_bytes:
+            attributes["body"] = {"S": body}
+        elif self.bucket:
+            # Each version gets its own object, so a write that loses the
+            # condition below never overwrites the body of the winner
+            key = self._body_key(item["planId"], item["type"], item["version"])
+            self.s3.put_object(Bucket=self.bucket, Key=key, Body=body.encode('utf-8'),
+                               ContentType="application/json")
+            attributes["bodyKey"] = {"S": key}
+        else:
+            raise PlanTooLargeError(
+                f"plan {item['planId']} is {len(body)} bytes, over the {self.max_item_bytes} byte item limit; "
+                "set PLAN_BUCKET_NAME to store large plans in S3"
+            )
+        request = {"TableName": self.table_name, "Item": attributes}
+        if expected_version is None:
+            request["ConditionExpression"] = "attribute_not_exists(planId)"
+        else:
+            request["ConditionExpression"] = "version = :expected"
+            request["ExpressionAttributeValues"] = {":expected": {"N": str(expected_version)}}
+        if expected_version is not None and self.bucket:
+            # Return the replaced item to find an S3 body it no longer needs
+            request["ReturnValues"] = "ALL_OLD"
+        try:
+            response = self.client.put_item(**request)
+        except self.client.exceptions.ConditionalCheckFailedException:
+            if key:
+                self._delete_body(key)
+            raise PlanConflictError(f"plan {item['planId']} changed since version {expected_version}")
+        old_key = response.get("Attributes", {}).get("bodyKey", {}).get("S")
+        if old_key and old_key != key:
+            self._delete_body(old_key)
+
+    def delete_item(self, plan_id: str, plan_type: str, expected_version: int):
+        try:
+            response = self.client.delete_item(
+                TableName=self.table_name,
+                Key={"planId": {"S": plan_id}, "type": {"S": plan_type}},
+                ConditionExpression="version = :expected",
+                ExpressionAttributeValues={":expected": {"N": str(expected_version)}},
+                ReturnValues="ALL_OLD"
+            )
+        except self.client.exceptions.ConditionalCheckFailedException:
+            raise PlanConflictError(f"plan {plan_id} changed since version {expected_version}")
+        old_key = response.get("Attributes", {}).get("bodyKey", {}).get("S")
+        if old_key:
+            self._delete_body(old_key)
+
+    def _delete_body(self, key: str):
+        try:
+            self.s3.delete_object(Bucket=self.bucket, Key=key)
+        except Exception as e:
+            print(f"Plan body cleanup error for {key}: {e}")
+
+
+class PlanStore:
+    """Plan repository with conditional writes and a warm read cache"""
+
+    def __init__(self, backend=None, cache_ttl: float = PLAN_CACHE_TTL_SECONDS,
+                 lease_seconds: float = EXECUTION_LEASE_SECONDS):
+        self.backend = backend or default_backend()
+        self.cache_ttl = cache_ttl
+        self.lease_seconds = lease_seconds
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, item: dict):
+        with self._lock:
+            key = (item["planId"], item["type"])
+            self._cache[key] = (time.monotonic() + self.cache_ttl, item)
+            self._cache.move_to_end(key)
+            while len(self._cache) > PLAN_CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def _cached(self, plan_id: str, plan_type: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._cache.get((plan_id, plan_type))
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+        return None
+
+    def get(self, plan_id: str, plan_type: str, consistent: bool = False) -> Optional[dict]:
+        """Return a copy of the plan, from the cache unless consistent is set"""
+        item = None if consistent else self._cached(plan_id, plan_type)
+        if item is None:
+            item = self.backend.get_item(plan_id, plan_type)
+            if item is None:
+                return None
+            self._remember(item)
+        return json.loads(json.dumps(item))
+
+    def create(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a new plan; fails with PlanConflictError if the id is taken"""
+        item = dict(plan, version=1, createdAt=time.time())
+        self.backend.put_item(item, expected_version=None)
+        self._remember(item)
+        return plan
+
+    def update(self, plan: Dict[str, Any], **changes) -> Dict[str, Any]:
+        """Apply changes to a plan read earlier; fails if it was modified since"""
+        item = dict(plan, **changes, version=plan["version"] + 1, updatedAt=time.time())
+        try:
+            self.backend.put_item(item, expected_version=plan["version"])
+        except PlanConflictError:
+            # Our copy is stale; drop it so the next read goes to the backend
+            with self._lock:
+                self._cache.pop((plan["planId"], plan["type"]), None)
+            raise
+        self._remember(item)
+        return item
+
+    def delete(self, plan: Dict[str, Any]):
+        """Delete a record read earlier; fails if it was modified since"""
+        with self._lock:
+            self._cache.pop((plan["planId"], plan["type"]), None)
+        self.backend.delete_item(plan["planId"], plan["type"], plan["version"])
+
+    def start_execution(self, plan_id: str, plan_type: str) -> Tuple[Optional[dict], Optional[dict]]:
+        """Claim a plan for execution.
+
+        Returns (None, None) when the plan does not exist, (plan, None) when
+        the caller now owns the execution, and (plan, execution) when it
+        already ran or is running elsewhere.
+        """
+        plan = self.get(plan_id, plan_type)
+        for _ in range(2):
+            if plan is None:
+                return None, None
+            if plan.get("status") == EXECUTED:
+                return plan, plan.get("execution")
+            running = plan.get("status") == EXECUTING and time.time() - plan.get("executionStartedAt", 0) < self.lease_seconds
+            if running:
+                return plan, {"planId": plan_id, "status": EXECUTING}
+            try:
+                return self.update(plan, status=EXECUTING, executionStartedAt=time.time()), None
+            except PlanConflictError:
+                plan = self.get(plan_id, plan_type, consistent=True)
+        return plan, {"planId": plan_id, "status": plan.get("status") if plan else "UNKNOWN"}
+
+    def finish_execution(self, plan: Dict[str, Any], execution: Dict[str, Any]) -> Dict[str, Any]:
+        """Record the execution result of a claimed plan and return it.
+
+        A result too large for the backend is stored trimmed. If the write
+        fails for any other reason the plan is marked FAILED rather than
+        left EXECUTING until its lease runs out.
+        """
+        try:
+            self.update(plan, status=EXECUTED, execution=execution)
+        except PlanConflictError:
+            print(f"Plan {plan['planId']} was modified during execution; result not stored")
+        except PlanTooLargeError:
+            try:
+                self.update(plan, status=EXECUTED, execution=trim_payload(execution), executionTrimmed=True)
+            except Exception as e:
+                return self._unrecorded(plan, execution, e)
+        except Exception as e:
+            return self._unrecorded(plan, execution, e)
+        return execution
+
+    def _unrecorded(self, plan: Dict[str, Any], execution: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        message = f"Execution result could not be stored: {error}"
+        print(f"Plan {plan['planId']}: {message}")
+        self.fail_execution(plan, message)
+        return dict(execution, warning=message)
+
+    def fail_execution(self, plan: Dict[str, Any], error: str):
+        """Mark a claimed plan FAILED; it can be executed again"""
+        try:
+            self.update(plan, status=FAILED, lastError=error)
+        except PlanConflictError:
+            pass
+        except Exception as e:
+            # The lease still lets the plan be claimed again once it expires
+            print(f"Plan {plan['planId']} could not be marked failed: {e}")
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+
+def default_backend():
+    if PLAN_TABLE_NAME:
+        return DynamoDBPlanBackend(PLAN_TABLE_NAME, PLAN_STORE_ENDPOINT, bucket=PLAN_BUCKET_NAME)
+    return SQLitePlanBackend(PLAN_STORE_PATH)
+
+
+_plan_store: Optional[PlanStore] = None
+_plan_store_lock = threading.Lock()
+
+
+def get_plan_store() -> PlanStore:
+    """Process-wide store, kept across invocations of a warm Lambda container"""
+    global _plan_store
+    with _plan_store_lock:
+        if _plan_store is None:
+            _plan_store = PlanStore()
+        return _plan_store
@@ -2,46 +2,92 @@ from strands import Agent, tool
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
+import os
+import sys
 import uuid
 import json
+try:
+    from telemetry import configure_telemetry, instrument_tool
+except ImportError:
+    # Shared with the MCP servers in the repository root; Lambda zips bundle it
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from telemetry import configure_telemetry, instrument_tool
+from plan_store import PlanTooLargeError, get_plan_store
+from plan_executor import get_plan_executor
+import oran_interfaces
+from plan_optimizer import merge_plans, merged_steps, plan_steps, plan_type_for
+
+# Per-tool spans and metrics; TOOL_METRICS_PORT also serves them for Prometheus
+configure_telemetry(server="smo_planner")
 
 # Existing infrastructure (keeping original tools)
 active_plans = {}
 slice_registry = {}
 optimization_jobs = {}
-handover_policies = {}
-energy_profiles = {}
-interference_maps = {}
+
+# Plans are shared with every Lambda target through the plan store (DynamoDB when PLAN_TABLE_NAME is set)
+plan_store = get_plan_store()
+# Runs each plan's A1/E2/O1 steps concurrently, with per-interface rate limits and rollback
+plan_executor = get_plan_executor()
+
+def _create_plan(plan: Dict[str, Any], label: str):
+    """Store a new plan; too large a plan is reported rather than raised"""
+    try:
+        plan_store.create(plan)
+    except PlanTooLargeError as e:
+        return {"planId": plan["planId"], "error": str(e)}
+    print(f"Created {label} {plan['planId']}")
+    return plan
+
+def _execute_plan(plan_id: str, plan_type: str, label: str):
+    """Claim a stored plan, run its steps and record the outcome"""
+    plan, execution = plan_store.start_execution(plan_id, plan_type)
+    if plan is None:
+        return {"error": "Plan not found"}
+    if execution is not None:
+        # Already executed, possibly by another container
+        return execution
+    
+    # Independent interface operations run concurrently
+    results, report = plan_executor.run(plan_steps(plan))
+    if report["status"] != "COMPLETED":
+        plan_store.fail_execution(plan, report["error"])
+        return {"planId": plan_id, "error": report["error"], "execution": report}
+    
+    print(f"Executed {label} {plan_id}")
+    return plan_store.finish_execution(plan, {"planId": plan_id, **results, "execution": report})
 
 # Original A1, E2, O1, O2, Fronthaul tools (abbreviated for space)
 @tool
-def deploy_a1_policy(policy_type: str, s_nssai: str, policy_params: Dict[str, Any]):
-    policy_id = f"policy-{uuid.uuid4().hex[:8]}"
-    print(f"A1: Deployed policy {policy_id} for slice {s_nssai}")
-    return {"policyId": policy_id, "status": "DEPLOYED"}
+@instrument_tool
+def deploy_a1_policy(policy_type: str, s_nssai: str, policy_params: Dict[str, Any], replace: bool = False):
+    """Deploy an A1 policy; replace supersedes a different policy of the same type on the slice"""
+    return oran_interfaces.deploy_a1_policy(policy_type, s_nssai, policy_params, replace=replace)
 
 @tool
+@instrument_tool
 def configure_e2_subscription(node_id: str, metrics: List[str], reporting_period: int):
-    sub_id = f"e2sub-{uuid.uuid4().hex[:8]}"
-    print(f"E2: Configured subscription {sub_id} for node {node_id}")
-    return {"subscriptionId": sub_id, "status": "ACTIVE"}
+    return oran_interfaces.configure_e2_subscription(node_id, metrics, reporting_period)
 
 @tool
+@instrument_tool
 def configure_slice_parameters(node_id: str, s_nssai: str, slice_config: Dict[str, Any]):
-    config_id = f"o1cfg-{uuid.uuid4().hex[:8]}"
-    print(f"O1: Applied slice config {config_id} to node {node_id}")
-    return {"configId": config_id, "status": "APPLIED"}
+    return oran_interfaces.configure_slice_parameters(node_id, s_nssai, slice_config)
 
 @tool
+@instrument_tool
 def instantiate_vnf(vnf_type: str, flavor: str, slice_id: str):
-    vnf_id = f"vnf-{uuid.uuid4().hex[:8]}"
-    print(f"O2: Instantiated VNF {vnf_id} of type {vnf_type}")
-    return {"vnfId": vnf_id, "status": "INSTANTIATED"}
+    return oran_interfaces.instantiate_vnf(vnf_type, flavor, slice_id)
 
 # Use Case 1: Context-based Dynamic HO Management for V2X
 @tool
+@instrument_tool
 def create_v2x_handover_plan(vehicle_trajectory: Dict[str, Any], mobility_context: Dict[str, Any]):
-    """Create dynamic handover plan for V2X based on vehicle context"""
+    """Create dynamic handover plan for V2X based on vehicle context.
+
+    vehicle_trajectory: {"vehicles": [{"id", "position": [x, y] in m, "velocity": [vx, vy] in m/s}]}
+    mobility_context: {"cells": [{"id", "position": [x, y], "txPowerDbm"}], "predictionWindow": "5s"}
+    """
     plan_id = f"v2x-ho-{uuid.uuid4().hex[:8]}"
     plan = {
         "planId": plan_id,
@@ -50,32 +96,24 @@ def create_v2x_handover_plan(vehicle_trajectory: Dict[str, Any], mobility_contex
         "context": mobility_context,
         "status": "CREATED"
     }
-    handover_policies[plan_id] = plan
-    print(f"Created V2X handover plan {plan_id}")
-    return plan
+    return _create_plan(plan, "V2X handover plan")
 
 @tool
+@instrument_tool
 def execute_v2x_handover_optimization(plan_id: str):
     """Execute V2X handover optimization using AI/ML"""
-    if plan_id not in handover_policies:
-        return {"error": "Plan not found"}
-    
-    # Deploy ML model for handover prediction
-    model = {"modelId": f"v2x-model-{uuid.uuid4().hex[:8]}", "type": "handover_prediction"}
-    
-    # Configure E2 for real-time vehicle tracking
-    subscription = configure_e2_subscription("v2x-node", ["rsrp", "velocity", "direction"], 1)
-    
-    # Deploy A1 policy for dynamic handover
-    policy = deploy_a1_policy("V2X_Handover", "v2x-slice", {"prediction_window": "5s"})
-    
-    print(f"Executed V2X handover optimization {plan_id}")
-    return {"planId": plan_id, "model": model, "subscription": subscription, "policy": policy}
+    return _execute_plan(plan_id, "v2x_handover", "V2X handover optimization")
 
 # Use Case 2: UAV Radio Resource Allocation
 @tool
+@instrument_tool
 def create_uav_resource_plan(flight_path: List[Dict], uav_requirements: Dict[str, Any]):
-    """Create flight path based UAV resource allocation plan"""
+    """Create flight path based UAV resource allocation plan.
+
+    flight_path: waypoints [{"x", "y", "altitude"} in m, or "lat", "lon"] for one drone,
+    or [{"droneId", "waypoints": [...]}] for a swarm
+    uav_requirements: {"cells": [{"id", "position": [x, y] or "lat"/"lon", "height"}]}
+    """
     plan_id = f"uav-{uuid.uuid4().hex[:8]}"
     plan = {
         "planId": plan_id,
@@ -84,83 +122,75 @@ def create_uav_resource_plan(flight_path: List[Dict], uav_requirements: Dict[str
         "requirements": uav_requirements,
         "status": "CREATED"
     }
-    print(f"Created UAV resource plan {plan_id}")
-    return plan
+    return _create_plan(plan, "UAV resource plan")
 
 @tool
+@instrument_tool
 def execute_uav_resource_allocation(plan_id: str):
     """Execute UAV resource allocation with predictive beamforming"""
-    # Deploy ML model for UAV trajectory prediction
-    model = {"modelId": f"uav-model-{uuid.uuid4().hex[:8]}", "type": "trajectory_prediction"}
-    
-    # Configure massive MIMO beamforming
-    beam_config = {"beamId": f"beam-{uuid.uuid4().hex[:8]}", "type": "adaptive_tracking"}
-    
-    # Set up E2 subscription for UAV metrics
-    subscription = configure_e2_subscription("uav-node", ["altitude", "speed", "signal_quality"], 2)
-    
-    print(f"Executed UAV resource allocation {plan_id}")
-    return {"planId": plan_id, "model": model, "beamConfig": beam_config, "subscription": subscription}
+    return _execute_plan(plan_id, "uav_resource_allocation", "UAV resource allocation")
 
 # Use Case 3: Traffic Steering
 @tool
-def create_traffic_steering_plan(steering_policy: Dict[str, Any], target_cells: List[str]):
-    """Create multi-access traffic steering plan"""
+@instrument_tool
+def create_traffic_steering_plan(steering_policy: Dict[str, Any], target_cells: List[str], supersede: bool = False):
+    """Create multi-access traffic steering plan.
+
+    steering_policy: {"loadThreshold": "80%", "ratPreference": {"NR": 3, "WiFi": 1} (dB),
+    "measurements": {"ue": [...], "cell": [...], "sinrDb": [...]} (one row per UE and cell),
+    "ues": {"id": [...], "demandMbps": [...], "servingCell": [...]}}
+    target_cells: cell ids, or [{"id", "rat": "LTE"/"NR"/"WiFi", "capacityMbps", "loadMbps"}]
+    supersede: replace a different policy an earlier plan deployed on the slice instead of failing
+    """
     plan_id = f"steering-{uuid.uuid4().hex[:8]}"
     plan = {
         "planId": plan_id,
         "type": "traffic_steering",
         "policy": steering_policy,
         "targetCells": target_cells,
+        "supersede": supersede,
         "status": "CREATED"
     }
-    print(f"Created traffic steering plan {plan_id}")
-    return plan
+    return _create_plan(plan, "traffic steering plan")
 
 @tool
+@instrument_tool
 def execute_traffic_steering(plan_id: str):
     """Execute traffic steering across multiple access technologies"""
-    # Deploy load balancing policy
-    policy = deploy_a1_policy("Traffic_Steering", "multi-access", {"load_threshold": "80%"})
-    
-    # Configure E2 for load monitoring
-    subscription = configure_e2_subscription("steering-node", ["load", "throughput", "latency"], 5)
-    
-    print(f"Executed traffic steering {plan_id}")
-    return {"planId": plan_id, "policy": policy, "subscription": subscription}
+    return _execute_plan(plan_id, "traffic_steering", "traffic steering")
 
 # Use Case 4: Massive MIMO Optimization
 @tool
-def create_mimo_optimization_plan(antenna_config: Dict[str, Any], optimization_goals: Dict[str, Any]):
-    """Create massive MIMO beamforming optimization plan"""
+@instrument_tool
+def create_mimo_optimization_plan(antenna_config: Dict[str, Any], optimization_goals: Dict[str, Any],
+                                  supersede: bool = False):
+    """Create massive MIMO beamforming optimization plan.
+
+    antenna_config: {"antennas": 64 or "64T64R", "layers": 16, "usersPerCell": 500, "cells": 3},
+    optionally measured "csi": {"real": [...], "imag": [...]} shaped (cells,) users x antennas
+    optimization_goals: {"objective": "capacity"/"coverage"/"fairness", "precoder": "mrt"/"zf"/"mmse", "snrDb": 10}
+    supersede: replace a different policy an earlier plan deployed on the slice instead of failing
+    """
     plan_id = f"mimo-{uuid.uuid4().hex[:8]}"
     plan = {
         "planId": plan_id,
         "type": "massive_mimo_optimization",
         "antennaConfig": antenna_config,
         "goals": optimization_goals,
+        "supersede": supersede,
         "status": "CREATED"
     }
-    print(f"Created massive MIMO optimization plan {plan_id}")
-    return plan
+    return _create_plan(plan, "massive MIMO optimization plan")
 
 @tool
+@instrument_tool
 def execute_mimo_optimization(plan_id: str):
     """Execute massive MIMO optimization with AI/ML"""
-    # Deploy beamforming ML model
-    model = {"modelId": f"mimo-model-{uuid.uuid4().hex[:8]}", "type": "beamforming_optimization"}
-    
-    # Configure beam management
-    beam_policy = deploy_a1_policy("MIMO_Beamforming", "mimo-slice", {"beam_count": "64", "optimization": "capacity"})
-    
-    # Set up CSI reporting
-    subscription = configure_e2_subscription("mimo-node", ["csi", "sinr", "beam_rsrp"], 1)
-    
-    print(f"Executed massive MIMO optimization {plan_id}")
-    return {"planId": plan_id, "model": model, "policy": beam_policy, "subscription": subscription}
+    return _execute_plan(plan_id, "massive_mimo_optimization", "massive MIMO optimization")
 
 # Use Case 5: RAN Sharing
 @tool
+@instrument_tool
 def create_ran_sharing_plan(sharing_config: Dict[str, Any], operators: List[str]):
     """Create multi-operator RAN sharing plan"""
     plan_id = f"sharing-{uuid.uuid4().hex[:8]}"
@@ -171,23 +201,17 @@ def create_ran_sharing_plan(sharing_config: Dict[str, Any], operators: List[str]
         "operators": operators,
         "status": "CREATED"
     }
-    print(f"Created RAN sharing plan {plan_id}")
-    return plan
+    return _create_plan(plan, "RAN sharing plan")
 
 @tool
+@instrument_tool
 def execute_ran_sharing(plan_id: str):
     """Execute RAN sharing configuration"""
-    # Configure shared O-RU
-    oru_config = {"oruId": f"shared-oru-{uuid.uuid4().hex[:8]}", "sharing_mode": "MORAN"}
-    
-    # Set up isolation policies
-    isolation_policy = deploy_a1_policy("RAN_Isolation", "shared-ran", {"isolation_level": "strict"})
-    
-    print(f"Executed RAN sharing {plan_id}")
-    return {"planId": plan_id, "oruConfig": oru_config, "policy": isolation_policy}
+    return _execute_plan(plan_id, "ran_sharing", "RAN sharing")
 
 # Use Case 6: Dynamic Spectrum Sharing (DSS)
 @tool
+@instrument_tool
 def create_dss_plan(spectrum_config: Dict[str, Any], sharing_ratio: Dict[str, float]):
     """Create dynamic spectrum sharing plan between 4G/5G"""
     plan_id = f"dss-{uuid.uuid4().hex[:8]}"
@@ -198,26 +222,17 @@ def create_dss_plan(spectrum_config: Dict[str, Any], sharing_ratio: Dict[str, fl
         "sharingRatio": sharing_ratio,
         "status": "CREATED"
     }
-    print(f"Created DSS plan {plan_id}")
-    return plan
+    return _create_plan(plan, "DSS plan")
 
 @tool
+@instrument_tool
 def execute_dss_optimization(plan_id: str):
     """Execute dynamic spectrum sharing optimization"""
-    # Deploy spectrum allocation ML model
-    model = {"modelId": f"dss-model-{uuid.uuid4().hex[:8]}", "type": "spectrum_prediction"}
-    
-    # Configure dynamic allocation policy
-    dss_policy = deploy_a1_policy("DSS_Control", "dss-slice", {"4g_ratio": "60%", "5g_ratio": "40%"})
-    
-    # Monitor spectrum usage
-    subscription = configure_e2_subscription("dss-node", ["spectrum_usage", "interference"], 3)
-    
-    print(f"Executed DSS optimization {plan_id}")
-    return {"planId": plan_id, "model": model, "policy": dss_policy, "subscription": subscription}
+    return _execute_plan(plan_id, "dynamic_spectrum_sharing", "DSS optimization")
 
 # Use Case 7: Congestion Prediction and Management
 @tool
+@instrument_tool
 def create_congestion_management_plan(prediction_params: Dict[str, Any], mitigation_actions: List[str]):
     """Create congestion prediction and management plan"""
     plan_id = f"congestion-{uuid.uuid4().hex[:8]}"
@@ -228,57 +243,45 @@ def create_congestion_management_plan(prediction_params: Dict[str, Any], mitigat
         "mitigationActions": mitigation_actions,
         "status": "CREATED"
     }
-    print(f"Created congestion management plan {plan_id}")
-    return plan
+    return _create_plan(plan, "congestion management plan")
 
 @tool
+@instrument_tool
 def execute_congestion_management(plan_id: str):
     """Execute congestion prediction and management"""
-    # Deploy congestion prediction model
-    model = {"modelId": f"congestion-model-{uuid.uuid4().hex[:8]}", "type": "congestion_prediction"}
-    
-    # Configure proactive load balancing
-    policy = deploy_a1_policy("Congestion_Control", "congestion-slice", {"prediction_horizon": "1h"})
-    
-    # Monitor cell load
-    subscription = configure_e2_subscription("congestion-node", ["prb_usage", "ue_count", "throughput"], 10)
-    
-    print(f"Executed congestion management {plan_id}")
-    return {"planId": plan_id, "model": model, "policy": policy, "subscription": subscription}
+    return _execute_plan(plan_id, "congestion_management", "congestion management")
 
 # Use Case 8: Network Energy Saving
 @tool
-def create_energy_saving_plan(energy_targets: Dict[str, Any], optimization_scope: List[str]):
-    """Create network energy saving optimization plan"""
+@instrument_tool
+def create_energy_saving_plan(energy_targets: Dict[str, Any], optimization_scope: List[str], supersede: bool = False):
+    """Create network energy saving optimization plan.
+
+    energy_targets: {"reduction": "30%", "sleepMode": "light"/"advanced"/"deep", "maxLoad": 0.7,
+    "minAwakeShare": 0.25, "traffic": {"cell": [...], "hour": [...], "load": [...]}}, load as a fraction of capacity
+    optimization_scope: cell ids, or {"id", "group", "capacity", "coverage"} where a group's cells cover each other
+    supersede: replace a different policy an earlier plan deployed on the slice instead of failing
+    """
     plan_id = f"energy-{uuid.uuid4().hex[:8]}"
     plan = {
         "planId": plan_id,
         "type": "energy_saving",
         "targets": energy_targets,
         "scope": optimization_scope,
+        "supersede": supersede,
         "status": "CREATED"
     }
-    energy_profiles[plan_id] = plan
-    print(f"Created energy saving plan {plan_id}")
-    return plan
+    return _create_plan(plan, "energy saving plan")
 
 @tool
+@instrument_tool
 def execute_energy_optimization(plan_id: str):
     """Execute energy saving optimization"""
-    # Deploy energy prediction model
-    model = {"modelId": f"energy-model-{uuid.uuid4().hex[:8]}", "type": "energy_optimization"}
-    
-    # Configure sleep mode policies
-    energy_policy = deploy_a1_policy("Energy_Saving", "energy-slice", {"sleep_mode": "advanced", "threshold": "10%"})
-    
-    # Monitor energy consumption
-    subscription = configure_e2_subscription("energy-node", ["power_consumption", "traffic_load"], 30)
-    
-    print(f"Executed energy optimization {plan_id}")
-    return {"planId": plan_id, "model": model, "policy": energy_policy, "subscription": subscription}
+    return _execute_plan(plan_id, "energy_saving", "energy optimization")
 
 # Use Case 9: Industrial IoT Optimization
 @tool
+@instrument_tool
 def create_iiot_optimization_plan(iiot_requirements: Dict[str, Any], factory_layout: Dict[str, Any]):
     """Create Industrial IoT optimization plan"""
     plan_id = f"iiot-{uuid.uuid4().hex[:8]}"
@@ -289,26 +292,17 @@ def create_iiot_optimization_plan(iiot_requirements: Dict[str, Any], factory_lay
         "layout": factory_layout,
         "status": "CREATED"
     }
-    print(f"Created IIoT optimization plan {plan_id}")
-    return plan
+    return _create_plan(plan, "IIoT optimization plan")
 
 @tool
+@instrument_tool
 def execute_iiot_optimization(plan_id: str):
     """Execute Industrial IoT optimization"""
-    # Configure URLLC slice for IIoT
-    slice_config = configure_slice_parameters("iiot-node", "urllc-slice", {"latency": "1ms", "reliability": "99.999%"})
-    
-    # Deploy predictive maintenance model
-    model = {"modelId": f"iiot-model-{uuid.uuid4().hex[:8]}", "type": "predictive_maintenance"}
-    
-    # Set up real-time monitoring
-    subscription = configure_e2_subscription("iiot-node", ["latency", "packet_loss", "jitter"], 1)
-    
-    print(f"Executed IIoT optimization {plan_id}")
-    return {"planId": plan_id, "sliceConfig": slice_config, "model": model, "subscription": subscription}
+    return _execute_plan(plan_id, "industrial_iot", "IIoT optimization")
 
 # Use Case 10: Interference Detection and Optimization
 @tool
+@instrument_tool
 def create_interference_management_plan(detection_params: Dict[str, Any], optimization_strategy: str):
     """Create interference detection and optimization plan"""
     plan_id = f"interference-{uuid.uuid4().hex[:8]}"
@@ -319,24 +313,55 @@ def create_interference_management_plan(detection_params: Dict[str, Any], optimi
         "strategy": optimization_strategy,
         "status": "CREATED"
     }
-    interference_maps[plan_id] = plan
-    print(f"Created interference management plan {plan_id}")
-    return plan
+    return _create_plan(plan, "interference management plan")
 
 @tool
+@instrument_tool
 def execute_interference_optimization(plan_id: str):
     """Execute interference detection and optimization"""
-    # Deploy interference prediction model
-    model = {"modelId": f"interference-model-{uuid.uuid4().hex[:8]}", "type": "interference_prediction"}
+    return _execute_plan(plan_id, "interference_management", "interference optimization")
+
+# Combined scenarios: several plans executed as one deduplicated batch
+@tool
+@instrument_tool
+def execute_combined_plans(plan_ids: List[str]):
+    """Execute several plans together (e.g. V2X + Energy Saving), merging their shared E2 and A1 operations"""
+    batch_id = f"batch-{uuid.uuid4().hex[:8]}"
+    claimed, outcomes = [], {}
+    for plan_id in plan_ids:
+        plan_type = plan_type_for(plan_id)
+        plan, execution = plan_store.start_execution(plan_id, plan_type) if plan_type else (None, None)
+        if plan is None:
+            outcomes[plan_id] = {"error": "Plan not found"}
+        elif execution is not None:
+            # Already executed, possibly by another container
+            outcomes[plan_id] = execution
+        else:
+            claimed.append(plan)
+    if not claimed:
+        return {"batchId": batch_id, "plans": outcomes}
     
-    # Configure interference coordination
-    policy = deploy_a1_policy("Interference_Control", "interference-slice", {"coordination": "icic", "power_control": "adaptive"})
+    batch = merge_plans(claimed)
+    if batch["conflicts"]:
+        for plan in claimed:
+            plan_store.fail_execution(plan, "Conflicting A1 policies")
+        return {"batchId": batch_id, "error": "Conflicting A1 policies", "conflicts": batch["conflicts"],
+                "plans": outcomes}
     
-    # Monitor interference levels
-    subscription = configure_e2_subscription("interference-node", ["sinr", "interference_power", "prb_conflicts"], 5)
+    results, report = plan_executor.run(merged_steps(batch, consumer=batch_id))
+    if report["status"] != "COMPLETED":
+        for plan in claimed:
+            plan_store.fail_execution(plan, report["error"])
+        return {"batchId": batch_id, "error": report["error"], "execution": report, "plans": outcomes}
     
-    print(f"Executed interference optimization {plan_id}")
-    return {"planId": plan_id, "model": model, "policy": policy, "subscription": subscription}
+    for plan in claimed:
+        plan_results = {key: results[step] for (plan_id, key), step in batch["assignments"].items()
+                        if plan_id == plan["planId"]}
+        outcomes[plan["planId"]] = plan_store.finish_execution(
+            plan, {"planId": plan["planId"], "batchId": batch_id, **plan_results})
+    print(f"Executed combined plans {[plan['planId'] for plan in claimed]} as {batch_id}")
+    return {"batchId": batch_id, "plans": outcomes, "optimization": batch["optimization"],
+            "warnings": batch["warnings"], "execution": report}
 
 # Enhanced SMO Planner with all use cases
 smo_planner_extended = Agent(
@@ -372,7 +397,10 @@ smo_planner_extended = Agent(
         create_iiot_optimization_plan, execute_iiot_optimization,
         
         # Interference Management
-        create_interference_management_plan, execute_interference_optimization
+        create_interference_management_plan, execute_interference_optimization,
+        
+        # Combined scenarios
+        execute_combined_plans
     ],
     system_prompt="""You are an advanced O-RAN SMO Planner Agent supporting 10+ specialized use cases from O-RAN specifications.
 
@@ -409,6 +437,7 @@ When users request O-RAN operations, identify the relevant use case(s) and:
 4. Provide comprehensive status and next steps
 
 Support both individual use cases and combined scenarios (e.g., V2X + Energy Saving).
+For combined scenarios, create each plan and then run them together with execute_combined_plans, which merges their shared E2 subscriptions and A1 policies and reports conflicting policies.
 """
 )
 
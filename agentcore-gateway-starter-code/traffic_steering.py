@@ -0,0 +1,323 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Load-balancing traffic steering of UEs across LTE, NR and Wi-Fi cells.
+
+Each UE ranks its measured candidate cells by SINR plus the policy's
+bias for the cell's RAT, and each cell may carry its capacity times the
+load threshold. Assignment is capacitated deferred acceptance run on
+arrays: every round, all unplaced UEs propose to their next candidate
+at once, and every cell that received proposals keeps its best UEs
+whose demands fit and rejects the rest. One round is one sort of the
+proposers, plus the current holders of the cells where a proposer
+outranks one of them; cells that can take all their proposals skip the
+sort. The number of rounds is capped, which bounds latency.
+
+SteeringSolver keeps its assignment. After a load change, cells pushed
+over capacity shed their weakest UEs. Only those UEs, and unplaced UEs
+next to a cell that gained room, propose again, so every other UE stays
+on its cell.
+"""
+
+import re
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Capacity of a target cell that does not state one
+DEFAULT_CAPACITY_MBPS = {"LTE": 150.0, "NR": 1000.0, "WIFI": 600.0}
+DEFAULT_RAT = "NR"
+RAT_ALIASES = {"4G": "LTE", "5G": "NR", "5GNR": "NR", "WIFI6": "WIFI", "WIFI6E": "WIFI", "WLAN": "WIFI"}
+DEFAULT_LOAD_THRESHOLD = 0.8
+DEFAULT_DEMAND_MBPS = 2.0
+# Measurements below this SINR are not candidates
+MIN_SINR_DB = -6.0
+# Candidate cells kept per UE, best first
+MAX_CANDIDATES = 8
+# UEs still proposing after this many rounds stay unplaced
+MAX_ROUNDS = 64
+# Cells listed in a plan result, most utilized first; the totals cover all of them
+CELL_REPORT_LIMIT = 20
+# Slack on capacity checks, in Mbps
+CAPACITY_EPSILON = 1e-6
+# Scores closer than this count as equal when cells rank their UEs
+SCORE_RESOLUTION_DB = 1e-6
+
+
+def parse_ratio(value: Any, default: float) -> float:
+    """0.8, 80 or "80%" as 0.8"""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float(value) / 100.0 if value > 1 else float(value)
+    match = re.fullmatch(r"\s*([0-9.]+)\s*(%?)\s*", str(value))
+    if not match:
+        return default
+    ratio = float(match.group(1))
+    return ratio / 100.0 if match.group(2) or ratio > 1 else ratio
+
+
+def normalize_rat(rat: Any) -> str:
+    key = re.sub(r"[\s_-]", "", str(rat)).upper()
+    return RAT_ALIASES.get(key, key)
+
+
+def candidate_lists(ue: np.ndarray, cell: np.ndarray, score: np.ndarray, ues: int,
+                    max_candidates: int = MAX_CANDIDATES) -> Tuple[np.ndarray, np.ndarray]:
+    """(ues, max_candidates) cell and score matrices from (ue, cell, score) rows.
+
+    Each UE's candidates are sorted best first; missing ones are -1 with
+    a score of -inf.
+    """
+    ue = np.asarray(ue, dtype=np.int64)
+    cell = np.asarray(cell, dtype=np.int64)
+    score = np.asarray(score, dtype=np.float64)
+    # Best score first, then a stable sort by UE keeps that order within each UE
+    order = np.argsort(-score)
+    order = order[np.argsort(ue[order], kind='stable')]
+    ue, cell, score = ue[order], cell[order], score[order]
+    rank = np.arange(len(ue)) - np.searchsorted(ue, ue)
+    keep = rank < max_candidates
+    cells = np.full((ues, max_candidates), -1, dtype=np.int64)
+    scores = np.full((ues, max_candidates), -np.inf)
+    cells[ue[keep], rank[keep]] = cell[keep]
+    scores[ue[keep], rank[keep]] = score[keep]
+    return cells, scores
+
+
+class SteeringSolver:
+    """Capacitated UE to cell assignment that can be re-solved after load changes.
+
+    candidates and scores are (UEs, K) matrices from candidate_lists();
+    demand is Mbps per UE; capacity and background (load that cannot be
+    steered) are Mbps per cell.
+    """
+
+    def __init__(self, candidates: np.ndarray, scores: np.ndarray, demand: Any, capacity: Any,
+                 background: Any = 0.0, load_threshold: float = DEFAULT_LOAD_THRESHOLD,
+                 max_rounds: int = MAX_ROUNDS):
+        self.candidates = np.asarray(candidates, dtype=np.int64)
+        self.scores = np.asarray(scores, dtype=np.float64)
+        ues = len(self.candidates)
+        self.capacity = np.asarray(capacity, dtype=np.float64)
+        self.demand = np.broadcast_to(np.asarray(demand, dtype=np.float64), (ues,)).copy()
+        self.background = np.broadcast_to(np.asarray(background, dtype=np.float64), self.capacity.shape).copy()
+        self.load_threshold = load_threshold
+        self.max_rounds = max_rounds
+        # Assigned cell (-1 when unplaced), score there and next candidate to propose to
+        self.cell = np.full(ues, -1, dtype=np.int64)
+        self.score = np.full(ues, -np.inf)
+        self.next = np.zeros(ues, dtype=np.int64)
+        self._load = np.zeros(len(self.capacity))
+        # Scores become integer levels below the best one, so that a pool
+        # is ranked with one integer sort on (cell, level, newcomer)
+        finite = self.scores[np.isfinite(self.scores)]
+        self._best = float(finite.max()) if len(finite) else 0.0
+        self._levels = int((self._best - float(finite.min())) / SCORE_RESOLUTION_DB) + 1 if len(finite) else 1
+
+    def available(self) -> np.ndarray:
+        """Mbps each cell may carry for steered UEs"""
+        return self.capacity * self.load_threshold - self.background
+
+    def load(self) -> np.ndarray:
+        """Steered Mbps on each cell"""
+        placed = self.cell >= 0
+        return np.bincount(self.cell[placed], weights=self.demand[placed], minlength=len(self.capacity))
+
+    def solve(self) -> int:
+        """Assign every UE from scratch; returns the rounds used"""
+        self.cell.fill(-1)
+        self.score.fill(-np.inf)
+        self.next.fill(0)
+        self._load = np.zeros(len(self.capacity))
+        return self._propose(np.arange(len(self.cell)))
+
+    def update(self, demand: Any = None, background: Any = None, capacity: Any = None) -> Dict[str, int]:
+        """Apply new loads and re-solve only the UEs they displace.
+
+        Returns the rounds used, the UEs shed by overloaded cells and the
+        UEs whose cell changed.
+        """
+        previous = self.cell.copy()
+        room = self.available() - self.load()
+        if demand is not None:
+            self.demand = np.broadcast_to(np.asarray(demand, dtype=np.float64), self.demand.shape).copy()
+        if background is not None:
+            self.background = np.broadcast_to(np.asarray(background, dtype=np.float64), self.capacity.shape).copy()
+        if capacity is not None:
+            self.capacity = np.asarray(capacity, dtype=np.float64)
+
+        shed = np.empty(0, dtype=np.int64)
+        over = self.load() > self.available() + CAPACITY_EPSILON
+        if over.any():
+            holders = np.flatnonzero((self.cell >= 0) & over[self.cell])
+            keep = self._fit(holders, self.cell[holders], self.score[holders], len(holders), self.available())
+            shed = holders[~keep]
+            self.cell[shed] = -1
+            self.score[shed] = -np.inf
+        self._load = self.load()
+        # Shed UEs carry on down their lists; unplaced UEs start again from
+        # the top when one of their candidates gained enough room to take them
+        now = self.available() - self._load
+        gained = np.append(np.where(now > room + CAPACITY_EPSILON, now, -np.inf), -np.inf)
+        unplaced = np.flatnonzero(previous < 0)
+        fits = gained[self.candidates[unplaced]] + CAPACITY_EPSILON >= self.demand[unplaced, None]
+        retry = unplaced[fits.any(axis=1)]
+        self.next[retry] = 0
+        rounds = self._propose(np.union1d(shed, retry))
+        return {"rounds": rounds, "shed": len(shed), "moved": int(np.count_nonzero(previous != self.cell))}
+
+    def _fit(self, pool: np.ndarray, pool_cell: np.ndarray, pool_score: np.ndarray, holders: int,
+             room: np.ndarray) -> np.ndarray:
+        """Which UEs of the pool their cell keeps: the best scores whose demands fit its room.
+
+        The first `holders` UEs of the pool already hold their cell and
+        win ties against newcomers.
+        """
+        if not len(pool):
+            return np.zeros(0, dtype=bool)
+        level = np.rint((self._best - pool_score) / SCORE_RESOLUTION_DB).astype(np.int64)
+        newcomer = np.arange(len(pool)) >= holders
+        order = np.argsort((pool_cell * self._levels + level) * 2 + newcomer)
+        cells = pool_cell[order]
+        demand = self.demand[pool[order]]
+        used = np.cumsum(demand)
+        starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+        before = np.repeat(used[starts] - demand[starts], np.diff(np.r_[starts, len(cells)]))
+        accept = np.empty(len(pool), dtype=bool)
+        accept[order] = used - before <= room[cells] + CAPACITY_EPSILON
+        return accept
+
+    def _propose(self, waiting: np.ndarray) -> int:
+        """Rounds of proposals by the waiting UEs and the UEs they displace"""
+        width = self.candidates.shape[1]
+        cells = len(self.capacity)
+        available = self.available()
+        rounds = 0
+        while len(waiting) and rounds < self.max_rounds:
+            waiting = waiting[self.next[waiting] < width]
+            choice = self.candidates[waiting, self.next[waiting]]
+            # Padding ends a UE's list
+            exhausted = choice < 0
+            self.next[waiting[exhausted]] = width
+            proposers, choice = waiting[~exhausted], choice[~exhausted]
+            if not len(proposers):
+                break
+            offer = self.scores[proposers, self.next[proposers]]
+            self.next[proposers] += 1
+            waiting = np.empty(0, dtype=np.int64)
+
+            # Cells that can take every proposal accept them as they are
+            offered = np.bincount(choice, weights=self.demand[proposers], minlength=cells)
+            contested = self._load + offered > available + CAPACITY_EPSILON
+            direct = ~contested[choice]
+            self.cell[proposers[direct]] = choice[direct]
+            self.score[proposers[direct]] = offer[direct]
+            self._load += np.where(contested, 0.0, offered)
+            proposers, choice, offer = proposers[~direct], choice[~direct], offer[~direct]
+            if len(proposers):
+                # Holders only take part where a proposer outranks the weakest
+                # of them; elsewhere the proposers compete for the room left
+                holders = np.flatnonzero(np.append(contested, False)[self.cell])
+                weakest = np.full(cells, np.inf)
+                np.minimum.at(weakest, self.cell[holders], self.score[holders])
+                strongest = np.full(cells, -np.inf)
+                np.maximum.at(strongest, choice, offer)
+                reopened = contested & (strongest > weakest)
+                holders = holders[reopened[self.cell[holders]]]
+                pool = np.concatenate([holders, proposers])
+                pool_cell = np.concatenate([self.cell[holders], choice])
+                pool_score = np.concatenate([self.score[holders], offer])
+                room = np.where(reopened, available, available - self._load)
+                accept = self._fit(pool, pool_cell, pool_score, len(holders), room)
+                self._load -= np.bincount(pool_cell[:len(holders)], weights=self.demand[holders], minlength=cells)
+                self._load += np.bincount(pool_cell[accept], weights=self.demand[pool[accept]], minlength=cells)
+                self.cell[pool] = np.where(accept, pool_cell, -1)
+                self.score[pool] = np.where(accept, pool_score, -np.inf)
+                # Rejected proposers and displaced holders propose again
+                waiting = pool[~accept]
+            rounds += 1
+        return rounds
+
+
+def _column(columns: Dict[str, Any], names: Sequence[str]) -> Optional[List[Any]]:
+    for name in names:
+        if columns.get(name) is not None:
+            return list(columns[name])
+    return None
+
+
+def steer_for_plan(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the solver on a traffic steering plan's policy and target cells.
+
+    target_cells are cell ids or {id, rat, capacityMbps?, loadMbps?}.
+    steering_policy holds loadThreshold ("80%"), ratPreference ({rat:
+    dB bias}), minSinrDb, and the UE data as columns: "measurements":
+    {ue, cell, sinrDb} with one row per UE and candidate cell, and
+    optionally "ues": {id, demandMbps, servingCell}.
+    """
+    policy = plan.get("policy") or {}
+    cells = [cell if isinstance(cell, dict) else {"id": cell} for cell in plan.get("targetCells") or []]
+    measurements = policy.get("measurements") or {}
+    measured_ues = _column(measurements, ("ue", "ueId"))
+    if not cells or not measured_ues:
+        return {"status": "SKIPPED", "reason": "plan has no target cells or UE measurements"}
+
+    start = time.perf_counter()
+    threshold = parse_ratio(policy.get("loadThreshold"), DEFAULT_LOAD_THRESHOLD)
+    cell_ids = [str(cell.get("id", i)) for i, cell in enumerate(cells)]
+    cell_index = {cell_id: i for i, cell_id in enumerate(cell_ids)}
+    rats = [normalize_rat(cell.get("rat", DEFAULT_RAT)) for cell in cells]
+    capacity = np.array([float(cell.get("capacityMbps", DEFAULT_CAPACITY_MBPS.get(rat, DEFAULT_CAPACITY_MBPS[DEFAULT_RAT])))
+                         for cell, rat in zip(cells, rats)])
+    background = np.array([float(cell.get("loadMbps", 0.0)) for cell in cells])
+    preference = {normalize_rat(rat): float(bias) for rat, bias in (policy.get("ratPreference") or {}).items()}
+    bias = np.array([preference.get(rat, 0.0) for rat in rats])
+
+    ue_columns = policy.get("ues") or {}
+    ue_ids = [str(ue) for ue in (_column(ue_columns, ("id", "ueId")) or dict.fromkeys(measured_ues))]
+    ue_index = {ue_id: i for i, ue_id in enumerate(ue_ids)}
+    demand = _column(ue_columns, ("demandMbps",))
+    demand = np.array(demand, dtype=np.float64) if demand is not None else DEFAULT_DEMAND_MBPS
+
+    # Rows for UEs or cells outside the plan are dropped
+    rows = [(ue_index.get(str(ue), -1), cell_index.get(str(cell), -1))
+            for ue, cell in zip(measured_ues, _column(measurements, ("cell", "cellId")) or [])]
+    ue, cell = np.array(rows, dtype=np.int64).reshape(-1, 2).T
+    sinr = np.array(_column(measurements, ("sinrDb", "sinr")) or [], dtype=np.float64)[:len(ue)]
+    usable = (ue >= 0) & (cell >= 0) & (sinr >= float(policy.get("minSinrDb", MIN_SINR_DB)))
+    candidates, scores = candidate_lists(ue[usable], cell[usable], sinr[usable] + bias[cell[usable]], len(ue_ids),
+                                         int(policy.get("maxCandidates", MAX_CANDIDATES)))
+
+    solver = SteeringSolver(candidates, scores, demand, capacity, background, threshold)
+    rounds = solver.solve()
+
+    placed = solver.cell >= 0
+    handovers = 0
+    serving = _column(ue_columns, ("servingCell",))
+    if serving is not None:
+        current = np.array([cell_index.get(str(c), -1) for c in serving], dtype=np.int64)
+        handovers = int(np.count_nonzero(placed & (current != solver.cell)))
+    utilization = (solver.load() + background) / capacity
+    counts = np.bincount(solver.cell[placed], minlength=len(cells))
+    by_rat: Dict[str, int] = {}
+    for rat, count in zip(rats, counts):
+        by_rat[rat] = by_rat.get(rat, 0) + int(count)
+    return {
+        "status": "STEERED",
+        "ues": len(ue_ids),
+        "cells": len(cells),
+        "loadThreshold": threshold,
+        "placed": int(np.count_nonzero(placed)),
+        "unplaced": int(np.count_nonzero(~placed)),
+        "handovers": handovers,
+        "byRat": by_rat,
+        "rounds": rounds,
+        "maxUtilization": round(float(utilization.max()), 3),
+        "cellLoad": [
+            {"cell": cell_ids[i], "rat": rats[i], "ues": int(counts[i]), "utilization": round(float(utilization[i]), 3)}
+            for i in np.argsort(-utilization, kind='stable')[:CELL_REPORT_LIMIT]
+        ],
+        "computeMs": round((time.perf_counter() - start) * 1000, 1),
+    }
@@ -0,0 +1,237 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Serving cell and beam allocation along UAV flight paths.
+
+Cell sites go into a uniform grid index; every grid bucket keeps the
+sites of its 3x3 neighbourhood as one padded row, so the nearest site of
+any number of points is found with one gather and one argmin. A point
+whose nearest candidate is further away than the edge of its
+neighbourhood falls back to a search over all sites, so the answer is
+always exact. Flight paths of a whole swarm are cut into segments and
+allocated together: each segment gets the site nearest (in 3D) to its
+midpoint and the beam of that site pointing at it, from a grid of
+azimuth x elevation beams.
+"""
+
+import math
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_SITE_HEIGHT_M = 30.0
+# Long legs are cut so that no segment is longer than this
+MAX_SEGMENT_M = 200.0
+AZIMUTH_BEAMS = 8
+ELEVATION_BEAMS = 4
+# Average number of sites per grid bucket
+GRID_SITES_PER_BUCKET = 2.0
+# Allocation runs returned per drone in a plan result; the counts cover all of them
+ALLOCATION_RUN_LIMIT = 20
+EARTH_RADIUS_M = 6371000.0
+# Coordinate of the padding entries in the grid's neighbour rows
+FAR_AWAY_M = 1e12
+
+
+class CellGrid:
+    """Uniform grid over cell sites for batched nearest-site queries"""
+
+    def __init__(self, sites: np.ndarray, heights: Optional[np.ndarray] = None, bucket_m: Optional[float] = None):
+        self.sites = np.asarray(sites, dtype=np.float64).reshape(-1, 2)
+        count = len(self.sites)
+        self.heights = np.full(count, DEFAULT_SITE_HEIGHT_M) if heights is None else np.asarray(heights, dtype=np.float64)
+        low, high = self.sites.min(axis=0), self.sites.max(axis=0)
+        if bucket_m is None:
+            area = max(float(np.prod(np.maximum(high - low, 1.0))), 1.0)
+            bucket_m = math.sqrt(area * GRID_SITES_PER_BUCKET / count)
+        self.bucket_m = bucket_m
+        self.origin = low
+        self.shape = np.maximum(np.floor((high - low) / bucket_m).astype(np.int64) + 1, 1)
+
+        bucket = self._bucket(self.sites)
+        # Sites of every 3x3 neighbourhood, padded with -1
+        members = [[] for _ in range(int(np.prod(self.shape)))]
+        for site, (bx, by) in enumerate(bucket):
+            for nx in range(max(bx - 1, 0), min(bx + 2, self.shape[0])):
+                for ny in range(max(by - 1, 0), min(by + 2, self.shape[1])):
+                    members[nx * self.shape[1] + ny].append(site)
+        width = max(max(len(m) for m in members), 1)
+        self.neighbours = np.full((len(members), width), -1, dtype=np.int64)
+        for index, sites_here in enumerate(members):
+            self.neighbours[index, :len(sites_here)] = sites_here
+        # Neighbour coordinates laid out per bucket, so a query gathers whole
+        # rows; padding sits far away and never wins
+        valid = self.neighbours >= 0
+        self._x = np.where(valid, self.sites[self.neighbours, 0], FAR_AWAY_M)
+        self._y = np.where(valid, self.sites[self.neighbours, 1], FAR_AWAY_M)
+        self._h = np.where(valid, self.heights[self.neighbours], 0.0)
+
+    def _bucket(self, points: np.ndarray) -> np.ndarray:
+        bucket = np.floor((points - self.origin) / self.bucket_m).astype(np.int64)
+        return np.clip(bucket, 0, self.shape - 1)
+
+    def nearest(self, points: np.ndarray, altitudes: Optional[np.ndarray] = None):
+        """Index of and 3D distance to the nearest site for each (x, y) point"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        altitudes = np.zeros(len(points)) if altitudes is None else np.asarray(altitudes, dtype=np.float64)
+        bucket = self._bucket(points)
+        row = bucket[:, 0] * self.shape[1] + bucket[:, 1]
+        d2 = ((points[:, 0:1] - self._x[row]) ** 2 + (points[:, 1:2] - self._y[row]) ** 2
+              + (altitudes[:, None] - self._h[row]) ** 2)
+        best = np.argmin(d2, axis=1)
+        rows = np.arange(len(points))
+        site = self.neighbours[row, best]
+        distance = np.sqrt(d2[rows, best])
+
+        # Sites outside the neighbourhood are at least this far away
+        low = self.origin + (bucket - 1) * self.bucket_m
+        high = self.origin + (bucket + 2) * self.bucket_m
+        margin = np.minimum(
+            np.where(bucket > 0, points - low, np.inf),
+            np.where(bucket < self.shape - 1, high - points, np.inf),
+        ).min(axis=1)
+        unsure = np.nonzero(~(distance <= margin))[0]
+        if len(unsure):
+            offset = points[unsure, None, :] - self.sites[None, :, :]
+            d2 = np.einsum('ijk,ijk->ij', offset, offset) + (altitudes[unsure, None] - self.heights[None, :]) ** 2
+            site[unsure] = np.argmin(d2, axis=1)
+            distance[unsure] = np.sqrt(d2[np.arange(len(unsure)), site[unsure]])
+        return site, distance
+
+
+def beam_index(site_xy: np.ndarray, site_height: np.ndarray, points: np.ndarray, altitudes: np.ndarray,
+               azimuth_beams: int = AZIMUTH_BEAMS, elevation_beams: int = ELEVATION_BEAMS) -> np.ndarray:
+    """Beam of each site pointing at each point: azimuth bin * elevation_beams + elevation bin"""
+    delta = points - site_xy
+    azimuth = np.mod(np.arctan2(delta[:, 1], delta[:, 0]), 2 * math.pi)
+    elevation = np.arctan2(altitudes - site_height, np.hypot(delta[:, 0], delta[:, 1]))
+    az_bin = np.minimum((azimuth / (2 * math.pi) * azimuth_beams).astype(np.int64), azimuth_beams - 1)
+    # Elevation beams cover the horizon up to zenith
+    el_bin = np.clip((elevation / (math.pi / 2) * elevation_beams).astype(np.int64), 0, elevation_beams - 1)
+    return az_bin * elevation_beams + el_bin
+
+
+class SegmentAllocation:
+    """Per-segment allocation of a swarm as parallel arrays"""
+
+    def __init__(self, drone, start, end, site, beam, distance):
+        self.drone = drone
+        self.start = start
+        self.end = end
+        self.site = site
+        self.beam = beam
+        self.distance = distance
+
+    def __len__(self):
+        return len(self.drone)
+
+    def runs(self) -> np.ndarray:
+        """Start index of every run of consecutive segments of a drone on the same site and beam"""
+        if not len(self.drone):
+            return np.empty(0, dtype=np.int64)
+        change = np.ones(len(self.drone), dtype=bool)
+        change[1:] = (self.drone[1:] != self.drone[:-1]) | (self.site[1:] != self.site[:-1]) | (self.beam[1:] != self.beam[:-1])
+        return np.nonzero(change)[0]
+
+
+def allocate_segments(paths: Sequence[np.ndarray], grid: CellGrid, max_segment_m: float = MAX_SEGMENT_M,
+                      azimuth_beams: int = AZIMUTH_BEAMS, elevation_beams: int = ELEVATION_BEAMS) -> SegmentAllocation:
+    """Allocate every segment of every path in one pass.
+
+    paths holds one (W, 3) array of x, y, altitude waypoints per drone.
+    Legs longer than max_segment_m are cut into equal segments.
+    """
+    paths = [np.asarray(path, dtype=np.float64).reshape(-1, 3) for path in paths]
+    legs = [len(path) - 1 if len(path) > 1 else 0 for path in paths]
+    if not sum(legs):
+        empty = np.empty(0, dtype=np.int64)
+        return SegmentAllocation(empty, np.empty((0, 3)), np.empty((0, 3)), empty, empty, np.empty(0))
+    starts = np.concatenate([path[:-1] for path, n in zip(paths, legs) if n])
+    ends = np.concatenate([path[1:] for path, n in zip(paths, legs) if n])
+    drones = np.repeat(np.arange(len(paths)), legs)
+
+    # Cut long legs into pieces
+    pieces = np.maximum(np.ceil(np.linalg.norm(ends[:, :2] - starts[:, :2], axis=1) / max_segment_m), 1).astype(np.int64)
+    leg = np.repeat(np.arange(len(starts)), pieces)
+    first = np.repeat(np.cumsum(pieces) - pieces, pieces)
+    step = ((np.arange(len(leg)) - first) / pieces[leg])[:, None]
+    span = ends[leg] - starts[leg]
+    segment_start = starts[leg] + span * step
+    segment_end = segment_start + span / pieces[leg][:, None]
+
+    midpoint = (segment_start + segment_end) / 2.0
+    site, distance = grid.nearest(midpoint[:, :2], midpoint[:, 2])
+    beam = beam_index(grid.sites[site], grid.heights[site], midpoint[:, :2], midpoint[:, 2], azimuth_beams, elevation_beams)
+    return SegmentAllocation(drones[leg], segment_start, segment_end, site, beam, distance)
+
+
+def _local_xy(point: Dict[str, Any], reference: Optional[List[float]]) -> List[float]:
+    """x, y in metres from x/y, position or lat/lon (relative to the reference lat/lon)"""
+    if "x" in point:
+        return [float(point["x"]), float(point["y"])]
+    if "position" in point:
+        return [float(v) for v in point["position"][:2]]
+    lat, lon = float(point["lat"]), float(point["lon"])
+    ref_lat, ref_lon = reference or (lat, lon)
+    return [math.radians(lon - ref_lon) * EARTH_RADIUS_M * math.cos(math.radians(ref_lat)),
+            math.radians(lat - ref_lat) * EARTH_RADIUS_M]
+
+
+def allocate_for_plan(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the allocator on a UAV plan's flight path and requirements.
+
+    flight_path is a list of waypoints ({x, y, altitude} in metres, or
+    {lat, lon, altitude}) for one drone, or a list of {droneId,
+    waypoints} for a swarm; requirements hold "cells": [{id, position or
+    lat/lon, height?}] and optional maxSegmentM.
+    """
+    flight_path = plan.get("flightPath") or []
+    requirements = plan.get("requirements") or {}
+    cells = requirements.get("cells") or []
+    if flight_path and "waypoints" not in flight_path[0]:
+        flight_path = [{"droneId": "uav-0", "waypoints": flight_path}]
+    waypoints = [point for drone in flight_path for point in drone.get("waypoints", [])]
+    if not waypoints or not cells:
+        return {"status": "SKIPPED", "reason": "plan has no flight path waypoints or cell sites"}
+
+    start = time.perf_counter()
+    first = waypoints[0]
+    reference = [float(first["lat"]), float(first["lon"])] if "lat" in first else None
+    grid = CellGrid(
+        [_local_xy(cell, reference) for cell in cells],
+        [float(cell.get("height", DEFAULT_SITE_HEIGHT_M)) for cell in cells],
+    )
+    paths = [
+        [_local_xy(point, reference) + [float(point.get("altitude", point.get("alt", 0.0)))]
+         for point in drone.get("waypoints", [])]
+        for drone in flight_path
+    ]
+    allocation = allocate_segments(paths, grid, float(requirements.get("maxSegmentM", MAX_SEGMENT_M)))
+
+    drone_ids = [str(drone.get("droneId", i)) for i, drone in enumerate(flight_path)]
+    cell_ids = [str(cell.get("id", i)) for i, cell in enumerate(cells)]
+    runs = allocation.runs()
+    run_ends = np.append(runs[1:], len(allocation))
+    schedule: Dict[str, List[Dict[str, Any]]] = {}
+    for run, end in zip(runs, run_ends):
+        entries = schedule.setdefault(drone_ids[allocation.drone[run]], [])
+        if len(entries) < ALLOCATION_RUN_LIMIT:
+            entries.append({
+                "cell": cell_ids[allocation.site[run]],
+                "beam": int(allocation.beam[run]),
+                "fromSegment": int(run - np.searchsorted(allocation.drone, allocation.drone[run])),
+                "segments": int(end - run),
+            })
+    switches = len(runs) - len(np.unique(allocation.drone))
+    return {
+        "status": "ALLOCATED",
+        "drones": len(flight_path),
+        "segments": len(allocation),
+        "cellsUsed": int(len(np.unique(allocation.site))),
+        "beamSwitches": int(switches),
+        "handovers": int(np.count_nonzero(np.diff(allocation.site)[np.diff(allocation.drone) == 0])),
+        "maxDistanceM": round(float(allocation.distance.max()), 1),
+        "schedule": schedule,
+        "computeMs": round((time.perf_counter() - start) * 1000, 1),
+    }
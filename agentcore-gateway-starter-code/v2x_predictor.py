@@ -0,0 +1,244 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Vectorized handover prediction for V2X plans.
+
+Vehicles move along their current velocity over the prediction window.
+At every step each vehicle's received power from every cell follows a
+log-distance path loss, and an A3-style rule (neighbour better than the
+serving cell by the hysteresis for the time-to-trigger) decides the
+handovers. All vehicles in a chunk are stepped together with NumPy.
+One pass over the vehicle x cell matrix at the midpoint of each path
+bounds which cells can become strongest anywhere along it; the time
+steps then only evaluate those few candidate cells per vehicle.
+"""
+
+import math
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Log-distance path loss exponent (urban macro)
+PATH_LOSS_EXPONENT = 3.5
+DEFAULT_TX_POWER_DBM = 43.0
+DEFAULT_WINDOW_SECONDS = 5.0
+DEFAULT_STEP_SECONDS = 0.5
+DEFAULT_HYSTERESIS_DB = 3.0
+DEFAULT_TIME_TO_TRIGGER_SECONDS = 0.0
+# Vehicle x cell elements evaluated at once; bounds memory at city scale
+PREDICTOR_CHUNK_ELEMENTS = int(os.environ.get('V2X_PREDICTOR_CHUNK_ELEMENTS', str(4 * 1024 * 1024)))
+# Handover events returned in a plan result; the counts cover all of them
+HANDOVER_EVENT_LIMIT = 100
+
+
+def parse_seconds(value: Any, default: float) -> float:
+    """5, "5", "5s", "500ms" or "1min" as seconds"""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.fullmatch(r"\s*([0-9.]+)\s*(ms|s|sec|min)?\s*", str(value))
+    if not match:
+        return default
+    scale = {"ms": 0.001, "min": 60.0}.get(match.group(2), 1.0)
+    return float(match.group(1)) * scale
+
+
+class HandoverSchedule:
+    """Predicted handovers as parallel arrays, one entry per event"""
+
+    def __init__(self, initial_serving: np.ndarray, final_serving: np.ndarray, vehicle: np.ndarray,
+                 time_s: np.ndarray, source: np.ndarray, target: np.ndarray):
+        self.initial_serving = initial_serving
+        self.final_serving = final_serving
+        self.vehicle = vehicle
+        self.time_s = time_s
+        self.source = source
+        self.target = target
+
+    def __len__(self):
+        return len(self.vehicle)
+
+    def events(self, vehicle_ids: Optional[Sequence[str]] = None, cell_ids: Optional[Sequence[str]] = None,
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Events in time order, with ids mapped when given"""
+        order = np.lexsort((self.vehicle, self.time_s))[:limit]
+        vehicle_name = (lambda i: vehicle_ids[i]) if vehicle_ids is not None else int
+        cell_name = (lambda i: cell_ids[i]) if cell_ids is not None else int
+        return [
+            {
+                "vehicleId": vehicle_name(self.vehicle[i]),
+                "timeSeconds": round(float(self.time_s[i]), 3),
+                "fromCell": cell_name(self.source[i]),
+                "toCell": cell_name(self.target[i]),
+            }
+            for i in order
+        ]
+
+
+def predict_handovers(positions, velocities, cell_positions, cell_power_dbm=None,
+                      window_s: float = DEFAULT_WINDOW_SECONDS, step_s: float = DEFAULT_STEP_SECONDS,
+                      hysteresis_db: float = DEFAULT_HYSTERESIS_DB,
+                      time_to_trigger_s: float = DEFAULT_TIME_TO_TRIGGER_SECONDS,
+                      serving=None, chunk_elements: int = PREDICTOR_CHUNK_ELEMENTS) -> HandoverSchedule:
+    """Predict the serving cell of N vehicles over the window.
+
+    positions and velocities are (N, 2) in metres and m/s, cell_positions
+    (M, 2) in metres and cell_power_dbm (M,). serving optionally gives the
+    current serving cell index per vehicle; otherwise vehicles start on
+    their strongest cell.
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    velocities = np.asarray(velocities, dtype=np.float64).reshape(-1, 2)
+    cells = np.asarray(cell_positions, dtype=np.float64).reshape(-1, 2)
+    power = np.full(len(cells), DEFAULT_TX_POWER_DBM) if cell_power_dbm is None else np.asarray(cell_power_dbm, dtype=np.float64)
+    n_vehicles, n_cells = len(positions), len(cells)
+    steps = max(int(math.floor(window_s / step_s + 1e-9)), 0)
+    # Consecutive steps the A3 condition must hold before the handover fires
+    trigger_steps = max(int(math.ceil(time_to_trigger_s / step_s - 1e-9)), 1)
+
+    # Received power is P - 10n*log10(d) up to a constant, so the strongest
+    # cell is the one with the smallest d * 10^(-P / 10n)
+    slope = 10.0 * PATH_LOSS_EXPONENT
+    scale = 10.0 ** (-(power - power.max()) / slope)
+    # Float32 pruning pass on coordinates centred on the cells
+    origin = cells.mean(axis=0) if n_cells else np.zeros(2)
+    cells32 = (cells - origin).astype(np.float32)
+    cell_norm = np.einsum('ij,ij->i', cells32, cells32)
+    scale2 = (scale ** 2).astype(np.float32)
+
+    initial = np.empty(n_vehicles, dtype=np.int64)
+    final = np.empty(n_vehicles, dtype=np.int64)
+    events = {"vehicle": [], "time": [], "source": [], "target": []}
+    chunk = max(1, chunk_elements // max(n_cells, 1))
+
+    for start in range(0, n_vehicles, chunk):
+        stop = min(start + chunk, n_vehicles)
+        p0, v = positions[start:stop], velocities[start:stop]
+        rows = np.arange(stop - start)
+
+        # Every point of a vehicle's path lies within r of the path midpoint.
+        # The cell strongest at the midpoint is at most scale*(d + r) away in
+        # weighted distance anywhere on the path, and weighted distance is at
+        # least the plain distance, so no cell further than that plus r from
+        # the midpoint can become strongest.
+        half = v * (steps * step_s / 2.0)
+        midpoint = (p0 + half - origin).astype(np.float32)
+        r = np.sqrt(np.einsum('ij,ij->i', half, half))
+        midpoint_norm = np.einsum('ij,ij->i', midpoint, midpoint)
+        d2 = midpoint_norm[:, None] - 2.0 * (midpoint @ cells32.T) + cell_norm[None, :]
+        nearest = np.argmin(d2 * scale2, axis=1)
+        reach = scale[nearest] * (np.sqrt(np.maximum(d2[rows, nearest], 0.0)) + r) + r
+        # Slack for float32 rounding in the expanded square
+        slack = 1e-5 * (midpoint_norm + cell_norm.max()) + 1.0
+        row, column = np.nonzero(d2 <= (reach * reach + slack)[:, None])
+        counts = np.bincount(row, minlength=stop - start)
+        width = int(counts.max())
+        # Rows with fewer candidates are padded with their own first candidate
+        candidates = np.repeat(column[np.concatenate([[0], np.cumsum(counts)[:-1]])][:, None], width, axis=1)
+        candidates[row, np.arange(len(row)) - np.repeat(np.cumsum(counts) - counts, counts)] = column
+        current_local = None
+        if serving is not None:
+            # The given serving cell is the first candidate of its vehicle
+            candidates = np.hstack([np.asarray(serving[start:stop], dtype=np.int64)[:, None], candidates])
+            current_local = np.zeros(stop - start, dtype=np.int64)
+        candidate_positions = cells[candidates]
+        candidate_power = power[candidates]
+        pending = np.full(stop - start, -1, dtype=np.int64)
+        held = np.zeros(stop - start, dtype=np.int64)
+
+        for k in range(steps + 1):
+            t = k * step_s
+            offset = (p0 + v * t)[:, None, :] - candidate_positions
+            rsrp = candidate_power - (slope / 2.0) * np.log10(np.maximum(np.einsum('ijk,ijk->ij', offset, offset), 1.0))
+            best_local = np.argmax(rsrp, axis=1)
+            if current_local is None:
+                current_local = best_local.copy()
+            if k == 0:
+                initial[start:stop] = candidates[rows, current_local]
+                continue
+            best = candidates[rows, best_local]
+            current = candidates[rows, current_local]
+            gain = rsrp[rows, best_local] - rsrp[rows, current_local]
+            entering = (best != current) & (gain > hysteresis_db)
+            held = np.where(entering & (best == pending), held + 1, entering.astype(np.int64))
+            pending = np.where(entering, best, -1)
+            fire = held >= trigger_steps
+            if fire.any():
+                index = np.nonzero(fire)[0]
+                events["vehicle"].append(index + start)
+                events["time"].append(np.full(len(index), t))
+                events["source"].append(current[index])
+                events["target"].append(best[index])
+                current_local[index] = best_local[index]
+                held[index] = 0
+                pending[index] = -1
+        final[start:stop] = candidates[rows, current_local]
+
+    def joined(name, dtype):
+        return np.concatenate(events[name]).astype(dtype) if events[name] else np.empty(0, dtype=dtype)
+
+    return HandoverSchedule(initial, final, joined("vehicle", np.int64), joined("time", np.float64),
+                            joined("source", np.int64), joined("target", np.int64))
+
+
+def _vehicle_velocity(vehicle: Dict[str, Any]) -> List[float]:
+    if "velocity" in vehicle:
+        return list(vehicle["velocity"])[:2]
+    speed = float(vehicle.get("speed", float(vehicle.get("speed_kmh", 0.0)) / 3.6))
+    heading = math.radians(float(vehicle.get("heading", vehicle.get("heading_deg", 0.0))))
+    return [speed * math.cos(heading), speed * math.sin(heading)]
+
+
+def predict_for_plan(plan: Dict[str, Any], prediction_window: Any = None) -> Dict[str, Any]:
+    """Run the predictor on a V2X plan's trajectory and mobility context.
+
+    vehicle_trajectory holds "vehicles": [{id, position: [x, y], velocity:
+    [vx, vy] or speed_kmh and heading_deg, servingCell?}] and
+    mobility_context holds "cells": [{id, position: [x, y], txPowerDbm?}]
+    plus optional predictionWindow (else prediction_window), stepSeconds,
+    hysteresisDb and timeToTrigger.
+    """
+    trajectory = plan.get("trajectory") or {}
+    context = plan.get("context") or {}
+    vehicles = trajectory.get("vehicles") or []
+    cells = context.get("cells") or []
+    if not vehicles or not cells:
+        return {"status": "SKIPPED", "reason": "plan has no vehicle positions or cell layout"}
+
+    start = time.perf_counter()
+    window = parse_seconds(context.get("predictionWindow", prediction_window), DEFAULT_WINDOW_SECONDS)
+    step = parse_seconds(context.get("stepSeconds"), DEFAULT_STEP_SECONDS)
+    cell_ids = [str(cell.get("id", i)) for i, cell in enumerate(cells)]
+    cell_index = {cell_id: i for i, cell_id in enumerate(cell_ids)}
+    vehicle_ids = [str(vehicle.get("id", i)) for i, vehicle in enumerate(vehicles)]
+    serving = None
+    if all(vehicle.get("servingCell") in cell_index for vehicle in vehicles):
+        serving = np.array([cell_index[vehicle["servingCell"]] for vehicle in vehicles])
+
+    schedule = predict_handovers(
+        [vehicle["position"][:2] for vehicle in vehicles],
+        [_vehicle_velocity(vehicle) for vehicle in vehicles],
+        [cell["position"][:2] for cell in cells],
+        [float(cell.get("txPowerDbm", DEFAULT_TX_POWER_DBM)) for cell in cells],
+        window_s=window,
+        step_s=step,
+        hysteresis_db=float(context.get("hysteresisDb", DEFAULT_HYSTERESIS_DB)),
+        time_to_trigger_s=parse_seconds(context.get("timeToTrigger"), DEFAULT_TIME_TO_TRIGGER_SECONDS),
+        serving=serving,
+    )
+    return {
+        "status": "PREDICTED",
+        "vehicles": len(vehicles),
+        "cells": len(cells),
+        "windowSeconds": window,
+        "stepSeconds": step,
+        "handovers": len(schedule),
+        "vehiclesWithHandover": int(len(np.unique(schedule.vehicle))),
+        "events": schedule.events(vehicle_ids, cell_ids, limit=HANDOVER_EVENT_LIMIT),
+        "truncated": len(schedule) > HANDOVER_EVENT_LIMIT,
+        "computeMs": round((time.perf_counter() - start) * 1000, 1),
+    }
@@ -0,0 +1,185 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Regional cell sleep scheduling: vectorized optimizer vs the same algorithm in a Python loop.
+
+Cells of a region report hourly load for a few weeks; cells are grouped
+in clusters of neighbours with one coverage cell each, e.g.
+
+    python benchmarks/bench_energy_saving.py --cells 5000 --days 28 --target 0.3
+
+Also times the streaming path: one new hour of E2 samples folded in and
+the schedule rebuilt.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "agentcore-gateway-starter-code"))
+
+from energy_optimizer import FULL_LOAD_POWER_W, IDLE_POWER_W, MIN_SLEEP_HOURS, EnergyOptimizer
+
+
+def region(cells, days, cluster, rng):
+    """Columnar hourly load history with a daily profile per cell"""
+    peak = rng.uniform(0.15, 0.9, cells)
+    busy_hour = rng.normal(19, 2, cells)
+    cell = np.repeat(np.arange(cells), days * 24)
+    hour = np.tile(np.arange(days * 24), cells)
+    profile = 0.5 + 0.5 * np.cos((hour % 24 - busy_hour[cell]) / 24 * 2 * math.pi)
+    weekend = np.where((hour // 24) % 7 >= 5, 0.8, 1.0)
+    load = np.clip(peak[cell] * (0.1 + 0.9 * profile) * weekend + rng.normal(0, 0.03, len(cell)), 0, 1)
+    capacity = rng.choice([1.0, 2.0, 4.0], cells, p=[0.5, 0.3, 0.2])
+    group = np.arange(cells) // cluster
+    coverage = np.arange(cells) % cluster == 0
+    return cell, hour, load, capacity, group, coverage
+
+
+def python_schedule(cell, hour, load, capacity, group, coverage, sleep_power_w, alpha, target, max_load, share):
+    """Reference: per-sample forecast and per-(group, hour) sleep selection in Python"""
+    cells, hours = len(capacity), 24
+    forecast = [[None] * hours for _ in range(cells)]
+    periods = {}
+    for c, h, value in zip(cell.tolist(), hour.tolist(), load.tolist()):
+        slot = periods.setdefault(h // hours, {}).setdefault((c, h % hours), [0.0, 0])
+        slot[0] += value
+        slot[1] += 1
+    for period in sorted(periods):
+        for (c, h), (total, count) in periods[period].items():
+            mean = total / count
+            forecast[c][h] = mean if forecast[c][h] is None else (1 - alpha) * forecast[c][h] + alpha * mean
+
+    members = {}
+    for c, g in enumerate(group.tolist()):
+        members.setdefault(g, []).append(c)
+    candidate = [[False] * hours for _ in range(cells)]
+    for g, cluster in members.items():
+        min_awake = max(math.ceil(len(cluster) * share), 1)
+        for h in range(hours):
+            total_capacity = sum(capacity[c] for c in cluster)
+            total_load = sum((forecast[c][h] or 0.0) * capacity[c] for c in cluster)
+            eligible = sorted((forecast[c][h], c) for c in cluster if not coverage[c] and forecast[c][h] is not None)
+            asleep_capacity = 0.0
+            for count, (_, c) in enumerate(eligible, 1):
+                asleep_capacity += capacity[c]
+                if ((total_capacity - asleep_capacity) * max_load < total_load - 1e-9
+                        or len(cluster) - count < min_awake):
+                    break
+                candidate[c][h] = True
+
+    windows = []
+    for c in range(cells):
+        row = candidate[c]
+        if all(row):
+            windows.append((c, 0, hours))
+            continue
+        # Start right after an awake hour so that nights spanning midnight stay whole
+        first_awake = row.index(False)
+        h = first_awake + 1
+        while h < first_awake + 1 + hours:
+            if row[h % hours]:
+                start = h
+                while row[h % hours]:
+                    h += 1
+                windows.append((c, start % hours, h - start))
+            h += 1
+    baseline = cells * hours * IDLE_POWER_W + FULL_LOAD_POWER_W * sum(v or 0.0 for row in forecast for v in row)
+    ranked = sorted((sum(forecast[c][(s + i) % hours] for i in range(n)) / n, -n, c, s, n)
+                    for c, s, n in windows if n >= MIN_SLEEP_HOURS)
+    sleep = np.zeros((cells, hours), dtype=bool)
+    saved = 0.0
+    for _, _, c, s, n in ranked:
+        if saved >= target * baseline - 1e-9:
+            break
+        for i in range(n):
+            sleep[c, (s + i) % hours] = True
+        saved += n * (IDLE_POWER_W - sleep_power_w)
+    return sleep
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cells", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=28, help="Days of hourly load history")
+    parser.add_argument("--cluster", type=int, default=8, help="Cells per coverage group")
+    parser.add_argument("--target", type=float, default=0.3, help="Energy reduction target")
+    parser.add_argument("--max-load", type=float, default=0.7)
+    parser.add_argument("--min-awake-share", type=float, default=0.25)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-baseline", action="store_true", help="Skip the Python reference loop")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    cell, hour, load, capacity, group, coverage = region(args.cells, args.days, args.cluster, rng)
+
+    def fresh():
+        return EnergyOptimizer(args.cells, capacity, group, coverage)
+
+    ingest = float("inf")
+    for _ in range(args.repeat):
+        optimizer = fresh()
+        start = time.perf_counter()
+        optimizer.ingest(cell, hour, load)
+        ingest = min(ingest, time.perf_counter() - start)
+    scheduling = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        schedule = optimizer.schedule(args.target, args.max_load, args.min_awake_share)
+        scheduling = min(scheduling, time.perf_counter() - start)
+
+    # Streaming: one E2 report per cell for the next hour, then a new schedule
+    streaming = float("inf")
+    sample = np.clip(load[hour == args.days * 24 - 23] * rng.uniform(0.9, 1.1, args.cells), 0, 1)
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        optimizer.ingest(np.arange(args.cells), np.full(args.cells, args.days * 24 + 1), sample)
+        optimizer.schedule(args.target, args.max_load, args.min_awake_share)
+        streaming = min(streaming, time.perf_counter() - start)
+
+    best = ingest + scheduling
+    report = {
+        "cells": args.cells,
+        "samples": len(load),
+        "ingest_ms": round(ingest * 1000, 1),
+        "schedule_ms": round(scheduling * 1000, 1),
+        "streaming_update_ms": round(streaming * 1000, 1),
+        "target_reduction": args.target,
+        "achieved_reduction": round(schedule.reduction, 4),
+        "sleeping_cell_hours": int(schedule.sleep.sum()),
+        "cells_with_sleep": int(np.count_nonzero(schedule.sleep.any(axis=1))),
+    }
+    if not args.skip_baseline:
+        start = time.perf_counter()
+        reference = python_schedule(cell, hour, load, capacity, group, coverage, optimizer.sleep_power_w,
+                                    optimizer.alpha, args.target, args.max_load, args.min_awake_share)
+        baseline = time.perf_counter() - start
+        report["python_loop_ms"] = round(baseline * 1000, 1)
+        report["python_loop_matches"] = bool(np.array_equal(reference, schedule.sleep))
+        report["speedup"] = round(baseline / best, 1)
+
+    print(f"{report['cells']} cells, {report['samples']} samples: {report['achieved_reduction']:.1%} saved "
+          f"(target {args.target:.0%}), {report['sleeping_cell_hours']} cell-hours asleep "
+          f"across {report['cells_with_sleep']} cells")
+    print(f"ingest history   {report['ingest_ms']:>10.1f} ms")
+    print(f"schedule         {report['schedule_ms']:>10.1f} ms")
+    if not args.skip_baseline:
+        print(f"python loop      {report['python_loop_ms']:>10.1f} ms  (same schedule: {report['python_loop_matches']})")
+        print(f"speedup          {report['speedup']:>10.1f}x")
+    print(f"streaming hour   {report['streaming_update_ms']:>10.1f} ms  ingest + schedule")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Massive MIMO precoding: batched kernel vs one NumPy call per cell and user group.
+
+Synthetic CSI for a 64T64R array with 500 users per cell over a cluster
+of cells and subbands, e.g.
+
+    python benchmarks/bench_mimo_beamforming.py --cells 21 --subbands 4 --users 500 --antennas 64 --layers 16
+
+Both paths use the same user groups; their precoders must match.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "agentcore-gateway-starter-code"))
+
+from mimo_kernel import PRECODERS, beamform, group_channels, group_users, precode, synthetic_channels
+
+
+def per_group(grouped, method, noise_power):
+    """Reference: the same precoder computed matrix by matrix"""
+    precoders = np.empty(grouped.shape[:-2] + grouped.shape[-1:] + grouped.shape[-2:-1], dtype=grouped.dtype)
+    for index in np.ndindex(grouped.shape[:-2]):
+        precoders[index] = precode(grouped[index], method, noise_power)
+    return precoders
+
+
+def timed(func, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cells", type=int, default=21)
+    parser.add_argument("--subbands", type=int, default=4)
+    parser.add_argument("--users", type=int, default=500, help="Users per cell")
+    parser.add_argument("--antennas", type=int, default=64)
+    parser.add_argument("--layers", type=int, default=16, help="Users co-scheduled per group")
+    parser.add_argument("--snr", type=float, default=10.0, help="Transmit SNR in dB")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    channels = synthetic_channels(args.cells * args.subbands, args.users, args.antennas, args.seed)
+    channels = channels.reshape(args.cells, args.subbands, args.users, args.antennas)
+    noise_power = 10 ** (-args.snr / 10)
+    grouped = group_channels(channels, group_users(channels, args.layers))
+    matrices = int(np.prod(grouped.shape[:-2]))
+
+    report = {
+        "cells": args.cells,
+        "subbands": args.subbands,
+        "users": args.users,
+        "antennas": args.antennas,
+        "layers": args.layers,
+        "precoder_matrices": matrices,
+        "precoders": {},
+    }
+    print(f"{args.cells} cells x {args.subbands} subbands, {args.users} users, {args.antennas}T, "
+          f"{args.layers} layers: {matrices} precoders per method")
+    for method in PRECODERS:
+        batched, precoders = timed(lambda: precode(grouped, method, noise_power), args.repeat)
+        looped, reference = timed(lambda: per_group(grouped, method, noise_power), 1)
+        end_to_end, result = timed(lambda: beamform(channels, method, args.layers, args.snr), args.repeat)
+        entry = {
+            "batched_ms": round(batched * 1000, 1),
+            "per_group_ms": round(looped * 1000, 1),
+            "speedup": round(looped / batched, 1),
+            "matches": bool(np.allclose(precoders, reference, rtol=1e-3, atol=1e-5)),
+            "beamform_ms": round(end_to_end * 1000, 1),
+            "cell_efficiency": round(float(result.cell_efficiency().mean()), 2),
+            "p5_user_efficiency": round(float(np.percentile(result.user_efficiency(), 5)), 4),
+        }
+        report["precoders"][method] = entry
+        print(f"{method:<5} batched {entry['batched_ms']:>8.1f} ms  per group {entry['per_group_ms']:>8.1f} ms  "
+              f"({entry['speedup']}x, same precoders: {entry['matches']})  with grouping and SINR "
+              f"{entry['beamform_ms']:>7.1f} ms  {entry['cell_efficiency']} bit/s/Hz per cell")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Wall-clock time per multi-tool turn: sequential calls vs MultiServerToolExecutor.
+
+Runs against in-process stand-ins for the R1 and O2 servers with a
+configurable per-call latency, e.g.
+
+    python benchmarks/bench_parallel_tools.py --r1-latency 0.12 --o2-latency 0.08
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mcp_server
+from fakes import FakeMCPClient
+from tool_executor import MultiServerToolExecutor
+
+R1_TOOLS = {
+    "get_rapps": lambda: [{"rappId": "qos-optimizer", "state": "PRIMED"}],
+    "get_rapp": lambda rapp_id: {"rappId": rapp_id, "state": "PRIMED"},
+}
+
+O2_TOOLS = {name: getattr(mcp_server, name) for name in (
+    "get_ocloud_info", "get_resource_pools", "get_resources", "get_resource_types",
+    "get_deployment_managers", "get_inventory_api_versions", "get_alarms",
+)}
+
+POOL_ID = "f078a1d3-56df-46c2-88a2-dd659aa3f6bd"
+
+TURNS = {
+    "r1+o2 fan-out": [
+        {"id": "rapps", "name": "get_rapps"},
+        {"id": "resources", "name": "get_resources", "arguments": {"resource_pool_id": POOL_ID}},
+    ],
+    "inventory sweep": [
+        {"id": "ocloud", "name": "get_ocloud_info"},
+        {"id": "pools", "name": "get_resource_pools"},
+        {"id": "types", "name": "get_resource_types"},
+        {"id": "dms", "name": "get_deployment_managers"},
+        {"id": "alarms", "name": "get_alarms"},
+        {"id": "rapps", "name": "get_rapps"},
+    ],
+    "dependent chain": [
+        {"id": "pools", "name": "get_resource_pools"},
+        {"id": "resources", "name": "get_resources", "arguments": {"resource_pool_id": POOL_ID}, "depends_on": ["pools"]},
+        {"id": "rapps", "name": "get_rapps"},
+        {"id": "rapp", "name": "get_rapp", "arguments": {"rapp_id": "qos-optimizer"}, "depends_on": ["rapps"]},
+    ],
+}
+
+
+def run_sequential(servers, tool_servers, calls):
+    for call in calls:
+        servers[tool_servers[call["name"]]].call_tool_sync(call["id"], call["name"], call.get("arguments"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--r1-latency", type=float, default=0.12, help="Seconds per R1 call")
+    parser.add_argument("--o2-latency", type=float, default=0.08, help="Seconds per O2 call")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent calls per server")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    servers = {
+        "r1": FakeMCPClient(R1_TOOLS, latency=args.r1_latency),
+        "o2": FakeMCPClient(O2_TOOLS, latency=args.o2_latency),
+    }
+    tool_servers = {name: s for s, client in servers.items() for name in client.tools}
+    executor = MultiServerToolExecutor(servers, default_concurrency=args.concurrency)
+    for name, server_type in tool_servers.items():
+        executor.set_tool_server(name, server_type)
+
+    print(f"{'turn':<18}{'calls':>6}{'sequential ms':>16}{'parallel ms':>14}{'speedup':>10}")
+    for turn, calls in TURNS.items():
+        sequential, parallel = [], []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            run_sequential(servers, tool_servers, calls)
+            sequential.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            results = executor.run(calls)
+            parallel.append(time.perf_counter() - start)
+            assert all(r["status"] == "success" for r in results), results
+        seq_ms = statistics.median(sequential) * 1000
+        par_ms = statistics.median(parallel) * 1000
+        print(f"{turn:<18}{len(calls):>6}{seq_ms:>16.1f}{par_ms:>14.1f}{seq_ms / par_ms:>9.1f}x")
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Stadium traffic steering: vectorized solver vs the same algorithm in a Python loop.
+
+UEs fill a stadium bowl served by NR small cells, LTE macro cells and
+Wi-Fi access points, with a denser crowd at one end, e.g.
+
+    python benchmarks/bench_traffic_steering.py --ues 80000 --nr 60 --lte 30 --wifi 400
+
+Also reports the cells a strongest-cell assignment would push over the
+load threshold, and an incremental re-solve after a halftime surge
+against solving again from scratch.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from copy import deepcopy
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "agentcore-gateway-starter-code"))
+
+from traffic_steering import CAPACITY_EPSILON, SteeringSolver, candidate_lists
+
+
+def stadium(ues, nr, lte, wifi, candidates, rng):
+    """UE positions, candidate lists and cell capacities for a 240 x 200 m bowl"""
+    cells = nr + lte + wifi
+    angle = rng.uniform(0, 2 * math.pi, cells)
+    radius = np.sqrt(rng.uniform(0.3, 1.0, cells))
+    cell_xy = np.column_stack([120 * radius * np.cos(angle), 100 * radius * np.sin(angle)])
+    # LTE macros sit outside the bowl
+    cell_xy[nr:nr + lte] *= 2.5
+    capacity = np.concatenate([np.full(nr, 1000.0), np.full(lte, 150.0), np.full(wifi, 250.0)])
+    bias = np.concatenate([np.full(nr, 3.0), np.zeros(lte), np.full(wifi, 1.0)])
+
+    # Seats, with a quarter of the crowd packed into the home end
+    angle = np.where(rng.random(ues) < 0.25, rng.normal(0, 0.4, ues), rng.uniform(0, 2 * math.pi, ues))
+    radius = np.sqrt(rng.uniform(0.35, 1.0, ues))
+    ue_xy = np.column_stack([120 * radius * np.cos(angle), 100 * radius * np.sin(angle)])
+
+    distance = np.sqrt(((ue_xy[:, None, :] - cell_xy[None, :, :]) ** 2).sum(axis=2)) + 3.0
+    nearest = np.argpartition(distance, candidates, axis=1)[:, :candidates]
+    sinr = 35.0 - 30.0 * np.log10(np.take_along_axis(distance, nearest, axis=1) / 3.0)
+    sinr += rng.normal(0, 3.0, sinr.shape)
+    ue = np.repeat(np.arange(ues), candidates)
+    cell = nearest.ravel()
+    demand = rng.lognormal(math.log(0.7), 0.6, ues)
+    return ue, cell, sinr.ravel() + bias[cell], demand, capacity
+
+
+def python_steering(candidates, scores, demand, available, max_rounds):
+    """Reference: the solver's rounds with one Python iteration per UE and per cell"""
+    candidates, scores, demand, available = candidates.tolist(), scores.tolist(), demand.tolist(), available.tolist()
+    width = len(candidates[0])
+    cell = [-1] * len(candidates)
+    score = [0.0] * len(candidates)
+    nxt = [0] * len(candidates)
+    holders = [[] for _ in available]
+    load = [0.0] * len(available)
+    for _ in range(max_rounds):
+        proposals = {}
+        for ue in range(len(candidates)):
+            if cell[ue] >= 0 or nxt[ue] >= width:
+                continue
+            choice = candidates[ue][nxt[ue]]
+            if choice < 0:
+                nxt[ue] = width
+                continue
+            proposals.setdefault(choice, []).append((scores[ue][nxt[ue]], ue))
+            nxt[ue] += 1
+        if not proposals:
+            break
+        for target, offers in proposals.items():
+            if load[target] + sum(demand[ue] for _, ue in offers) <= available[target] + CAPACITY_EPSILON:
+                kept = [(s, 0, ue) for s, ue in offers]
+                rejected = []
+            else:
+                pool = sorted([(score[ue], 0, ue) for ue in holders[target]] + [(s, 1, ue) for s, ue in offers],
+                              key=lambda entry: (-entry[0], entry[1]))
+                kept, rejected, used = [], [], 0.0
+                for entry in pool:
+                    used += demand[entry[2]]
+                    (kept if used <= available[target] + CAPACITY_EPSILON else rejected).append(entry)
+                holders[target] = []
+                load[target] = 0.0
+            for s, _, ue in kept:
+                cell[ue], score[ue] = target, s
+                holders[target].append(ue)
+                load[target] += demand[ue]
+            for _, _, ue in rejected:
+                cell[ue] = -1
+    return np.array(cell)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ues", type=int, default=80000)
+    parser.add_argument("--nr", type=int, default=60, help="NR small cells, 1 Gbps each")
+    parser.add_argument("--lte", type=int, default=30, help="LTE macro cells, 150 Mbps each")
+    parser.add_argument("--wifi", type=int, default=400, help="Wi-Fi access points, 250 Mbps each")
+    parser.add_argument("--candidates", type=int, default=8, help="Measured cells per UE")
+    parser.add_argument("--load-threshold", type=float, default=0.8)
+    parser.add_argument("--surge", type=float, default=0.01, help="Share of UEs whose demand doubles at halftime")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-baseline", action="store_true", help="Skip the Python reference loop")
+    parser.add_argument("--seed", type=int, default=5)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    ue, cell, score, demand, capacity = stadium(args.ues, args.nr, args.lte, args.wifi, args.candidates, rng)
+
+    start = time.perf_counter()
+    candidates, scores = candidate_lists(ue, cell, score, args.ues, args.candidates)
+    lists_ms = (time.perf_counter() - start) * 1000
+    solver = SteeringSolver(candidates, scores, demand, capacity, load_threshold=args.load_threshold)
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        rounds = solver.solve()
+        timings.append(time.perf_counter() - start)
+    solved = solver.cell.copy()
+
+    # What the static threshold did: every UE on its best cell
+    strongest = np.bincount(candidates[:, 0], weights=demand, minlength=len(capacity))
+    utilization = solver.load() / capacity
+
+    surged = demand.copy()
+    surging = rng.choice(args.ues, int(args.ues * args.surge), replace=False)
+    surged[surging] *= 2.0
+    # Each timed update starts from its own copy of the solved state
+    incremental = float("inf")
+    for state in [deepcopy(solver) for _ in range(args.repeat)]:
+        start = time.perf_counter()
+        update = state.update(demand=surged)
+        incremental = min(incremental, time.perf_counter() - start)
+    fresh = SteeringSolver(candidates, scores, surged, capacity, load_threshold=args.load_threshold)
+    from_scratch = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        fresh.solve()
+        from_scratch = min(from_scratch, time.perf_counter() - start)
+
+    best = min(timings)
+    report = {
+        "ues": args.ues,
+        "cells": len(capacity),
+        "candidate_lists_ms": round(lists_ms, 1),
+        "solve_ms": round(best * 1000, 1),
+        "rounds": rounds,
+        "unplaced": int(np.count_nonzero(solved < 0)),
+        "max_utilization": round(float(utilization.max()), 3),
+        "cells_over_threshold_strongest_cell": int(np.count_nonzero(strongest > capacity * args.load_threshold)),
+        "incremental_ms": round(incremental * 1000, 1),
+        "incremental_moved": update["moved"],
+        "incremental_unplaced": int(np.count_nonzero(state.cell < 0)),
+        "from_scratch_ms": round(from_scratch * 1000, 1),
+        "from_scratch_moved": int(np.count_nonzero(fresh.cell != solved)),
+        "from_scratch_unplaced": int(np.count_nonzero(fresh.cell < 0)),
+    }
+    if not args.skip_baseline:
+        start = time.perf_counter()
+        reference = python_steering(candidates, scores, demand, capacity * args.load_threshold, solver.max_rounds)
+        baseline = time.perf_counter() - start
+        report["python_loop_ms"] = round(baseline * 1000, 1)
+        report["python_loop_matches"] = bool(np.array_equal(reference, solved))
+        report["speedup"] = round(baseline / best, 1)
+
+    print(f"{report['ues']} UEs, {report['cells']} cells: {report['unplaced']} unplaced after {report['rounds']} rounds, "
+          f"max utilization {report['max_utilization']}")
+    print(f"strongest cell   {report['cells_over_threshold_strongest_cell']} cells over the threshold")
+    print(f"candidate lists  {report['candidate_lists_ms']:>10.1f} ms")
+    print(f"vectorized solve {report['solve_ms']:>10.1f} ms")
+    if not args.skip_baseline:
+        print(f"python loop      {report['python_loop_ms']:>10.1f} ms  (same assignment: {report['python_loop_matches']})")
+        print(f"speedup          {report['speedup']:>10.1f}x")
+    print(f"surge, update    {report['incremental_ms']:>10.1f} ms  {report['incremental_moved']} UEs moved, "
+          f"{report['incremental_unplaced']} unplaced")
+    print(f"surge, re-solve  {report['from_scratch_ms']:>10.1f} ms  {report['from_scratch_moved']} UEs moved, "
+          f"{report['from_scratch_unplaced']} unplaced")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
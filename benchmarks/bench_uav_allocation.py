@@ -0,0 +1,130 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""UAV swarm allocation: grid-indexed batch vs brute-force batch vs per-segment loop.
+
+Drones fly random delivery routes over a city of cell sites, e.g.
+
+    python benchmarks/bench_uav_allocation.py --drones 500 --waypoints 40 --cells 1000
+
+All three methods must pick the same site and beam for every segment;
+the per-segment loop runs on a sample and is extrapolated.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "agentcore-gateway-starter-code"))
+
+from uav_allocator import CellGrid, allocate_segments, beam_index
+
+
+class BruteForce:
+    """Same interface as CellGrid, comparing every point with every site"""
+
+    def __init__(self, grid: CellGrid):
+        self.sites = grid.sites
+        self.heights = grid.heights
+
+    def nearest(self, points, altitudes):
+        offset = points[:, None, :] - self.sites[None, :, :]
+        d2 = np.einsum('ijk,ijk->ij', offset, offset) + (altitudes[:, None] - self.heights[None, :]) ** 2
+        site = np.argmin(d2, axis=1)
+        return site, np.sqrt(d2[np.arange(len(points)), site])
+
+
+def per_segment(allocation, grid):
+    """Reference: one Python iteration per segment"""
+    sites, beams = [], []
+    for start, end in zip(allocation.start, allocation.end):
+        midpoint = (start + end) / 2.0
+        d2 = ((grid.sites - midpoint[:2]) ** 2).sum(axis=1) + (grid.heights - midpoint[2]) ** 2
+        site = int(np.argmin(d2))
+        sites.append(site)
+        beams.append(int(beam_index(grid.sites[site:site + 1], grid.heights[site:site + 1],
+                                    midpoint[None, :2], midpoint[None, 2])[0]))
+    return np.array(sites), np.array(beams)
+
+
+def swarm(drones, waypoints, cells, rng):
+    side = math.sqrt(cells) * 400.0
+    sites = rng.uniform(0, side, (cells, 2))
+    heights = rng.uniform(20, 45, cells)
+    # Random walks with 300 m legs at 60-120 m altitude
+    heading = rng.uniform(0, 2 * math.pi, (drones, 1)) + np.cumsum(rng.normal(0, 0.4, (drones, waypoints)), axis=1)
+    legs = np.stack([np.cos(heading), np.sin(heading)], axis=2) * 300.0
+    xy = np.clip(rng.uniform(0, side, (drones, 1, 2)) + np.cumsum(legs, axis=1), 0, side)
+    altitude = rng.uniform(60, 120, (drones, waypoints, 1))
+    return list(np.concatenate([xy, altitude], axis=2)), sites, heights
+
+
+def timed(func, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--drones", type=int, default=500)
+    parser.add_argument("--waypoints", type=int, default=40)
+    parser.add_argument("--cells", type=int, default=1000)
+    parser.add_argument("--max-segment", type=float, default=200.0, help="Longest segment in metres")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline-sample", type=int, default=2000, help="Segments run through the per-segment loop")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    paths, sites, heights = swarm(args.drones, args.waypoints, args.cells, rng)
+
+    build, grid = timed(lambda: CellGrid(sites, heights), args.repeat)
+    indexed, allocation = timed(lambda: allocate_segments(paths, grid, args.max_segment), args.repeat)
+    brute_time, brute = timed(lambda: allocate_segments(paths, BruteForce(grid), args.max_segment), args.repeat)
+
+    sample = min(args.baseline_sample, len(allocation))
+    picks = rng.choice(len(allocation), sample, replace=False)
+    subset = type(allocation)(allocation.drone[picks], allocation.start[picks], allocation.end[picks],
+                              allocation.site[picks], allocation.beam[picks], allocation.distance[picks])
+    start = time.perf_counter()
+    loop_sites, loop_beams = per_segment(subset, grid)
+    loop_time = (time.perf_counter() - start) / sample * len(allocation)
+
+    report = {
+        "drones": args.drones,
+        "segments": len(allocation),
+        "cells": args.cells,
+        "grid_build_ms": round(build * 1000, 2),
+        "grid_ms": round(indexed * 1000, 2),
+        "brute_force_ms": round(brute_time * 1000, 2),
+        "per_segment_ms_extrapolated": round(loop_time * 1000, 1),
+        "matches_brute_force": bool(np.array_equal(allocation.site, brute.site) and np.array_equal(allocation.beam, brute.beam)),
+        "matches_per_segment": bool(np.array_equal(subset.site, loop_sites) and np.array_equal(subset.beam, loop_beams)),
+        "speedup_vs_per_segment": round(loop_time / indexed, 1),
+    }
+    print(f"{report['drones']} drones, {report['segments']} segments, {report['cells']} cells")
+    print(f"grid index build {report['grid_build_ms']:>10.2f} ms")
+    print(f"grid indexed     {report['grid_ms']:>10.2f} ms  (same as brute force: {report['matches_brute_force']})")
+    print(f"brute force      {report['brute_force_ms']:>10.2f} ms")
+    print(f"per segment      {report['per_segment_ms_extrapolated']:>10.1f} ms  (extrapolated from {sample} segments, "
+          f"same result: {report['matches_per_segment']})")
+    print(f"speedup          {report['speedup_vs_per_segment']:>10.1f}x vs per segment")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
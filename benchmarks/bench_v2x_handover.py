@@ -0,0 +1,146 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""V2X handover prediction: vectorized predictor vs one Python loop per vehicle.
+
+Two synthetic scenarios: a highway convoy passing a line of cells, and a
+city grid with vehicles heading in random directions, e.g.
+
+    python benchmarks/bench_v2x_handover.py --scenario city --vehicles 10000 --cells 1000
+
+The per-vehicle baseline runs on a sample of the vehicles, is checked to
+predict the same handovers, and is extrapolated to the full fleet.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "agentcore-gateway-starter-code"))
+
+from v2x_predictor import PATH_LOSS_EXPONENT, predict_handovers
+
+
+def convoy(vehicles, cells, rng):
+    """Vehicles 20 m apart on a highway at 80-120 km/h, cells every 500 m along it"""
+    cell_x = np.arange(cells) * 500.0
+    cell_positions = np.column_stack([cell_x, np.where(np.arange(cells) % 2, 150.0, -150.0)])
+    x = rng.uniform(0, cell_x[-1], vehicles)
+    positions = np.column_stack([x, rng.choice([-5.0, 5.0], vehicles)])
+    speed = rng.uniform(80, 120, vehicles) / 3.6
+    velocities = np.column_stack([speed, np.zeros(vehicles)])
+    return positions, velocities, cell_positions, rng.uniform(40, 46, cells)
+
+
+def city(vehicles, cells, rng):
+    """Vehicles and cells spread over a square city with about 300 m between sites"""
+    side = math.sqrt(cells) * 300.0
+    cell_positions = rng.uniform(0, side, (cells, 2))
+    positions = rng.uniform(0, side, (vehicles, 2))
+    heading = rng.uniform(0, 2 * math.pi, vehicles)
+    speed = rng.uniform(5, 17, vehicles)
+    velocities = np.column_stack([speed * np.cos(heading), speed * np.sin(heading)])
+    return positions, velocities, cell_positions, rng.uniform(40, 46, cells)
+
+
+SCENARIOS = {"convoy": convoy, "city": city}
+
+
+def per_vehicle(positions, velocities, cells, power, window, step, hysteresis):
+    """Reference: the same model evaluated vehicle by vehicle"""
+    events = []
+    slope = 5.0 * PATH_LOSS_EXPONENT
+    steps = int(math.floor(window / step + 1e-9))
+    for i in range(len(positions)):
+        serving = None
+        for k in range(steps + 1):
+            position = positions[i] + velocities[i] * k * step
+            rsrp = power - slope * np.log10(np.maximum(((cells - position) ** 2).sum(axis=1), 1.0))
+            best = int(np.argmax(rsrp))
+            if serving is None:
+                serving = best
+            elif best != serving and rsrp[best] - rsrp[serving] > hysteresis:
+                events.append((i, k * step, serving, best))
+                serving = best
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="city")
+    parser.add_argument("--vehicles", type=int, default=10000)
+    parser.add_argument("--cells", type=int, default=1000)
+    parser.add_argument("--window", type=float, default=5.0, help="Prediction window in seconds")
+    parser.add_argument("--step", type=float, default=0.5, help="Prediction step in seconds")
+    parser.add_argument("--hysteresis", type=float, default=3.0, help="A3 hysteresis in dB")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs of the vectorized predictor")
+    parser.add_argument("--baseline-sample", type=int, default=200,
+                        help="Vehicles run through the per-vehicle baseline (0 to skip)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    positions, velocities, cells, power = SCENARIOS[args.scenario](args.vehicles, args.cells, rng)
+    options = dict(window_s=args.window, step_s=args.step, hysteresis_db=args.hysteresis)
+
+    predict_handovers(positions[:100], velocities[:100], cells, power, **options)
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        schedule = predict_handovers(positions, velocities, cells, power, **options)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    predict_handovers(positions, velocities, cells, power, **options)
+    peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+
+    best = min(timings)
+    report = {
+        "scenario": args.scenario,
+        "vehicles": args.vehicles,
+        "cells": args.cells,
+        "steps": int(math.floor(args.window / args.step + 1e-9)) + 1,
+        "handovers": len(schedule),
+        "vectorized_ms": round(best * 1000, 1),
+        "vehicles_per_s": round(args.vehicles / best),
+        "peak_mb": round(peak_mb, 1),
+    }
+
+    if args.baseline_sample:
+        sample = min(args.baseline_sample, args.vehicles)
+        start = time.perf_counter()
+        reference = per_vehicle(positions[:sample], velocities[:sample], cells, power,
+                                args.window, args.step, args.hysteresis)
+        baseline = time.perf_counter() - start
+        vectorized = predict_handovers(positions[:sample], velocities[:sample], cells, power, **options)
+        predicted = sorted(zip(vectorized.vehicle.tolist(), vectorized.time_s.tolist(),
+                               vectorized.source.tolist(), vectorized.target.tolist()))
+        report["baseline_sample"] = sample
+        report["baseline_matches"] = predicted == sorted(reference)
+        report["baseline_ms_extrapolated"] = round(baseline / sample * args.vehicles * 1000, 1)
+        report["speedup"] = round(baseline / sample * args.vehicles / best, 1)
+
+    print(f"{report['scenario']}: {report['vehicles']} vehicles x {report['cells']} cells x {report['steps']} steps, "
+          f"{report['handovers']} handovers")
+    print(f"vectorized  {report['vectorized_ms']:>10.1f} ms  ({report['vehicles_per_s']} vehicles/s, "
+          f"peak {report['peak_mb']} MB)")
+    if args.baseline_sample:
+        print(f"per-vehicle {report['baseline_ms_extrapolated']:>10.1f} ms  (extrapolated from "
+              f"{report['baseline_sample']} vehicles, same events: {report['baseline_matches']})")
+        print(f"speedup     {report['speedup']:>10.1f}x")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
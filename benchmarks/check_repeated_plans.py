@@ -0,0 +1,109 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Creates and executes two plans of the same type in a row with different A1 parameters.
+
+Covers every plan type whose A1 policy takes parameters from the plan
+(plan_optimizer.PLAN_POLICY_PARAMS): a second plan created without
+supersede must fail with a conflict and leave the first plan's policy in
+place, and one created with supersede must execute and replace it, leaving
+one policy on the slice. Runs against a throwaway SQLite plan store, e.g.
+
+    python benchmarks/check_repeated_plans.py
+
+The executor's threads log as they go, so their output is collected and
+printed once at the end (only when a check fails), after the results.
+Exits non-zero when a plan fails.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+os.environ["PLAN_STORE_PATH"] = os.path.join(tempfile.mkdtemp(), "smo_plans.db")
+os.environ.pop("PLAN_TABLE_NAME", None)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "agentcore-gateway-starter-code"))
+
+import smo_planner_extended as planner
+from a1_policy_store import get_a1_policy_store
+from plan_optimizer import PLAN_OPERATIONS, PLAN_POLICY_PARAMS
+
+# (create tool, execute tool, arguments of the first plan, arguments of the second)
+SCENARIOS = {
+    "traffic_steering": (
+        planner.create_traffic_steering_plan, planner.execute_traffic_steering,
+        ({"loadThreshold": "80%"}, ["cell-1", "cell-2"]),
+        ({"loadThreshold": "60%"}, ["cell-1", "cell-2"]),
+    ),
+    "massive_mimo_optimization": (
+        planner.create_mimo_optimization_plan, planner.execute_mimo_optimization,
+        ({"antennas": 64, "layers": 8, "usersPerCell": 16, "cells": 1}, {"objective": "capacity"}),
+        ({"antennas": "32T32R", "layers": 4, "usersPerCell": 8, "cells": 1}, {"objective": "coverage"}),
+    ),
+    "energy_saving": (
+        planner.create_energy_saving_plan, planner.execute_energy_optimization,
+        ({"reduction": "30%", "sleepMode": "light"}, ["cell-1"]),
+        ({"reduction": "20%", "sleepMode": "deep"}, ["cell-1"]),
+    ),
+}
+
+
+def policy_slice(plan_type):
+    return next(op["s_nssai"] for op in PLAN_OPERATIONS[plan_type] if op["action"] == "a1_policy")
+
+
+def check(plan_type, create, execute, first_args, second_args):
+    """Problems found running the plans, or [] when they behave as expected"""
+    slice_id = policy_slice(plan_type)
+    first = execute(create(*first_args)["planId"])
+    if "error" in first:
+        return [f"{first['planId']} failed: {first['error']}"]
+    first = first["policy"]
+
+    problems = []
+    conflicting = execute(create(*second_args)["planId"])
+    if "error" not in conflicting:
+        problems.append(f"{conflicting['planId']} executed without supersede, expected a conflict with {first['policyId']}")
+        return problems
+    deployed = [p["policyId"] for p in get_a1_policy_store().slice_policies(slice_id)]
+    if deployed != [first["policyId"]]:
+        problems.append(f"slice holds {deployed} after the conflict, expected only {first['policyId']}")
+
+    superseding = execute(create(*second_args, supersede=True)["planId"])
+    if "error" in superseding:
+        problems.append(f"{superseding['planId']} failed with supersede: {superseding['error']}")
+        return problems
+    second = superseding["policy"]
+    if first["policyId"] == second["policyId"]:
+        problems.append("second plan reused the first plan's policy despite different parameters")
+    if [old["policyId"] for old in second.get("superseded", [])] != [first["policyId"]]:
+        problems.append(f"second plan did not supersede {first['policyId']}")
+    deployed = [p["policyId"] for p in get_a1_policy_store().slice_policies(slice_id)]
+    if deployed != [second["policyId"]]:
+        problems.append(f"slice holds {deployed}, expected only {second['policyId']}")
+    return problems
+
+
+def main():
+    missing = {policy_type for policy_type in PLAN_POLICY_PARAMS} - {
+        op["policy_type"] for plan_type in SCENARIOS for op in PLAN_OPERATIONS[plan_type] if op["action"] == "a1_policy"
+    }
+    lines = [f"No scenario for policy types {sorted(missing)}"] if missing else []
+    failed = bool(missing)
+    log = io.StringIO()
+    for plan_type, (create, execute, first_args, second_args) in SCENARIOS.items():
+        with contextlib.redirect_stdout(log):
+            problems = check(plan_type, create, execute, first_args, second_args)
+        failed = failed or bool(problems)
+        lines.append(f"{plan_type:28s} {'ok' if not problems else 'FAILED'}")
+        lines.extend(f"  {problem}" for problem in problems)
+    print("\n".join(lines))
+    if failed:
+        print("\nInterface log:\n" + log.getvalue().rstrip())
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Image size and container start-to-ready time for the agent runtime images.
+
+Builds each Dockerfile, then starts the container several times and polls
+the runtime's /ping endpoint until it answers, e.g.
+
+    python benchmarks/measure_image.py --dockerfile Dockerfile --dockerfile Dockerfile.slim
+
+No AWS credentials are needed: the agent is built lazily and /ping is
+served before any AWS call is made.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def docker(*args, capture=True) -> str:
+    result = subprocess.run(["docker", *args], cwd=ROOT, check=True, text=True,
+                            stdout=subprocess.PIPE if capture else None)
+    return (result.stdout or "").strip()
+
+
+def build(dockerfile: str, module: str) -> str:
+    tag = f"oran-agent-measure:{dockerfile.lower().replace('.', '-')}"
+    start = time.perf_counter()
+    docker("build", "-f", dockerfile, "-t", tag, "--build-arg", f"ENTRYPOINT_MODULE={module}", ".", capture=False)
+    print(f"Built {tag} in {time.perf_counter() - start:.1f}s")
+    return tag
+
+
+def image_size_mb(tag: str) -> float:
+    return int(docker("image", "inspect", "--format", "{{.Size}}", tag)) / 1e6
+
+
+def start_to_ready(tag: str, module: str, port: int, timeout: float) -> float:
+    """Seconds from `docker run` until GET /ping succeeds"""
+    start = time.perf_counter()
+    # The default image picks its module from CMD; override it so both run the same entrypoint
+    container = docker("run", "-d", "--rm", "-p", f"{port}:8080", "-e", "STARTUP_PROFILE=1",
+                       tag, "opentelemetry-instrument", "python", "-m", module)
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/ping", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError, OSError):
+                pass
+            time.sleep(0.05)
+        raise TimeoutError(f"{tag} not ready after {timeout}s")
+    finally:
+        docker("rm", "-f", container)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dockerfile", action="append", help="Dockerfile to measure (repeatable)")
+    parser.add_argument("--module", default="memory_agent", help="Entrypoint module to run")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    results = []
+    for dockerfile in args.dockerfile or ["Dockerfile", "Dockerfile.slim"]:
+        tag = build(dockerfile, args.module)
+        size = image_size_mb(tag)
+        times = [start_to_ready(tag, args.module, args.port, args.timeout) for _ in range(args.runs)]
+        results.append((dockerfile, size, times))
+
+    print(f"\n{'dockerfile':<20} {'size MB':>9} {'ready p50 s':>12} {'ready max s':>12}")
+    for dockerfile, size, times in results:
+        print(f"{dockerfile:<20} {size:>9.0f} {statistics.median(times):>12.2f} {max(times):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Offline replay of recorded SMO agent conversations: throughput, per-stage latency and memory.
+
+The real agent (agent.build_agent) runs against a scripted model and the
+R1 and O2 MCP servers served in-process, with fake SSM and Cognito behind
+the real token provider, so no AWS account or network is needed, e.g.
+
+    python benchmarks/replay_agent.py --concurrency 8 --repeat 5 --model-ttft 0.3
+
+Each worker thread builds its own agent and replays whole conversations
+from the trace file; see benchmarks/traces/oran_conversations.json for the
+format. Stage times come from the agent's event loop metrics: "model" is
+the scripted model's streaming time, "tool" the summed tool execution time
+and "other" what is left of the turn (framework, hooks, serialization).
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Keep the replayed servers' tool schemas out of the agent's catalogue file
+os.environ.setdefault('TOOL_CATALOG_PATH', os.path.join(tempfile.mkdtemp(prefix='replay-'), 'catalog.json'))
+
+import agent as agent_module
+import mcp_server
+from fakes import (FakeCognitoClient, FakeMemoryClient, FakeSSMClient, ScriptedModel, in_process_transport,
+                   load_notebook_server)
+from strands.handlers.callback_handler import null_callback_handler
+from token_provider import CognitoTokenProvider
+
+DEFAULT_TRACES = os.path.join(ROOT, "benchmarks", "traces", "oran_conversations.json")
+R1_NOTEBOOK = os.path.join(ROOT, "r1-mcp-server.ipynb")
+CLIENT_IDS = {"r1": "r1-client", "o2": "o2-client"}
+
+
+def fake_parameters():
+    parameters = {}
+    for server_type, client_id in CLIENT_IDS.items():
+        parameters[f"/mcp_server/{server_type}/runtime/agent_arn"] = (
+            f"arn:aws:bedrock-agentcore:us-east-1:000000000000:runtime/replay_{server_type}"
+        )
+        parameters[f"/mcp_server/{server_type}/runtime/client_id"] = client_id
+    return parameters
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def tool_seconds(metrics) -> float:
+    return sum(m.total_time for m in metrics.tool_metrics.values())
+
+
+class Worker(threading.Thread):
+    """Builds one agent and replays conversations from the shared queue"""
+
+    def __init__(self, index, conversations, args, token_provider, servers, samples, memory_client):
+        super().__init__(name=f"replay-{index}", daemon=True)
+        self.conversations = conversations
+        self.args = args
+        self.token_provider = token_provider
+        self.servers = servers
+        self.samples = samples
+        self.memory_client = memory_client
+        self.agent = None
+        self.error = None
+
+    def transport(self, server_type, mcp_url, headers):
+        return in_process_transport(self.servers[server_type])
+
+    def run(self):
+        try:
+            self._run()
+        except Exception as e:
+            self.error = e
+
+    def _run(self):
+        script = ScriptedModel(ttft=self.args.model_ttft, token_latency=self.args.token_latency)
+        start = time.perf_counter()
+        strands_client = agent_module.StrandsMCPClient(self.token_provider, transport_factory=self.transport)
+        agent, mcp_clients = agent_module.build_agent(strands_client, model=script)
+        self.samples["build"].append(time.perf_counter() - start)
+        # Streamed text is not printed, so the turn time is the agent's own
+        agent.callback_handler = null_callback_handler
+        self.agent = agent
+
+        if self.memory_client is not None:
+            from memory_hooks import MemoryHookProvider
+            from operations_index import OperationsIndex
+            agent.state.set("actor_id", self.name)
+            agent.state.set("session_id", f"{self.name}-session")
+            MemoryHookProvider(self.memory_client, "replay-memory",
+                               operations_index=OperationsIndex(path=None)).attach(agent)
+
+        r1_mcp_client, o2_mcp_client = mcp_clients
+        while True:
+            try:
+                conversation = self.conversations.get_nowait()
+            except queue.Empty:
+                return
+            # Each conversation starts from an empty history and result cache
+            agent.messages.clear()
+            strands_client.result_cache.clear()
+            start = time.perf_counter()
+            with r1_mcp_client, o2_mcp_client:
+                self.samples["session"].append(time.perf_counter() - start)
+                for turn in conversation["turns"]:
+                    self._replay_turn(agent, script, turn)
+
+    def _replay_turn(self, agent, script, turn):
+        metrics = agent.event_loop_metrics
+        model_ms = metrics.accumulated_metrics["latencyMs"]
+        tools = tool_seconds(metrics)
+        script.load(turn["model"])
+        start = time.perf_counter()
+        agent(turn["prompt"])
+        turn_seconds = time.perf_counter() - start
+        model_seconds = (metrics.accumulated_metrics["latencyMs"] - model_ms) / 1000
+        tools = tool_seconds(metrics) - tools
+        self.samples["turn"].append(turn_seconds)
+        self.samples["model"].append(model_seconds)
+        self.samples["tool"].append(tools)
+        self.samples["other"].append(max(turn_seconds - model_seconds - tools, 0.0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--traces", default=DEFAULT_TRACES, help="Conversation trace file")
+    parser.add_argument("--concurrency", type=int, default=4, help="Worker threads, one agent each")
+    parser.add_argument("--repeat", type=int, default=3, help="Times each conversation is replayed")
+    parser.add_argument("--model-ttft", type=float, default=0.0, help="Seconds to first token per model call")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Seconds per streamed word")
+    parser.add_argument("--ssm-latency", type=float, default=0.0, help="Seconds per SSM GetParameter")
+    parser.add_argument("--cognito-latency", type=float, default=0.0, help="Seconds per Cognito InitiateAuth")
+    parser.add_argument("--memory", action="store_true", help="Attach the memory hooks to a fake AgentCore Memory")
+    parser.add_argument("--tracemalloc", action="store_true", help="Report the Python heap peak (slower)")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+    # The MCP servers log every request at INFO
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+
+    with open(args.traces, 'r', encoding='utf-8') as f:
+        conversations = json.load(f)["conversations"]
+    work = queue.Queue()
+    for _ in range(args.repeat):
+        for conversation in conversations:
+            work.put(conversation)
+    total_turns = sum(len(c["turns"]) for c in conversations) * args.repeat
+
+    servers = {"r1": load_notebook_server(R1_NOTEBOOK, "r1_mcp_server").mcp, "o2": mcp_server.mcp}
+    token_provider = CognitoTokenProvider(
+        region="us-east-1",
+        ssm_client=FakeSSMClient(fake_parameters(), latency=args.ssm_latency),
+        cognito_client=FakeCognitoClient(latency=args.cognito_latency),
+    )
+    memory_client = FakeMemoryClient() if args.memory else None
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    samples = {stage: [] for stage in ("build", "session", "turn", "model", "tool", "other")}
+    workers = [Worker(i, work, args, token_provider, servers, samples, memory_client)
+               for i in range(args.concurrency)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    token_provider.close()
+
+    errors = [w.error for w in workers if w.error]
+    for error in errors:
+        print(f"Worker error: {error!r}")
+    completed = len(samples["turn"])
+    tool_errors = sum(m.error_count for w in workers if w.agent
+                      for m in w.agent.event_loop_metrics.tool_metrics.values())
+
+    report = {
+        "conversations": len(conversations) * args.repeat,
+        "turns": completed,
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "turns_per_s": round(completed / elapsed, 2) if elapsed else 0.0,
+        "tool_errors": tool_errors,
+        "stages_ms": {
+            stage: {
+                "p50": round(statistics.median(values) * 1000, 1) if values else 0.0,
+                "p95": round(percentile(values, 95) * 1000, 1),
+                "mean": round(statistics.fmean(values) * 1000, 1) if values else 0.0,
+            }
+            for stage, values in samples.items()
+        },
+        # Linux reports ru_maxrss in KiB
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+    if args.tracemalloc:
+        report["heap_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 1)
+        tracemalloc.stop()
+
+    print(f"{report['turns']}/{total_turns} turns in {report['elapsed_s']}s "
+          f"at concurrency {args.concurrency}: {report['turns_per_s']} turns/s, {tool_errors} tool errors")
+    print(f"{'stage':<10}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for stage, row in report["stages_ms"].items():
+        print(f"{stage:<10}{row['p50']:>10.1f}{row['p95']:>10.1f}{row['mean']:>10.1f}")
+    memory = f"max RSS {report['max_rss_mb']} MB"
+    if "heap_peak_mb" in report:
+        memory += f", Python heap peak {report['heap_peak_mb']} MB"
+    print(memory)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if errors or completed < total_turns:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Local stand-ins for the AWS and MCP clients used by the agents.
+
+They implement just enough of the boto3 and MCPClient surface for offline
+testing and benchmarking, count every call and can simulate control-plane latency.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import types
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+from strands.models import Model
+
+
+def _client_error(code: str, message: str, operation: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": message}}, operation)
+
+
+class FakeSSMClient:
+    def __init__(self, parameters: Optional[Dict[str, str]] = None, latency: float = 0.0):
+        self.parameters = dict(parameters or {})
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_parameter(self, Name: str, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        if Name not in self.parameters:
+            raise _client_error("ParameterNotFound", f"Parameter {Name} not found", "GetParameter")
+        return {"Parameter": {"Name": Name, "Value": self.parameters[Name]}}
+
+    def put_parameter(self, Name: str, Value: str, **kwargs):
+        self.parameters[Name] = Value
+        return {"Version": 1}
+
+
+class FakeSecretsClient:
+    def __init__(self, secrets: Optional[Dict[str, str]] = None, latency: float = 0.0):
+        self.secrets = dict(secrets or {})
+        self.latency = latency
+        self.calls = 0
+
+    def get_secret_value(self, SecretId: str, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        if SecretId not in self.secrets:
+            raise _client_error("ResourceNotFoundException", f"Secret {SecretId} not found", "GetSecretValue")
+        return {"SecretString": self.secrets[SecretId]}
+
+
+class FakeCognitoClient:
+    """Issues opaque tokens for USER_PASSWORD_AUTH and REFRESH_TOKEN_AUTH"""
+
+    def __init__(self, username: str = 'testuser', password: str = 'MyPassword123!',
+                 expires_in: int = 3600, latency: float = 0.0):
+        self.username = username
+        self.password = password
+        self.expires_in = expires_in
+        self.latency = latency
+        self.calls = {"USER_PASSWORD_AUTH": 0, "REFRESH_TOKEN_AUTH": 0}
+        self.refresh_tokens = set()
+        self._lock = threading.Lock()
+
+    def initiate_auth(self, ClientId: str, AuthFlow: str, AuthParameters: Dict[str, str], **kwargs):
+        with self._lock:
+            self.calls[AuthFlow] = self.calls.get(AuthFlow, 0) + 1
+        time.sleep(self.latency)
+
+        result = {
+            "AccessToken": f"access-{uuid.uuid4().hex}",
+            "ExpiresIn": self.expires_in,
+            "TokenType": "Bearer",
+        }
+        if AuthFlow == 'USER_PASSWORD_AUTH':
+            if (AuthParameters.get('USERNAME'), AuthParameters.get('PASSWORD')) != (self.username, self.password):
+                raise _client_error("NotAuthorizedException", "Incorrect username or password.", "InitiateAuth")
+            refresh_token = f"refresh-{uuid.uuid4().hex}"
+            with self._lock:
+                self.refresh_tokens.add(refresh_token)
+            result["RefreshToken"] = refresh_token
+        elif AuthFlow == 'REFRESH_TOKEN_AUTH':
+            if AuthParameters.get('REFRESH_TOKEN') not in self.refresh_tokens:
+                raise _client_error("NotAuthorizedException", "Invalid Refresh Token", "InitiateAuth")
+        else:
+            raise _client_error("InvalidParameterException", f"Unsupported flow {AuthFlow}", "InitiateAuth")
+        return {"AuthenticationResult": result}
+
+
+class FakeMCPClient:
+    """In-process stand-in for strands' MCPClient.
+
+    tools maps a tool name to a callable taking the tool arguments as keyword
+    arguments; latency simulates the per-call network and server time.
+    """
+
+    def __init__(self, tools: Dict[str, object], latency: float = 0.0):
+        self.tools = tools
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def call_tool_sync(self, tool_use_id: str, name: str, arguments: Optional[dict] = None, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        if name not in self.tools:
+            return {"status": "error", "toolUseId": tool_use_id, "content": [{"text": f"Unknown tool {name}"}]}
+        try:
+            result = self.tools[name](**(arguments or {}))
+        except Exception as e:
+            return {"status": "error", "toolUseId": tool_use_id, "content": [{"text": str(e)}]}
+        return {"status": "success", "toolUseId": tool_use_id, "content": [{"text": json.dumps(result, default=str)}]}
+
+    async def call_tool_async(self, tool_use_id: str, name: str, arguments: Optional[dict] = None, **kwargs):
+        return await asyncio.to_thread(self.call_tool_sync, tool_use_id, name, arguments)
+
+
+class FakeMemoryClient:
+    """Stand-in for bedrock_agentcore.memory.MemoryClient memories and event storage"""
+
+    def __init__(self, latency: float = 0.0, failures: int = 0, memories: List[dict] = None,
+                 create_latency: float = 0.0):
+        self.latency = latency
+        # The first `failures` create_event calls raise, to exercise retries
+        self.failures = failures
+        self.memories: List[dict] = list(memories or [])
+        # How long create_memory_and_wait blocks, standing in for provisioning
+        self.create_latency = create_latency
+        self.events: Dict[tuple, list] = {}
+        self.calls = {
+            "create_event": 0, "get_last_k_turns": 0, "list_memories": 0,
+            "get_memory_status": 0, "create_memory_and_wait": 0,
+        }
+        self._lock = threading.Lock()
+
+    def list_memories(self, max_results: int = 100):
+        with self._lock:
+            self.calls["list_memories"] += 1
+        time.sleep(self.latency)
+        return [dict(m) for m in self.memories[:max_results]]
+
+    def get_memory_status(self, memory_id: str) -> str:
+        with self._lock:
+            self.calls["get_memory_status"] += 1
+        time.sleep(self.latency)
+        for memory in self.memories:
+            if memory["id"] == memory_id:
+                return memory["status"]
+        raise _client_error("ResourceNotFoundException", f"Memory {memory_id} not found", "GetMemory")
+
+    def create_memory_and_wait(self, name: str, strategies: list, **kwargs):
+        with self._lock:
+            self.calls["create_memory_and_wait"] += 1
+        time.sleep(self.create_latency)
+        memory = {"id": f"{name}-{uuid.uuid4().hex[:10]}", "name": name, "status": "ACTIVE"}
+        self.memories.append(memory)
+        return dict(memory)
+
+    def create_event(self, memory_id: str, actor_id: str, session_id: str, messages: list, **kwargs):
+        with self._lock:
+            self.calls["create_event"] += 1
+            fail = self.failures > 0
+            if fail:
+                self.failures -= 1
+        time.sleep(self.latency)
+        if fail:
+            raise _client_error("ThrottlingException", "Rate exceeded", "CreateEvent")
+        event = {"eventId": f"event-{uuid.uuid4().hex[:8]}", "messages": list(messages)}
+        with self._lock:
+            self.events.setdefault((memory_id, actor_id, session_id), []).append(event)
+        return event
+
+    def get_last_k_turns(self, memory_id: str, actor_id: str, session_id: str, k: int = 5, **kwargs):
+        with self._lock:
+            self.calls["get_last_k_turns"] += 1
+            events = list(self.events.get((memory_id, actor_id, session_id), []))
+        time.sleep(self.latency)
+        # A turn starts at each user message, as in the real client
+        turns = []
+        for event in events:
+            for text, role in event["messages"]:
+                message = {"role": role.upper(), "content": {"text": text}}
+                if role.upper() == "USER" or not turns:
+                    turns.append([message])
+                else:
+                    turns[-1].append(message)
+        return turns[-k:]
+
+
+def load_notebook_server(notebook_path: str, module_name: str) -> types.ModuleType:
+    """Import the MCP server a notebook writes with %%writefile mcp_server.py, without writing it.
+
+    The R1 server only exists as a notebook cell, and both servers are
+    called mcp_server, so the source is executed into a fresh module.
+    """
+    with open(notebook_path, 'r', encoding='utf-8') as f:
+        notebook = json.load(f)
+    for cell in notebook["cells"]:
+        source = "".join(cell.get("source", []))
+        if cell.get("cell_type") == "code" and source.startswith("%%writefile mcp_server.py"):
+            module = types.ModuleType(module_name)
+            module.__file__ = notebook_path
+            exec(compile(source.split("\n", 1)[1], notebook_path, "exec"), module.__dict__)
+            return module
+    raise ValueError(f"No %%writefile mcp_server.py cell in {notebook_path}")
+
+
+@asynccontextmanager
+async def in_process_transport(fastmcp_server):
+    """MCP transport to a FastMCP server served on the client's own event loop.
+
+    Drop-in for streamablehttp_client in an MCPClient transport callable:
+    requests go over in-memory streams, with no HTTP server or auth.
+    """
+    import anyio
+    from mcp.shared.memory import create_client_server_memory_streams
+
+    server = fastmcp_server._mcp_server
+    async with create_client_server_memory_streams() as (client_streams, server_streams):
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(
+                server.run, server_streams[0], server_streams[1], server.create_initialization_options()
+            )
+            try:
+                yield client_streams
+            finally:
+                task_group.cancel_scope.cancel()
+
+
+class ScriptedModel(Model):
+    """Replays recorded model responses instead of calling Bedrock.
+
+    Each response is either {"tool_calls": [{"name": ..., "input": {...}}]}
+    or {"text": "..."}; they are returned in order, one per model call, and
+    a short final answer is returned once the script runs out. ttft and
+    token_latency simulate time to first token and per-token streaming.
+    """
+
+    def __init__(self, responses: Optional[List[dict]] = None, ttft: float = 0.0, token_latency: float = 0.0):
+        self.ttft = ttft
+        self.token_latency = token_latency
+        self.calls = 0
+        self._responses: List[dict] = list(responses or [])
+
+    def load(self, responses: List[dict]):
+        """Replace the remaining script, e.g. with the next turn's responses"""
+        self._responses = list(responses)
+
+    def update_config(self, **model_config):
+        pass
+
+    def get_config(self) -> Dict[str, Any]:
+        return {"model_id": "scripted"}
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        raise NotImplementedError("ScriptedModel does not support structured output")
+        yield  # pragma: no cover
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        self.calls += 1
+        start = time.perf_counter()
+        response = self._responses.pop(0) if self._responses else {"text": "Done."}
+        await asyncio.sleep(self.ttft)
+        yield {"messageStart": {"role": "assistant"}}
+        output_tokens = 0
+        if response.get("text"):
+            yield {"contentBlockStart": {"start": {}}}
+            for word in response["text"].split(" "):
+                yield {"contentBlockDelta": {"delta": {"text": word + " "}}}
+                output_tokens += 1
+                await asyncio.sleep(self.token_latency)
+            yield {"contentBlockStop": {}}
+        tool_calls = response.get("tool_calls") or []
+        for call in tool_calls:
+            tool_use_id = f"tooluse_{uuid.uuid4().hex[:12]}"
+            yield {"contentBlockStart": {"start": {"toolUse": {"toolUseId": tool_use_id, "name": call["name"]}}}}
+            yield {"contentBlockDelta": {"delta": {"toolUse": {"input": json.dumps(call.get("input") or {})}}}}
+            yield {"contentBlockStop": {}}
+            output_tokens += 1
+        yield {"messageStop": {"stopReason": "tool_use" if tool_calls else "end_turn"}}
+        input_tokens = sum(len(json.dumps(m, default=str)) for m in messages) // 4
+        yield {"metadata": {
+            "usage": {"inputTokens": input_tokens, "outputTokens": output_tokens,
+                      "totalTokens": input_tokens + output_tokens},
+            # Reported like Bedrock's latency, so agent metrics separate model time from the rest
+            "metrics": {"latencyMs": round((time.perf_counter() - start) * 1000, 3)},
+        }}
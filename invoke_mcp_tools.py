@@ -1,12 +1,12 @@
 import asyncio
-import boto3
-import json
 import sys
 from boto3.session import Session
 
 from mcp import ClientSession
 from mcp.client.streamable_http import streamablehttp_client
 
+from token_provider import get_token_provider
+
 async def main():
     boto_session = Session()
     region = boto_session.region_name
@@ -14,34 +14,18 @@ async def main():
     print(f"Using AWS region: {region}")
     
     try:
-        ssm_client = boto3.client('ssm', region_name=region)
-        agent_arn_response = ssm_client.get_parameter(Name='/mcp_server/o2/runtime/agent_arn')
-        agent_arn = agent_arn_response['Parameter']['Value']
+        provider = get_token_provider(region)
+        agent_arn = provider.get_parameter('/mcp_server/o2/runtime/agent_arn')
         print(f"Retrieved Agent ARN: {agent_arn}")
 
-        secrets_client = boto3.client('secretsmanager', region_name=region)
-        response = secrets_client.get_secret_value(SecretId='mcp_server/o2/cognito/credentials')
-        secret_value = response['SecretString']
-        parsed_secret = json.loads(secret_value)
-
-        cognito_client = boto3.client('cognito-idp', region_name=region)   
-        auth_response = cognito_client.initiate_auth(
-                    ClientId=ssm_client.get_parameter(Name='/mcp_server/o2/runtime/client_id')["Parameter"]["Value"],
-                    AuthFlow='USER_PASSWORD_AUTH',
-                    AuthParameters={
-                        'USERNAME': 'testuser',
-                        'PASSWORD': 'MyPassword123!'
-                    }
-                )
-        bearer_token=auth_response['AuthenticationResult']['AccessToken']
-        print("✓ Retrieved bearer token from Secrets Manager")
+        bearer_token = provider.get_token(provider.get_parameter('/mcp_server/o2/runtime/client_id'))
+        print("✓ Retrieved bearer token from Cognito")
         
     except Exception as e:
         print(f"Error retrieving credentials: {e}")
         sys.exit(1)
     
-    encoded_arn = agent_arn.replace(':', '%3A').replace('/', '%2F')
-    mcp_url = f"https://bedrock-agentcore.{region}.amazonaws.com/runtimes/{encoded_arn}/invocations?qualifier=DEFAULT"
+    mcp_url = provider.get_runtime_url(agent_arn)
     headers = {
         "authorization": f"Bearer {bearer_token}",
         "Content-Type": "application/json"
@@ -1,10 +1,16 @@
-from mcp.server.fastmcp import FastMCP
+# Imported first so STARTUP_PROFILE=1 can time every import after it
+from profiling import phase, startup_report
+with phase("import mcp.server.fastmcp"):
+    from mcp.server.fastmcp import FastMCP
 from typing import Dict, List, Optional
 import uuid
 import base64
 from datetime import datetime
+from telemetry import configure_telemetry, instrument_tool
 
 mcp = FastMCP(host="0.0.0.0", stateless_http=True)
+# Per-tool spans and metrics; TOOL_METRICS_PORT also serves them for Prometheus
+configure_telemetry(server="o2")
 
 # In-memory storage simulating INF platform
 ocloud_db = {
@@ -69,6 +75,7 @@ alarm_subscriptions_db: Dict[str, dict] = {}
 alarms_db: Dict[str, dict] = {}
 
 @mcp.tool()
+@instrument_tool
 def get_inventory_api_versions() -> dict:
     """Get O2 IMS inventory API versions"""
     return {
@@ -77,6 +84,7 @@ def get_inventory_api_versions() -> dict:
     }
 
 @mcp.tool()
+@instrument_tool
 def get_monitoring_api_versions() -> dict:
     """Get O2 IMS monitoring API versions"""
     return {
@@ -85,16 +93,19 @@ def get_monitoring_api_versions() -> dict:
     }
 
 @mcp.tool()
+@instrument_tool
 def get_ocloud_info(fields: str = None, exclude_fields: str = None) -> dict:
     """Get O-Cloud information with field filtering support"""
     return ocloud_db
 
 @mcp.tool()
+@instrument_tool
 def get_deployment_managers(filter_criteria: str = None, fields: str = None) -> List[dict]:
     """Get deployment manager list from INF platform"""
     return list(deployment_managers_db.values())
 
 @mcp.tool()
+@instrument_tool
 def get_deployment_manager(deployment_manager_id: str, profile: str = None) -> dict:
     """Get deployment manager with optional Kubernetes profile"""
     if deployment_manager_id not in deployment_managers_db:
@@ -121,11 +132,13 @@ def get_deployment_manager(deployment_manager_id: str, profile: str = None) -> d
     return dm
 
 @mcp.tool()
+@instrument_tool
 def get_resource_pools(filter_criteria: str = None) -> List[dict]:
     """Get resource pools from INF platform"""
     return list(resource_pools_db.values())
 
 @mcp.tool()
+@instrument_tool
 def get_resource_pool(resource_pool_id: str) -> dict:
     """Get specific resource pool"""
     if resource_pool_id not in resource_pools_db:
@@ -133,6 +146,7 @@ def get_resource_pool(resource_pool_id: str) -> dict:
     return resource_pools_db[resource_pool_id]
 
 @mcp.tool()
+@instrument_tool
 def get_resources(resource_pool_id: str, filter_criteria: str = None) -> List[dict]:
     """Get resources in a resource pool"""
     if resource_pool_id not in resource_pools_db:
@@ -140,6 +154,7 @@ def get_resources(resource_pool_id: str, filter_criteria: str = None) -> List[di
     return [r for r in resources_db.values() if r["resourcePoolId"] == resource_pool_id]
 
 @mcp.tool()
+@instrument_tool
 def get_resource(resource_pool_id: str, resource_id: str) -> dict:
     """Get specific resource with hierarchical elements"""
     if resource_id not in resources_db:
@@ -162,11 +177,13 @@ def get_resource(resource_pool_id: str, resource_id: str) -> dict:
     return resource
 
 @mcp.tool()
+@instrument_tool
 def get_resource_types(filter_criteria: str = None) -> List[dict]:
     """Get resource types available in INF platform"""
     return list(resource_types_db.values())
 
 @mcp.tool()
+@instrument_tool
 def get_resource_type(resource_type_id: str) -> dict:
     """Get specific resource type with alarm dictionary"""
     if resource_type_id not in resource_types_db:
@@ -187,6 +204,7 @@ def get_resource_type(resource_type_id: str) -> dict:
     return resource_type
 
 @mcp.tool()
+@instrument_tool
 def create_subscription(callback: str, consumer_subscription_id: str = None, filter_criteria: str = "") -> dict:
     """Create inventory subscription for SMO notifications"""
     subscription_id = str(uuid.uuid4())
@@ -200,11 +218,13 @@ def create_subscription(callback: str, consumer_subscription_id: str = None, fil
     return subscription
 
 @mcp.tool()
+@instrument_tool
 def get_subscriptions() -> List[dict]:
     """Get all inventory subscriptions"""
     return list(subscriptions_db.values())
 
 @mcp.tool()
+@instrument_tool
 def get_subscription(subscription_id: str) -> dict:
     """Get specific subscription"""
     if subscription_id not in subscriptions_db:
@@ -212,6 +232,7 @@ def get_subscription(subscription_id: str) -> dict:
     return subscriptions_db[subscription_id]
 
 @mcp.tool()
+@instrument_tool
 def delete_subscription(subscription_id: str) -> dict:
     """Delete inventory subscription"""
     if subscription_id not in subscriptions_db:
@@ -220,6 +241,7 @@ def delete_subscription(subscription_id: str) -> dict:
     return {"message": "Subscription deleted"}
 
 @mcp.tool()
+@instrument_tool
 def create_alarm_subscription(callback: str, consumer_subscription_id: str = None, filter_criteria: str = "") -> dict:
     """Create alarm subscription for SMO alarm notifications"""
     alarm_subscription_id = str(uuid.uuid4())
@@ -233,11 +255,13 @@ def create_alarm_subscription(callback: str, consumer_subscription_id: str = Non
     return subscription
 
 @mcp.tool()
+@instrument_tool
 def get_alarm_subscriptions() -> List[dict]:
     """Get all alarm subscriptions"""
     return list(alarm_subscriptions_db.values())
 
 @mcp.tool()
+@instrument_tool
 def get_alarm_subscription(alarm_subscription_id: str) -> dict:
     """Get specific alarm subscription"""
     if alarm_subscription_id not in alarm_subscriptions_db:
@@ -245,6 +269,7 @@ def get_alarm_subscription(alarm_subscription_id: str) -> dict:
     return alarm_subscriptions_db[alarm_subscription_id]
 
 @mcp.tool()
+@instrument_tool
 def delete_alarm_subscription(alarm_subscription_id: str) -> dict:
     """Delete alarm subscription"""
     if alarm_subscription_id not in alarm_subscriptions_db:
@@ -253,11 +278,13 @@ def delete_alarm_subscription(alarm_subscription_id: str) -> dict:
     return {"message": "Alarm subscription deleted"}
 
 @mcp.tool()
+@instrument_tool
 def get_alarms(filter_criteria: str = None) -> List[dict]:
     """Get alarm event records from INF platform"""
     return list(alarms_db.values())
 
 @mcp.tool()
+@instrument_tool
 def get_alarm(alarm_event_record_id: str) -> dict:
     """Get specific alarm event record"""
     if alarm_event_record_id not in alarms_db:
@@ -265,6 +292,7 @@ def get_alarm(alarm_event_record_id: str) -> dict:
     return alarms_db[alarm_event_record_id]
 
 @mcp.tool()
+@instrument_tool
 def patch_alarm(alarm_event_record_id: str, alarm_acknowledged: bool = None, perceived_severity: str = None) -> dict:
     """Patch alarm event record (acknowledge or clear)"""
     if alarm_event_record_id not in alarms_db:
@@ -281,6 +309,7 @@ def patch_alarm(alarm_event_record_id: str, alarm_acknowledged: bool = None, per
     return {"message": "Alarm updated successfully"}
 
 @mcp.tool()
+@instrument_tool
 def create_test_alarm(resource_id: str = "5b3a2da8-17da-466c-b5f7-972590c7baf2", severity: str = "1") -> dict:
     """Create test alarm for INF platform resource"""
     alarm_id = str(uuid.uuid4())
@@ -298,6 +327,7 @@ def create_test_alarm(resource_id: str = "5b3a2da8-17da-466c-b5f7-972590c7baf2",
     return {"alarmEventRecordId": alarm_id, "message": "Test alarm created for INF platform"}
 
 @mcp.tool()
+@instrument_tool
 def simulate_smo_registration(smo_register_url: str, ocloud_global_id: str) -> dict:
     """Simulate O2 service registration with SMO"""
     return {
@@ -307,4 +337,5 @@ def simulate_smo_registration(smo_register_url: str, ocloud_global_id: str) -> d
     }
 
 if __name__ == "__main__":
+    startup_report("ready to serve")
     mcp.run(transport="streamable-http")
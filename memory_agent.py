@@ -1,181 +1,24 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 
-from strands import Agent, tool
-import boto3
-from mcp.client.streamable_http import streamablehttp_client
-from strands.tools.mcp.mcp_client import MCPClient
-from bedrock_agentcore.runtime import BedrockAgentCoreApp
-from strands.models import BedrockModel
-# Add memory imports
-from bedrock_agentcore.memory import MemoryClient
-from botocore.exceptions import ClientError
-from strands.hooks import AgentInitializedEvent, HookProvider, HookRegistry, MessageAddedEvent
+# Imported first so STARTUP_PROFILE=1 can time every import after it
+from profiling import TURN_PROFILE, TurnProfiler, instrument_model, phase, profile_span, startup_report
+import os
+import threading
 import time
 
+with phase("import bedrock_agentcore.runtime"):
+    from bedrock_agentcore.runtime import BedrockAgentCoreApp
+from memory_bootstrap import MemoryBootstrap
+
 app = BedrockAgentCoreApp()
 
-class MemoryHookProvider(HookProvider):
-    def __init__(self, memory_client: MemoryClient, memory_id: str):
-        self.memory_client = memory_client
-        self.memory_id = memory_id
-    
-    def on_agent_initialized(self, event: AgentInitializedEvent):
-        try:
-            actor_id = event.agent.state.get("actor_id")
-            session_id = event.agent.state.get("session_id")
-            
-            if not actor_id or not session_id:
-                return
-            
-            recent_turns = self.memory_client.get_last_k_turns(
-                memory_id=self.memory_id,
-                actor_id=actor_id,
-                session_id=session_id,
-                k=5
-            )
-            
-            if recent_turns:
-                context_messages = []
-                for turn in recent_turns:
-                    for message in turn:
-                        role = message['role']
-                        content = message['content']['text']
-                        context_messages.append(f"{role}: {content}")
-                
-                context = "\n".join(context_messages)
-                event.agent.system_prompt += f"\n\nRecent conversation:\n{context}"
-                print(f"✅ Loaded {len(recent_turns)} conversation turns")
-                
-        except Exception as e:
-            print(f"Memory load error: {e}")
-    
-    def on_message_added(self, event: MessageAddedEvent):
-        try:
-            messages = event.agent.messages
-            actor_id = event.agent.state.get("actor_id")
-            session_id = event.agent.state.get("session_id")
-
-            if messages[-1]["content"][0].get("text"):
-                self.memory_client.create_event(
-                    memory_id=self.memory_id,
-                    actor_id=actor_id,
-                    session_id=session_id,
-                    messages=[(messages[-1]["content"][0]["text"], messages[-1]["role"])]
-                )
-        except Exception as e:
-            print(f"Memory save error: {e}")
-    
-    def register_hooks(self, registry: HookRegistry):
-        registry.add_callback(MessageAddedEvent, self.on_message_added)
-        registry.add_callback(AgentInitializedEvent, self.on_agent_initialized)
+# Build the agent on a background thread right after start; set to 0 to defer to the first request
+AGENT_WARMUP = os.environ.get('AGENT_WARMUP', '1') != '0'
 
-class StrandsMCPClient:
-    def __init__(self):
-        self.region = boto3.Session().region_name
-        self.ssm_client = boto3.client('ssm', region_name=self.region)
-        self.cognito_client = boto3.client('cognito-idp', region_name=self.region)
-    
-    def get_mcp_client(self, server_type):
-        def create_client():
-            agent_arn = self.ssm_client.get_parameter(Name=f'/mcp_server/{server_type}/runtime/agent_arn')['Parameter']['Value']
-            client_id = self.ssm_client.get_parameter(Name=f'/mcp_server/{server_type}/runtime/client_id')['Parameter']['Value']
-            auth_response = self.cognito_client.initiate_auth(
-                ClientId=client_id,
-                AuthFlow='USER_PASSWORD_AUTH',
-                AuthParameters={'USERNAME': 'testuser', 'PASSWORD': 'MyPassword123!'}
-            )
-            bearer_token = auth_response['AuthenticationResult']['AccessToken']
-            
-            encoded_arn = agent_arn.replace(':', '%3A').replace('/', '%2F')
-            mcp_url = f"https://bedrock-agentcore.{self.region}.amazonaws.com/runtimes/{encoded_arn}/invocations?qualifier=DEFAULT"
-            
-            headers = {
-                "authorization": f"Bearer {bearer_token}",
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            }
-            return streamablehttp_client(mcp_url, headers, timeout=120, terminate_on_close=False)
-        
-        return MCPClient(create_client)
-
-# Initialize MCP clients and get tools
-strands_client = StrandsMCPClient()
-r1_mcp_client = strands_client.get_mcp_client('r1')
-o2_mcp_client = strands_client.get_mcp_client('o2')
-
-all_tools = []
-try:
-    with r1_mcp_client:
-        r1_tools = r1_mcp_client.list_tools_sync()
-        all_tools.extend(r1_tools)
-except Exception as e:
-    print(f"Failed to get R1 tools: {e}")
-
-try:
-    with o2_mcp_client:
-        o2_tools = o2_mcp_client.list_tools_sync()
-        all_tools.extend(o2_tools)
-except Exception as e:
-    print(f"Failed to get O2 tools: {e}")
-
-# Create or get existing memory for the agent
-memory_id = None
-memory_client = None
-try:
-    memory_client = MemoryClient(region_name="us-east-1")
-    
-    # First, check if memory already exists
-    existing_memory = None
-    print(memory_client.list_memories())
-    for memory in memory_client.list_memories():
-        if memory.get('name', '').startswith("ORANAgentMemory"):
-            existing_memory = memory
-            break
-    
-    if existing_memory:
-        memory_id = existing_memory.get('id')
-        print(f"Using existing memory: {memory_id}")
-    else:
-        print("Creating new memory... this may take 2-3 minutes")
-        start_time = time.time()
-        
-        memory = memory_client.create_memory_and_wait(
-            name="ORANAgentMemory",
-            strategies=[
-                {
-                    "semanticMemoryStrategy": {
-                        "name": "ORANTracker",
-                        "description": "Tracks rApp lifecycle, deployments, and O-Cloud infrastructure changes",
-                        "namespaces": ["oran/{actorId}/operations"]
-                    }
-                }
-            ],
-            description="Memory for O-RAN SMO agent operations",
-            event_expiry_days=90
-        )
-        
-        memory_id = memory.get("id")
-        elapsed_time = time.time() - start_time
-        print(f"✅ Created memory: {memory_id} (took {elapsed_time:.0f} seconds)")
-        
-except Exception as e:
-    print(f"❌ Memory error: {e}")
-    print("Agent will run without memory")
-
-model_id = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
-model = BedrockModel(model_id=model_id)
-
-# Create agent with memory hooks and state
-agent = Agent(
-    model=model,
-    tools=all_tools,
-    hooks=[MemoryHookProvider(memory_client, memory_id)] if memory_id else [],
-    state={
-        "actor_id": "oran_operator_001",
-        "session_id": f"oran_session_{int(time.time())}"
-    },
-    system_prompt="""You are an advanced O-RAN SMO Planner Agent supporting O2 and R1 interface use cases from O-RAN specifications.
+MODEL_ID = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+
+SYSTEM_PROMPT = """You are an advanced O-RAN SMO Planner Agent supporting O2 and R1 interface use cases from O-RAN specifications.
 
 SUPPORTED USE CASES:
 
@@ -210,7 +53,143 @@ When users request O-RAN operations, identify the relevant use case(s) and:
 2. Execute using proper O2DMS operations and resource management
 3. Set up monitoring for ongoing lifecycle management
 4. Provide comprehensive status and operational guidance"""
-)
+
+class StrandsMCPClient:
+    def __init__(self, token_provider=None, transport_factory=None):
+        from token_provider import get_token_provider
+        from result_cache import ToolResultCache
+        from result_compactor import ResultCompactor
+        
+        self.token_provider = token_provider or get_token_provider()
+        # transport_factory(server_type, url, headers) -> MCP transport; streamable HTTP by default
+        self.transport_factory = transport_factory or self.http_transport
+        self.region = self.token_provider.region
+        # Shared by the R1 and O2 clients for the lifetime of the conversation
+        self.result_cache = ToolResultCache()
+        # Large list results reach the model as summaries; page_tool_result reads the rest
+        self.result_compactor = ResultCompactor()
+    
+    @staticmethod
+    def http_transport(server_type, mcp_url, headers):
+        from mcp.client.streamable_http import streamablehttp_client
+        return streamablehttp_client(mcp_url, headers, timeout=120, terminate_on_close=False)
+    
+    def get_mcp_client(self, server_type):
+        from result_cache import CachingMCPClient
+        
+        def create_client():
+            # SSM parameters and the bearer token come from the provider's cache
+            mcp_url, headers = self.token_provider.get_mcp_connection(server_type)
+            return self.transport_factory(server_type, mcp_url, headers)
+        
+        return CachingMCPClient(create_client, server_type, self.result_cache, self.result_compactor)
+
+    def get_server_arn(self, server_type):
+        return self.token_provider.get_parameter(f'/mcp_server/{server_type}/runtime/agent_arn')
+
+# Find or create memory in the background; cold starts never wait on the control plane
+memory_bootstrap = MemoryBootstrap(
+    name="ORANAgentMemory",
+    region="us-east-1",
+    strategies=[
+        {
+            "semanticMemoryStrategy": {
+                "name": "ORANTracker",
+                "description": "Tracks rApp lifecycle, deployments, and O-Cloud infrastructure changes",
+                "namespaces": ["oran/{actorId}/operations"]
+            }
+        }
+    ],
+    description="Memory for O-RAN SMO agent operations",
+    event_expiry_days=90
+).start()
+
+def build_agent(strands_client=None, model=None):
+    """Create the MCP clients, tools and agent; returns (agent, mcp_clients).
+
+    The MCP client factory and the model can be injected, e.g. to replay
+    conversations offline (benchmarks/replay_agent.py).
+    """
+    with phase("import strands"):
+        from strands import Agent
+        from strands.models import BedrockModel
+        from tool_catalog import ToolCatalog, refresh_agent_tools
+        from tool_executor import MultiServerToolExecutor
+    
+    with phase("mcp clients"):
+        strands_client = strands_client or StrandsMCPClient()
+        r1_mcp_client = strands_client.get_mcp_client('r1')
+        o2_mcp_client = strands_client.get_mcp_client('o2')
+    
+    with phase("load tools"):
+        # Tool schemas come from the on-disk catalogue; uncached servers are listed in parallel
+        tool_catalog = ToolCatalog(
+            servers={'r1': r1_mcp_client, 'o2': o2_mcp_client},
+            client_factory=strands_client.get_mcp_client,
+            arn_resolver=strands_client.get_server_arn
+        )
+        all_tools = tool_catalog.load_tools()
+        
+        # Lets the model fan out independent R1/O2 calls in a single step
+        tool_executor = MultiServerToolExecutor(tool_catalog.servers)
+        tool_executor.register_tools(all_tools)
+        local_tools = [tool_executor.as_tool(), strands_client.result_compactor.as_tool()]
+    
+    with phase("create agent"):
+        # Records model calls and time to first token when a turn is profiled
+        model = instrument_model(model or BedrockModel(model_id=MODEL_ID))
+        # Create agent with state; memory hooks are attached by the first request after memory is ready
+        agent = Agent(
+            model=model,
+            tools=all_tools + local_tools,
+            hooks=[],
+            state={
+                "actor_id": "oran_operator_001",
+                "session_id": f"oran_session_{int(time.time())}"
+            },
+            system_prompt=SYSTEM_PROMPT
+        )
+    
+    def on_tools_changed(server_type, tools):
+        refresh_agent_tools(agent, tool_catalog.all_tools() + local_tools)
+        tool_executor.register_tools(tool_catalog.all_tools())
+    
+    # Revalidate cached tool schemas without delaying startup
+    tool_catalog.revalidate_async(on_change=on_tools_changed)
+    return agent, [r1_mcp_client, o2_mcp_client]
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+def get_agent():
+    """Return (agent, mcp_clients), building them on first use"""
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                with phase("build agent"):
+                    _runtime = build_agent()
+                startup_report("agent built")
+    return _runtime
+
+def attach_memory_hooks(agent):
+    if memory_bootstrap.ready:
+        from memory_hooks import MemoryHookProvider
+        memory_bootstrap.attach_hooks(agent, MemoryHookProvider)
+
+def warm_up():
+    try:
+        get_agent()
+        with phase("import memory hooks"):
+            from memory_hooks import MemoryHookProvider
+    except Exception as e:
+        # The first request retries and reports the error to the caller
+        print(f"Agent warm-up failed: {e}")
+
+def _setup_agent():
+    agent, mcp_clients = get_agent()
+    attach_memory_hooks(agent)
+    return agent, mcp_clients
 
 @app.entrypoint
 def strands_agent_bedrock(payload):
@@ -220,9 +199,30 @@ def strands_agent_bedrock(payload):
     user_input = payload.get("prompt")
     print("User input:", user_input)
     
-    with r1_mcp_client, o2_mcp_client:
-        response = agent(user_input)
-        return response.message
+    profile = bool(payload.get("profile") or TURN_PROFILE)
+    
+    # Stream tokens and tool progress as server-sent events; the agent is set
+    # up, and a profiled turn begun, when the stream is consumed
+    if payload.get("stream"):
+        from streaming import stream_agent_response
+        return stream_agent_response(_setup_agent, user_input, profile)
+    
+    # Profiled turns also return a Chrome trace of where the time went
+    profiler = TurnProfiler.begin() if profile else None
+    try:
+        with profile_span("get agent", "setup"):
+            agent, mcp_clients = _setup_agent()
+        r1_mcp_client, o2_mcp_client = mcp_clients
+        with r1_mcp_client, o2_mcp_client:
+            response = agent(user_input)
+    finally:
+        trace = profiler.finish() if profiler else None
+    if trace:
+        return {"message": response.message, "profile": trace}
+    return response.message
 
 if __name__ == "__main__":
+    if AGENT_WARMUP:
+        threading.Thread(target=warm_up, name='agent-warmup', daemon=True).start()
+    startup_report("ready to serve")
     app.run()
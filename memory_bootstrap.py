@@ -0,0 +1,184 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_MEMORY_CACHE_PATH = os.environ.get(
+    'MEMORY_ID_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'oran_agent_memory_ids.json')
+)
+MEMORY_POLL_SECONDS = 10
+MEMORY_MAX_WAIT_SECONDS = 600
+
+
+class MemoryIdCache:
+    """Local file mapping (memory name, region) to the memory id found last start"""
+
+    def __init__(self, path: str = DEFAULT_MEMORY_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, region: str) -> str:
+        return f"{region}/{name}"
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, name: str, region: str) -> Optional[str]:
+        return self._load().get(self._key(name, region))
+
+    def put(self, name: str, region: str, memory_id: Optional[str]):
+        """Store a memory id, or forget it when memory_id is None"""
+        with self._lock:
+            data = self._load()
+            if memory_id:
+                data[self._key(name, region)] = memory_id
+            else:
+                data.pop(self._key(name, region), None)
+            directory = os.path.dirname(os.path.abspath(self.path))
+            try:
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Memory id cache save error: {e}")
+
+
+class MemoryBootstrap:
+    """Finds or creates the agent's AgentCore memory without blocking startup.
+
+    start() returns immediately; a background thread checks the cached id,
+    otherwise lists memories once, and only creates (and waits for) the
+    memory when none exists. Until it is ready the agent serves requests
+    without memory; attach_hooks() adds the memory hooks on the first
+    request after that.
+    """
+
+    def __init__(self, name: str, region: str, strategies: List[dict], description: str = None,
+                 event_expiry_days: int = 90, client_factory: Callable = None,
+                 cache: Optional[MemoryIdCache] = None, poll_interval: float = MEMORY_POLL_SECONDS,
+                 max_wait: float = MEMORY_MAX_WAIT_SECONDS):
+        self.name = name
+        self.region = region
+        self.strategies = strategies
+        self.description = description
+        self.event_expiry_days = event_expiry_days
+        self.client_factory = client_factory or self._default_client
+        self.cache = cache or MemoryIdCache()
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+
+        self.memory_client = None
+        self.memory_id: Optional[str] = None
+        self.error: Optional[Exception] = None
+        self._ready = threading.Event()
+        self._done = threading.Event()
+        self._attach_lock = threading.Lock()
+        self._attached = False
+        self._thread: Optional[threading.Thread] = None
+
+    def _default_client(self):
+        from bedrock_agentcore.memory import MemoryClient
+        return MemoryClient(region_name=self.region)
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='memory-bootstrap', daemon=True)
+            self._thread.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until bootstrap finished; returns True if memory is ready"""
+        self._done.wait(timeout)
+        return self.ready
+
+    def _run(self):
+        start_time = time.time()
+        try:
+            self.memory_client = self.client_factory()
+            memory_id = self._cached_memory() or self._find_memory() or self._create_memory()
+            self.memory_id = memory_id
+            self.cache.put(self.name, self.region, memory_id)
+            self._ready.set()
+            print(f"✅ Memory ready: {memory_id} (took {time.time() - start_time:.1f} seconds)")
+        except Exception as e:
+            self.error = e
+            print(f"❌ Memory error: {e}")
+            print("Agent will run without memory")
+        finally:
+            self._done.set()
+
+    def _cached_memory(self) -> Optional[str]:
+        memory_id = self.cache.get(self.name, self.region)
+        if not memory_id:
+            return None
+        try:
+            self._wait_active(memory_id)
+            print(f"Using cached memory: {memory_id}")
+            return memory_id
+        except Exception as e:
+            # Deleted or failed since the id was cached; fall back to discovery
+            print(f"Cached memory {memory_id} unusable: {e}")
+            self.cache.put(self.name, self.region, None)
+            return None
+
+    def _find_memory(self) -> Optional[str]:
+        for memory in self.memory_client.list_memories():
+            if (memory.get('name') or memory.get('id', '')).startswith(self.name):
+                memory_id = memory.get('id')
+                # A previous start may have begun creating it
+                self._wait_active(memory_id)
+                print(f"Using existing memory: {memory_id}")
+                return memory_id
+        return None
+
+    def _create_memory(self) -> str:
+        print("Creating new memory in the background... this may take 2-3 minutes")
+        memory = self.memory_client.create_memory_and_wait(
+            name=self.name,
+            strategies=self.strategies,
+            description=self.description,
+            event_expiry_days=self.event_expiry_days
+        )
+        return memory.get("id")
+
+    def _wait_active(self, memory_id: str):
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            status = self.memory_client.get_memory_status(memory_id)
+            if status == "ACTIVE":
+                return
+            if status not in ("CREATING", "UPDATING") or time.monotonic() > deadline:
+                raise RuntimeError(f"memory {memory_id} is {status}")
+            time.sleep(self.poll_interval)
+
+    def attach_hooks(self, agent, provider_factory: Callable) -> bool:
+        """Attach provider_factory(memory_client, memory_id) to the agent once memory is ready.
+
+        Call at the start of each request, so the hooks are added exactly once
+        by a request thread rather than by the background bootstrap thread.
+        """
+        if self._attached or not self.ready:
+            return self._attached
+        with self._attach_lock:
+            if not self._attached:
+                provider = provider_factory(self.memory_client, self.memory_id)
+                provider.attach(agent)
+                self._attached = True
+        return True
@@ -0,0 +1,115 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import math
+import threading
+from typing import Dict, List, Set, Tuple
+
+from profiling import profile_span
+
+CONTEXT_TURNS = 5
+# Upper bound on the conversation history appended to the system prompt
+CONTEXT_TOKEN_BUDGET = 1500
+# Each older turn gets this fraction of the weight of the turn after it
+CONTEXT_RECENCY_DECAY = 0.5
+# Rough token estimate; good enough for budgeting English and JSON
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = " …[truncated]"
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    keep = max(max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER), 0)
+    return text[:keep] + TRUNCATION_MARKER
+
+
+class ConversationContextBuilder:
+    """Builds the recent-conversation section of the system prompt.
+
+    Turns are fetched from AgentCore Memory once per (actor, session) and
+    then kept current from the messages the agent adds, so later rebuilds
+    never re-fetch. The rendered context is capped at token_budget tokens;
+    each turn's allowance decays with age and whatever a short turn does
+    not use rolls over to the older ones.
+    """
+
+    def __init__(self, memory_client, memory_id: str, k: int = CONTEXT_TURNS,
+                 token_budget: int = CONTEXT_TOKEN_BUDGET, recency_decay: float = CONTEXT_RECENCY_DECAY):
+        self.memory_client = memory_client
+        self.memory_id = memory_id
+        self.k = k
+        self.token_budget = token_budget
+        self.recency_decay = recency_decay
+        self._turns: Dict[Tuple[str, str], List[List[Tuple[str, str]]]] = {}
+        # Sessions whose history was fetched from memory
+        self._loaded: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    def load(self, actor_id: str, session_id: str) -> List[List[Tuple[str, str]]]:
+        """Return cached (role, text) turns, fetching them from memory on first use"""
+        key = (actor_id, session_id)
+        with self._lock:
+            if key in self._loaded:
+                return self._turns[key]
+        with profile_span("memory get_last_k_turns", "memory", k=self.k):
+            recent_turns = self.memory_client.get_last_k_turns(
+                memory_id=self.memory_id,
+                actor_id=actor_id,
+                session_id=session_id,
+                k=self.k
+            ) or []
+        turns = [[(message['role'], message['content']['text']) for message in turn] for turn in recent_turns]
+        with self._lock:
+            if key in self._loaded:
+                return self._turns[key]
+            # Messages appended before the fetch finished go after the fetched
+            # history, minus any the fetch already returned
+            fetched = [message for turn in turns for message in turn]
+            appended = [message for turn in self._turns.get(key, []) for message in turn]
+            overlap = next((n for n in range(min(len(fetched), len(appended)), 0, -1)
+                            if fetched[-n:] == appended[:n]), 0)
+            for role, text in appended[overlap:]:
+                self._add(turns, role, text)
+            self._turns[key] = turns
+            self._loaded.add(key)
+            return turns
+
+    def append(self, actor_id: str, session_id: str, text: str, role: str):
+        """Record a new message locally so the cache stays current without a fetch"""
+        with self._lock:
+            self._add(self._turns.setdefault((actor_id, session_id), []), role.upper(), text)
+
+    def _add(self, turns: List[List[Tuple[str, str]]], role: str, text: str):
+        if role == 'USER' or not turns:
+            turns.append([(role, text)])
+        else:
+            turns[-1].append((role, text))
+        del turns[:-self.k]
+
+    def build(self, actor_id: str, session_id: str) -> str:
+        """Render cached turns oldest first within the token budget"""
+        turns = list(self.load(actor_id, session_id))
+        if not turns:
+            return ""
+        weights = [self.recency_decay ** age for age in range(len(turns))]
+        remaining = self.token_budget
+        rendered: List[str] = []
+        # Newest turn first, so recent context is kept whole before old context
+        for age, turn in enumerate(reversed(turns)):
+            allowance = int(remaining * weights[age] / sum(weights[age:]))
+            if allowance <= 0:
+                break
+            # Leave room for the "role: " prefix of every line
+            per_message = max(allowance // len(turn) - 3, 1)
+            lines = [f"{role.lower()}: {_truncate(text, per_message)}" for role, text in turn]
+            used = sum(estimate_tokens(line) for line in lines)
+            remaining -= used
+            rendered.append("\n".join(lines))
+            if remaining <= 0:
+                break
+        return "\n".join(reversed(rendered))
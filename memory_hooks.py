@@ -0,0 +1,89 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+from bedrock_agentcore.memory import MemoryClient
+from strands.hooks import AgentInitializedEvent, HookProvider, HookRegistry, MessageAddedEvent
+from memory_writer import MemoryWriter
+from memory_context import ConversationContextBuilder, estimate_tokens
+from operations_index import OperationsIndex, default_backend
+
+class MemoryHookProvider(HookProvider):
+    def __init__(self, memory_client: MemoryClient, memory_id: str, memory_writer: MemoryWriter = None,
+                 operations_index: OperationsIndex = None):
+        self.memory_client = memory_client
+        self.memory_id = memory_id
+        # Messages are persisted by a background writer, off the agent's critical path
+        self.memory_writer = memory_writer or MemoryWriter(memory_client, memory_id)
+        # Recent turns are cached per session and rendered within a token budget
+        self.context_builder = ConversationContextBuilder(memory_client, memory_id)
+        # Past R1/O2 operations, searched for each new prompt
+        self.operations_index = operations_index or OperationsIndex(default_backend(memory_client, memory_id))
+        self.base_system_prompt = None
+        self.context_section = ""
+        self.operations_section = ""
+    
+    def update_system_prompt(self, agent):
+        # Rebuilt from the base prompt so the system prompt never grows unbounded
+        system_prompt = self.base_system_prompt
+        if self.context_section:
+            system_prompt += f"\n\nRecent conversation:\n{self.context_section}"
+        if self.operations_section:
+            system_prompt += f"\n\nRelevant past operations:\n{self.operations_section}"
+        agent.system_prompt = system_prompt
+    
+    def on_agent_initialized(self, event: AgentInitializedEvent):
+        try:
+            actor_id = event.agent.state.get("actor_id")
+            session_id = event.agent.state.get("session_id")
+            
+            if not actor_id or not session_id:
+                return
+            
+            if self.base_system_prompt is None:
+                self.base_system_prompt = event.agent.system_prompt
+            
+            self.context_section = self.context_builder.build(actor_id, session_id)
+            if self.context_section:
+                self.update_system_prompt(event.agent)
+                print(f"✅ Loaded conversation context (~{estimate_tokens(self.context_section)} tokens)")
+                
+        except Exception as e:
+            print(f"Memory load error: {e}")
+    
+    def on_message_added(self, event: MessageAddedEvent):
+        try:
+            messages = event.agent.messages
+            actor_id = event.agent.state.get("actor_id")
+            session_id = event.agent.state.get("session_id")
+
+            self.operations_index.observe(actor_id, messages[-1])
+
+            if messages[-1]["content"][0].get("text"):
+                self.context_builder.append(
+                    actor_id,
+                    session_id,
+                    messages[-1]["content"][0]["text"],
+                    messages[-1]["role"]
+                )
+                self.memory_writer.submit(
+                    actor_id,
+                    session_id,
+                    messages[-1]["content"][0]["text"],
+                    messages[-1]["role"]
+                )
+                
+                # A new prompt: inject only the operations relevant to it
+                if messages[-1]["role"] == "user" and self.base_system_prompt is not None:
+                    self.operations_section = self.operations_index.render(actor_id, messages[-1]["content"][0]["text"])
+                    self.update_system_prompt(event.agent)
+        except Exception as e:
+            print(f"Memory save error: {e}")
+    
+    def attach(self, agent):
+        """Register on an agent that is already initialized and load its context"""
+        agent.hooks.add_hook(self)
+        self.on_agent_initialized(AgentInitializedEvent(agent=agent))
+    
+    def register_hooks(self, registry: HookRegistry):
+        registry.add_callback(MessageAddedEvent, self.on_message_added)
+        registry.add_callback(AgentInitializedEvent, self.on_agent_initialized)
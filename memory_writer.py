@@ -0,0 +1,168 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import atexit
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from profiling import profile_span
+
+MEMORY_QUEUE_SIZE = 1000
+MEMORY_BATCH_SIZE = 25
+# How long the writer waits for more messages before submitting a batch
+MEMORY_BATCH_WINDOW_SECONDS = 0.2
+MEMORY_MAX_RETRIES = 5
+MEMORY_BACKOFF_BASE_SECONDS = 0.25
+MEMORY_BACKOFF_MAX_SECONDS = 8.0
+# How often an idle writer checks whether it was closed
+MEMORY_STOP_POLL_SECONDS = 0.5
+
+_STOP = object()
+
+
+class MemoryWriter:
+    """Write-behind buffer for AgentCore Memory events.
+
+    submit() only enqueues, so persisting a message never blocks the agent.
+    A background thread drains the bounded queue in batches, coalesces the
+    messages of each (actor, session) into a single create_event call and
+    retries failed calls with exponential backoff. When the queue is full
+    new messages are dropped and counted rather than blocking the caller.
+    """
+
+    def __init__(self, memory_client, memory_id: str, max_queue: int = MEMORY_QUEUE_SIZE,
+                 batch_size: int = MEMORY_BATCH_SIZE, batch_window: float = MEMORY_BATCH_WINDOW_SECONDS,
+                 max_retries: int = MEMORY_MAX_RETRIES, backoff_base: float = MEMORY_BACKOFF_BASE_SECONDS,
+                 backoff_max: float = MEMORY_BACKOFF_MAX_SECONDS):
+        self.memory_client = memory_client
+        self.memory_id = memory_id
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stop = threading.Event()
+        self._counters = {
+            "enqueued": 0, "dropped": 0, "written_messages": 0,
+            "written_events": 0, "failed_messages": 0, "retries": 0,
+        }
+        self._thread = threading.Thread(target=self._run, name='memory-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self._counters[name] += n
+
+    def submit(self, actor_id: str, session_id: str, text: str, role: str) -> bool:
+        """Queue a message for persistence; returns False if it was dropped"""
+        if self._closed:
+            self._count("dropped")
+            return False
+        try:
+            self._queue.put_nowait((actor_id, session_id, text, role))
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("enqueued")
+        return True
+
+    def _next_batch(self) -> Tuple[List[tuple], bool]:
+        batch, stop = [], False
+        while True:
+            try:
+                item = self._queue.get(block=not self._stop.is_set(), timeout=MEMORY_STOP_POLL_SECONDS)
+                break
+            except queue.Empty:
+                # Closed while the queue was full, so no _STOP could be queued
+                if self._stop.is_set():
+                    return batch, True
+        deadline = time.monotonic() + self.batch_window
+        while True:
+            if item is _STOP:
+                stop = True
+                self._queue.task_done()
+            else:
+                batch.append(item)
+            if stop or len(batch) >= self.batch_size:
+                break
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+        return batch, stop
+
+    def _run(self):
+        while True:
+            batch, stop = self._next_batch()
+            # Coalesce per session, keeping message order within each session
+            sessions: "OrderedDict[Tuple[str, str], List[Tuple[str, str]]]" = OrderedDict()
+            for actor_id, session_id, text, role in batch:
+                sessions.setdefault((actor_id, session_id), []).append((text, role))
+            for (actor_id, session_id), messages in sessions.items():
+                self._write(actor_id, session_id, messages)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, actor_id: str, session_id: str, messages: List[Tuple[str, str]]):
+        for attempt in range(self.max_retries + 1):
+            try:
+                with profile_span("memory create_event", "memory", messages=len(messages), attempt=attempt):
+                    self.memory_client.create_event(
+                        memory_id=self.memory_id,
+                        actor_id=actor_id,
+                        session_id=session_id,
+                        messages=messages
+                    )
+                self._count("written_events")
+                self._count("written_messages", len(messages))
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    print(f"Memory save error after {attempt + 1} attempts: {e}")
+                    self._count("failed_messages", len(messages))
+                    return
+                self._count("retries")
+                delay = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+                time.sleep(delay * random.uniform(0.5, 1.0))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued message has been written or given up on"""
+        if timeout is None:
+            self._queue.join()
+            return True
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return not self._queue.unfinished_tasks
+
+    def close(self, timeout: float = 10.0):
+        """Flush pending messages and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        try:
+            # Wakes an idle writer at once; a full queue is drained before it stops
+            self._queue.put_nowait(_STOP)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def metrics(self) -> Dict[str, float]:
+        with self._lock:
+            metrics = dict(self._counters)
+        metrics["queue_depth"] = self._queue.qsize()
+        submitted = metrics["enqueued"] + metrics["dropped"]
+        metrics["drop_rate"] = metrics["dropped"] / submitted if submitted else 0.0
+        return metrics
@@ -0,0 +1,323 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import heapq
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict, defaultdict, deque
+from typing import Any, Dict, List, Optional
+
+from profiling import profile_span
+from result_cache import MUTATING, classify_tool
+
+OPERATIONS_TOP_K = 5
+# Keeps each injected record short; the full result stays on the server
+OPERATION_TEXT_MAX_CHARS = 400
+OPERATIONS_NAMESPACE = "oran/{actorId}/operations"
+DEFAULT_OPERATIONS_PATH = os.environ.get(
+    'OPERATIONS_INDEX_PATH', os.path.join(tempfile.gettempdir(), 'oran_agent_operations.jsonl')
+)
+# Records kept in the JSONL file; it is rewritten with the newest ones once
+# it holds twice as many
+OPERATIONS_MAX_RECORDS = int(os.environ.get('OPERATIONS_INDEX_MAX_RECORDS', '5000'))
+# "bm25" (in-process, default) or "agentcore" (AgentCore Memory semantic records)
+OPERATIONS_BACKEND = os.environ.get('OPERATIONS_INDEX_BACKEND', 'bm25')
+
+BATCH_TOOL_NAME = "run_tools_in_parallel"
+
+STOPWORDS = {
+    "a", "an", "and", "any", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from",
+    "have", "how", "i", "in", "is", "it", "me", "my", "of", "on", "or", "please", "that", "the",
+    "there", "this", "to", "was", "we", "what", "when", "which", "with", "you",
+}
+
+
+# Crude suffix stripping so "alarms"/"alarm" and "deployed"/"deployment"/"deploy" match
+SUFFIXES = ("ments", "ment", "ing", "ed", "es", "s", "e")
+
+
+def _stem(term: str) -> str:
+    for suffix in SUFFIXES:
+        if term.endswith(suffix) and len(term) - len(suffix) >= 3 and not term.endswith("ss"):
+            return term[:-len(suffix)]
+    return term
+
+
+def tokenize(text: str) -> List[str]:
+    # Splits snake_case tool names and hyphenated ids into their parts
+    return [_stem(t) for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in STOPWORDS]
+
+
+class RetrievalBackend(ABC):
+    """Interface for the store behind OperationsIndex"""
+
+    @abstractmethod
+    def add(self, record: Dict[str, Any]):
+        ...
+
+    @abstractmethod
+    def search(self, query: str, namespace: str, k: int) -> List[Dict[str, Any]]:
+        ...
+
+
+class BM25Backend(RetrievalBackend):
+    """In-process BM25 keyword index; records are added incrementally.
+
+    Only the newest max_records records are kept, like the JSONL file.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, max_records: int = OPERATIONS_MAX_RECORDS):
+        self.k1 = k1
+        self.b = b
+        self.max_records = max_records
+        # Insertion order, oldest first
+        self._records: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._terms: Dict[str, Counter] = {}
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def add(self, record: Dict[str, Any]):
+        terms = Counter(tokenize(record["text"]))
+        with self._lock:
+            if record["id"] in self._records:
+                return
+            self._records[record["id"]] = record
+            self._terms[record["id"]] = terms
+            self._lengths[record["id"]] = sum(terms.values())
+            self._total_length += self._lengths[record["id"]]
+            for term, tf in terms.items():
+                self._postings[term][record["id"]] = tf
+            while len(self._records) > self.max_records:
+                self._evict(next(iter(self._records)))
+
+    def _evict(self, doc_id: str):
+        del self._records[doc_id]
+        self._total_length -= self._lengths.pop(doc_id)
+        for term in self._terms.pop(doc_id):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def search(self, query: str, namespace: str, k: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            n = len(self._records)
+            if not n:
+                return []
+            avg_length = self._total_length / n or 1
+            scores: Dict[str, float] = defaultdict(float)
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    if self._records[doc_id]["namespace"] != namespace:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avg_length)
+                    scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+            # Equal scores go to the more recent operation
+            top = heapq.nlargest(
+                k, scores.items(), key=lambda item: (item[1], self._records[item[0]]["timestamp"])
+            )
+            return [dict(self._records[doc_id], score=round(score, 3)) for doc_id, score in top]
+
+
+class AgentCoreMemoryBackend(RetrievalBackend):
+    """Searches the semantic records AgentCore Memory extracts from conversation events"""
+
+    def __init__(self, memory_client, memory_id: str):
+        self.memory_client = memory_client
+        self.memory_id = memory_id
+
+    def add(self, record: Dict[str, Any]):
+        # The memory strategy extracts its own records from the events we write
+        pass
+
+    def search(self, query: str, namespace: str, k: int) -> List[Dict[str, Any]]:
+        records = self.memory_client.retrieve_memories(
+            memory_id=self.memory_id,
+            namespace=namespace,
+            query=query,
+            top_k=k
+        )
+        return [
+            {
+                "id": r.get("memoryRecordId"),
+                "namespace": namespace,
+                "text": r.get("content", {}).get("text", ""),
+                "score": r.get("score"),
+            }
+            for r in records
+        ]
+
+
+def default_backend(memory_client=None, memory_id: Optional[str] = None) -> RetrievalBackend:
+    if OPERATIONS_BACKEND == 'agentcore' and memory_client and memory_id:
+        return AgentCoreMemoryBackend(memory_client, memory_id)
+    return BM25Backend(max_records=OPERATIONS_MAX_RECORDS)
+
+
+def _batch_outcomes(calls: List[dict], status: str, result_text: str) -> List[tuple]:
+    """(status, text) of each call of a run_tools_in_parallel batch.
+
+    The batch returns one entry per call, in call order and tagged with the
+    call id. Calls missing from an unparseable result take the batch's
+    status if it failed and "unknown" otherwise, without any text.
+    """
+    try:
+        entries = json.loads(result_text)
+    except ValueError:
+        entries = None
+    if not isinstance(entries, list):
+        entries = []
+    by_id = {e.get("id"): e for e in entries if isinstance(e, dict) and e.get("id")}
+    fallback = (status if status != "success" else "unknown", "")
+    outcomes = []
+    for position, call in enumerate(calls):
+        entry = by_id.get(call.get("id")) if call.get("id") else None
+        if entry is None and position < len(entries) and isinstance(entries[position], dict):
+            entry = entries[position]
+        if entry is None:
+            outcomes.append(fallback)
+            continue
+        text = " ".join(c.get("text", "") for c in entry.get("content") or [] if isinstance(c, dict))
+        outcomes.append((entry.get("status") or "unknown", text))
+    return outcomes
+
+
+class OperationsIndex:
+    """Indexes the R1/O2 operations the agent performs and retrieves the relevant ones.
+
+    Mutating tool calls (rApp lifecycle, deployments, subscriptions, alarm
+    actions) seen in the agent's messages become short records. The newest
+    max_records are kept in a local JSONL file so history survives restarts,
+    and are searched per actor namespace through a pluggable RetrievalBackend.
+    """
+
+    def __init__(self, backend: Optional[RetrievalBackend] = None, path: Optional[str] = DEFAULT_OPERATIONS_PATH,
+                 top_k: int = OPERATIONS_TOP_K, max_records: int = OPERATIONS_MAX_RECORDS):
+        self.backend = backend or BM25Backend(max_records=max_records)
+        self.path = path
+        self.top_k = top_k
+        self.max_records = max_records
+        self._pending_tool_uses: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._recent: "deque[str]" = deque(maxlen=max_records)
+        self._lines = 0
+        self._load()
+
+    def _load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self._lines += 1
+                    self._recent.append(line.rstrip("\n"))
+        except OSError:
+            return
+        for line in self._recent:
+            try:
+                self.backend.add(json.loads(line))
+            except (ValueError, KeyError):
+                continue
+        if self._lines > self.max_records:
+            with self._lock:
+                self._compact()
+
+    def _append(self, record: Dict[str, Any]):
+        if not self.path:
+            return
+        line = json.dumps(record)
+        try:
+            with self._lock:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line + "\n")
+                self._recent.append(line)
+                self._lines += 1
+                if self._lines >= 2 * self.max_records:
+                    self._compact()
+        except OSError as e:
+            print(f"Operations index save error: {e}")
+
+    def _compact(self):
+        """Rewrite the file with only the newest max_records records"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.writelines(line + "\n" for line in self._recent)
+            os.replace(tmp_path, self.path)
+            self._lines = len(self._recent)
+        except OSError as e:
+            print(f"Operations index compaction error: {e}")
+
+    @staticmethod
+    def namespace(actor_id: str) -> str:
+        return OPERATIONS_NAMESPACE.format(actorId=actor_id)
+
+    def add_operation(self, actor_id: str, name: str, arguments: Optional[dict], status: str,
+                      result_text: str = "", timestamp: Optional[float] = None) -> Dict[str, Any]:
+        timestamp = timestamp or time.time()
+        args = ", ".join(f"{k}={v}" for k, v in (arguments or {}).items() if v is not None)
+        when = time.strftime('%Y-%m-%d %H:%M', time.gmtime(timestamp))
+        text = f"{when} {name}({args}) -> {status}: {' '.join(result_text.split())}"
+        if len(text) > OPERATION_TEXT_MAX_CHARS:
+            text = text[:OPERATION_TEXT_MAX_CHARS] + "…"
+        record = {
+            "id": f"{actor_id}:{timestamp:.6f}:{name}",
+            "namespace": self.namespace(actor_id),
+            "tool": name,
+            "status": status,
+            "timestamp": timestamp,
+            "text": text,
+        }
+        self.backend.add(record)
+        self._append(record)
+        return record
+
+    def observe(self, actor_id: str, message: Dict[str, Any]):
+        """Record the operations in an agent message (toolUse then matching toolResult)"""
+        for block in message.get("content", []):
+            if "toolUse" in block:
+                tool_use = block["toolUse"]
+                self._pending_tool_uses[tool_use.get("toolUseId")] = tool_use
+            elif "toolResult" in block:
+                result = block["toolResult"]
+                tool_use = self._pending_tool_uses.pop(result.get("toolUseId"), None)
+                if not tool_use:
+                    continue
+                status = result.get("status", "unknown")
+                result_text = " ".join(c.get("text", "") for c in result.get("content", []) if "text" in c)
+                if tool_use.get("name") == BATCH_TOOL_NAME:
+                    calls = (tool_use.get("input") or {}).get("calls") or []
+                    outcomes = _batch_outcomes(calls, status, result_text)
+                else:
+                    calls = [{"name": tool_use.get("name"), "arguments": tool_use.get("input")}]
+                    outcomes = [(status, result_text)]
+                for call, (call_status, call_text) in zip(calls, outcomes):
+                    if call.get("name") and classify_tool(call["name"]) == MUTATING:
+                        self.add_operation(actor_id, call["name"], call.get("arguments"), call_status, call_text)
+
+    def search(self, actor_id: str, query: str, k: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.backend.search(query, self.namespace(actor_id), k or self.top_k)
+
+    def render(self, actor_id: str, query: str) -> str:
+        """Top-k relevant operations as prompt lines, or "" when nothing matches"""
+        try:
+            with profile_span("memory retrieve operations", "memory") as span_args:
+                records = self.search(actor_id, query)
+                span_args["records"] = len(records)
+        except Exception as e:
+            print(f"Operations retrieval error: {e}")
+            return ""
+        return "\n".join(f"- {r['text']}" for r in records if r.get("text"))
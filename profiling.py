@@ -0,0 +1,310 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Startup and per-turn profiling for the agent and MCP server entrypoints.
+
+Set STARTUP_PROFILE=1 to record how long each import and each startup phase
+takes. Import this module before anything heavy so the import timer sees the
+whole import graph; with profiling off every helper here is a no-op.
+
+TurnProfiler records the timeline of one agent turn (credentials, MCP
+sessions, model calls, tool calls, memory) as a Chrome trace, viewable in
+chrome://tracing or Perfetto. Enable it per request with "profile": true in
+the payload, or for every request with TURN_PROFILE=1.
+"""
+
+import importlib.abc
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+STARTUP_PROFILE = os.environ.get('STARTUP_PROFILE', '').lower() in ('1', 'true', 'yes')
+STARTUP_REPORT_TOP = int(os.environ.get('STARTUP_REPORT_TOP', '15'))
+TURN_PROFILE = os.environ.get('TURN_PROFILE', '').lower() in ('1', 'true', 'yes')
+TURN_PROFILE_DIR = os.environ.get('TURN_PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'oran_agent_traces'))
+
+_process_start = time.perf_counter()
+_phases: List[Tuple[str, str, float, float]] = []
+# module -> [self seconds, cumulative seconds], like python -X importtime
+_imports: Dict[str, List[float]] = {}
+_lock = threading.Lock()
+
+
+def since_start() -> float:
+    """Seconds since this module was first imported"""
+    return time.perf_counter() - _process_start
+
+
+@contextmanager
+def phase(name: str):
+    """Record the wall-clock duration of a startup phase"""
+    if not STARTUP_PROFILE:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        with _lock:
+            _phases.append((name, threading.current_thread().name, start - _process_start, end - start))
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader, timer: "ImportTimer"):
+        self._loader = loader
+        self._timer = timer
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._timer.enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.exit(module.__name__)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path finder that times module execution, per thread and nested"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+            self._local.finding = set()
+        return self._local.stack
+
+    def find_spec(self, fullname, path, target=None):
+        self._stack()
+        if fullname in self._local.finding:
+            return None
+        self._local.finding.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                        spec.loader = _TimedLoader(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._local.finding.discard(fullname)
+
+    def enter(self, name: str):
+        # [name, start, time spent in nested imports]
+        self._stack().append([name, time.perf_counter(), 0.0])
+
+    def exit(self, name: str):
+        stack = self._stack()
+        entry = stack.pop()
+        cumulative = time.perf_counter() - entry[1]
+        if stack:
+            stack[-1][2] += cumulative
+        with _lock:
+            _imports[name] = [cumulative - entry[2], cumulative]
+
+
+_import_timer = None
+
+
+def enable_import_timing():
+    global _import_timer
+    if _import_timer is None:
+        _import_timer = ImportTimer()
+        sys.meta_path.insert(0, _import_timer)
+
+
+def startup_report(label: str, top: int = STARTUP_REPORT_TOP):
+    """Print startup phases and the most expensive imports recorded so far"""
+    if not STARTUP_PROFILE:
+        return
+    with _lock:
+        phases = list(_phases)
+        imports = dict(_imports)
+    print(f"=== Startup profile: {label} at {since_start() * 1000:.0f} ms ===")
+    for name, thread, start, duration in sorted(phases, key=lambda p: p[2]):
+        print(f"  {start * 1000:8.0f} ms +{duration * 1000:8.1f} ms  {name} [{thread}]")
+
+    # Top-level packages by the time their own modules spent executing
+    packages: Dict[str, float] = {}
+    for name, (self_time, _) in imports.items():
+        root = name.split('.')[0]
+        packages[root] = packages.get(root, 0.0) + self_time
+    print(f"  imports: {len(imports)} modules, {sum(packages.values()) * 1000:.0f} ms")
+    print("  self [ms] | package")
+    for root, self_time in sorted(packages.items(), key=lambda p: -p[1])[:top]:
+        print(f"  {self_time * 1000:9.1f} | {root}")
+    print("  self [ms] | cumulative [ms] | module")
+    for name, (self_time, cumulative) in sorted(imports.items(), key=lambda i: -i[1][1])[:top]:
+        print(f"  {self_time * 1000:9.1f} | {cumulative * 1000:15.1f} | {name}")
+
+
+class TurnProfiler:
+    """Timeline of one agent turn, emitted in Chrome trace event format.
+
+    Only one turn is profiled at a time per process: begin() makes the
+    profiler active for every thread, so spans recorded by tool worker
+    threads and the memory writer land on the same timeline.
+    """
+
+    def __init__(self, name: str = "agent turn"):
+        self.name = name
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def begin(cls, name: str = "agent turn") -> "TurnProfiler":
+        global _active_profiler
+        profiler = cls(name)
+        _active_profiler = profiler
+        return profiler
+
+    def _us(self, t: float) -> float:
+        return round((t - self.start) * 1e6, 1)
+
+    def add_span(self, name: str, category: str, start: float, end: float, **args):
+        """Record a completed span from perf_counter() start and end times"""
+        thread = threading.current_thread()
+        event = {
+            "name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": thread.ident,
+            "ts": self._us(start), "dur": round((end - start) * 1e6, 1),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._threads.setdefault(thread.ident, thread.name)
+            self.events.append(event)
+
+    def add_instant(self, name: str, category: str, t: float, **args):
+        thread = threading.current_thread()
+        event = {"name": name, "cat": category, "ph": "i", "s": "t", "pid": os.getpid(),
+                 "tid": thread.ident, "ts": self._us(t)}
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._threads.setdefault(thread.ident, thread.name)
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name: str, category: str, **args):
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.add_span(name, category, start, time.perf_counter(), **args)
+
+    def summary(self) -> Dict[str, float]:
+        """Milliseconds per category, plus the whole turn and the first model TTFT"""
+        totals: Dict[str, float] = {}
+        ttft = None
+        with self._lock:
+            for event in self.events:
+                if event["ph"] != "X" or event.get("args", {}).get("nested"):
+                    continue
+                totals[event["cat"]] = totals.get(event["cat"], 0.0) + event["dur"] / 1000
+                if ttft is None and "ttft_ms" in event.get("args", {}):
+                    ttft = event["args"]["ttft_ms"]
+        summary = {f"{category}_ms": round(total, 1) for category, total in sorted(totals.items())}
+        summary["turn_ms"] = round(((self.end or time.perf_counter()) - self.start) * 1000, 1)
+        if ttft is not None:
+            summary["first_model_ttft_ms"] = ttft
+        return summary
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self._threads)
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms", "otherData": self.summary()}
+
+    def finish(self, save: bool = True) -> Dict[str, Any]:
+        """Close the turn, write the trace file and return the trace"""
+        global _active_profiler
+        self.end = time.perf_counter()
+        self.add_span(self.name, "turn", self.start, self.end)
+        if _active_profiler is self:
+            _active_profiler = None
+        trace = self.to_chrome_trace()
+        if save:
+            try:
+                os.makedirs(TURN_PROFILE_DIR, exist_ok=True)
+                stamp = time.strftime('%Y%m%d-%H%M%S')
+                path = os.path.join(TURN_PROFILE_DIR, f"turn-{stamp}-{os.getpid()}-{id(self):x}.json")
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(trace, f)
+                trace["otherData"]["traceFile"] = path
+                print(f"Turn profile: {trace['otherData']}")
+            except OSError as e:
+                print(f"Turn profile save error: {e}")
+        return trace
+
+
+_active_profiler: Optional[TurnProfiler] = None
+
+
+def active_profiler() -> Optional[TurnProfiler]:
+    return _active_profiler
+
+
+@contextmanager
+def profile_span(name: str, category: str, **args):
+    """Record a span on the active turn profile, if any; yields its args dict"""
+    profiler = _active_profiler
+    if profiler is None:
+        yield args
+        return
+    with profiler.span(name, category, **args) as span_args:
+        yield span_args
+
+
+def instrument_model(model):
+    """Wrap model.stream so profiled turns record each model call and its time to first token"""
+    stream = model.stream
+
+    async def profiled_stream(*args, **kwargs):
+        profiler = _active_profiler
+        if profiler is None:
+            async for event in stream(*args, **kwargs):
+                yield event
+            return
+        start = time.perf_counter()
+        first_token = None
+        span_args: Dict[str, Any] = {}
+        try:
+            async for event in stream(*args, **kwargs):
+                if first_token is None and "contentBlockDelta" in event:
+                    first_token = time.perf_counter()
+                    span_args["ttft_ms"] = round((first_token - start) * 1000, 1)
+                    profiler.add_instant("first token", "model", first_token)
+                if "metadata" in event:
+                    span_args["usage"] = event["metadata"].get("usage")
+                yield event
+        finally:
+            profiler.add_span("model call", "model", start, time.perf_counter(), **span_args)
+
+    model.stream = profiled_stream
+    return model
+
+
+if STARTUP_PROFILE:
+    enable_import_timing()
@@ -0,0 +1,235 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from strands.tools.mcp.mcp_client import MCPClient
+
+from profiling import active_profiler, profile_span
+
+TOOL_RESULT_TTL_SECONDS = 60
+TOOL_RESULT_MAX_ENTRIES = 256
+
+READ_ONLY = "read_only"
+MUTATING = "mutating"
+
+# Explicit classification of the R1 and O2 server tools; anything not listed
+# falls back to its name prefix and unknown tools are treated as mutating
+TOOL_CLASSIFICATION = {
+    # R1
+    "get_rapps": READ_ONLY,
+    "get_rapp": READ_ONLY,
+    "get_rapp_instances": READ_ONLY,
+    "get_rapp_instance": READ_ONLY,
+    "create_rapp": MUTATING,
+    "delete_rapp": MUTATING,
+    "prime_rapp": MUTATING,
+    "create_rapp_instance": MUTATING,
+    "delete_rapp_instance": MUTATING,
+    "deploy_rapp_instance": MUTATING,
+    # O2
+    "get_inventory_api_versions": READ_ONLY,
+    "get_monitoring_api_versions": READ_ONLY,
+    "get_ocloud_info": READ_ONLY,
+    "get_deployment_managers": READ_ONLY,
+    "get_deployment_manager": READ_ONLY,
+    "get_resource_pools": READ_ONLY,
+    "get_resource_pool": READ_ONLY,
+    "get_resources": READ_ONLY,
+    "get_resource": READ_ONLY,
+    "get_resource_types": READ_ONLY,
+    "get_resource_type": READ_ONLY,
+    "get_subscriptions": READ_ONLY,
+    "get_subscription": READ_ONLY,
+    "get_alarm_subscriptions": READ_ONLY,
+    "get_alarm_subscription": READ_ONLY,
+    "get_alarms": READ_ONLY,
+    "get_alarm": READ_ONLY,
+    "create_subscription": MUTATING,
+    "delete_subscription": MUTATING,
+    "create_alarm_subscription": MUTATING,
+    "delete_alarm_subscription": MUTATING,
+    "patch_alarm": MUTATING,
+    "create_test_alarm": MUTATING,
+    "simulate_smo_registration": MUTATING,
+    # Agent-side tool that pages through a compacted result (result_compactor.PAGE_TOOL_NAME)
+    "page_tool_result": READ_ONLY,
+}
+
+READ_ONLY_PREFIXES = ("get_", "list_", "describe_")
+
+
+def classify_tool(name: str) -> str:
+    if name in TOOL_CLASSIFICATION:
+        return TOOL_CLASSIFICATION[name]
+    return READ_ONLY if name.startswith(READ_ONLY_PREFIXES) else MUTATING
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        # Omitted and explicitly-null optional arguments mean the same thing
+        return {k: _normalize(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def cache_key(server_type: str, name: str, arguments: Optional[dict]) -> str:
+    normalized = json.dumps(_normalize(arguments or {}), sort_keys=True, separators=(',', ':'), default=str)
+    return f"{server_type}:{name}:{normalized}"
+
+
+class ToolResultCache:
+    """TTL + LRU cache of read-only MCP tool results.
+
+    Every server has a generation counter that a mutating call bumps when it
+    starts and again when it ends, whether it succeeded or raised; results of
+    reads that overlapped a mutation on the same server are not stored.
+    """
+
+    def __init__(self, ttl: float = TOOL_RESULT_TTL_SECONDS, max_entries: int = TOOL_RESULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str, dict]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, server_type: str, name: str, arguments: Optional[dict]) -> Tuple[Optional[dict], int]:
+        """Return (cached result or None, server generation to pass to record)"""
+        with self._lock:
+            if classify_tool(name) != READ_ONLY:
+                # The server may change as soon as the call is sent
+                self._invalidate(server_type)
+                return None, self._generations[server_type]
+            generation = self._generations.get(server_type, 0)
+            key = cache_key(server_type, name, arguments)
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[2]), generation
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return None, generation
+
+    def record(self, server_type: str, name: str, arguments: Optional[dict], result: dict, generation: int):
+        """Store a read result, or invalidate the server after a mutating call"""
+        with self._lock:
+            if classify_tool(name) != READ_ONLY:
+                self._invalidate(server_type)
+                return
+            if result.get("status") != "success" or self._generations.get(server_type, 0) != generation:
+                return
+            key = cache_key(server_type, name, arguments)
+            self._entries[key] = (time.monotonic() + self.ttl, server_type, copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record_failure(self, server_type: str, name: str):
+        """A call raised; a mutation may still have partly applied"""
+        if classify_tool(name) != READ_ONLY:
+            self.invalidate(server_type)
+
+    def invalidate(self, server_type: str):
+        with self._lock:
+            self._invalidate(server_type)
+
+    def _invalidate(self, server_type: str):
+        self._generations[server_type] = self._generations.get(server_type, 0) + 1
+        for key in [k for k, entry in self._entries.items() if entry[1] == server_type]:
+            del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class CachingMCPClient(MCPClient):
+    """MCPClient that serves repeated read-only tool calls from a ToolResultCache"""
+
+    def __init__(self, transport_callable, server_type: str, result_cache: Optional[ToolResultCache] = None,
+                 compactor=None, **kwargs):
+        super().__init__(transport_callable, **kwargs)
+        self.server_type = server_type
+        self.result_cache = result_cache if result_cache is not None else ToolResultCache()
+        # Optional ResultCompactor; the cache keeps full results, the model gets compacted ones
+        self.compactor = compactor
+        # Round trip of a trivial request, measured when a turn is profiled
+        self.round_trip_ms: Optional[float] = None
+
+    def start(self):
+        with profile_span(f"mcp session {self.server_type}", "mcp"):
+            client = super().start()
+        if active_profiler() is not None:
+            # A listing is answered from the server's memory, so its latency
+            # approximates the network and protocol overhead of every call
+            with profile_span(f"mcp round trip {self.server_type}", "mcp") as span_args:
+                start = time.perf_counter()
+                self.list_tools_sync()
+                self.round_trip_ms = round((time.perf_counter() - start) * 1000, 1)
+                span_args["round_trip_ms"] = self.round_trip_ms
+        return client
+
+    def _record_call(self, name: str, start: float, cached: bool):
+        """Add the call to the active turn profile, split into network and server time"""
+        profiler = active_profiler()
+        if profiler is None:
+            return
+        end = time.perf_counter()
+        total_ms = (end - start) * 1000
+        args = {"server": self.server_type, "cached": cached, "total_ms": round(total_ms, 1)}
+        if not cached and self.round_trip_ms is not None:
+            network_ms = min(self.round_trip_ms, total_ms)
+            args["network_ms_est"] = round(network_ms, 1)
+            args["server_ms_est"] = round(total_ms - network_ms, 1)
+            # Half the round trip on each side of the server's share
+            half = network_ms / 2000
+            server_end = end - half
+            profiler.add_span("network", "tool", start, start + half, nested=True)
+            profiler.add_span("server", "tool", start + half, server_end, nested=True)
+            profiler.add_span("network", "tool", server_end, end, nested=True)
+        profiler.add_span(f"tool {name}", "tool", start, end, **args)
+
+    def _compact(self, name: str, result: dict) -> dict:
+        return self.compactor.compact(name, result) if self.compactor is not None else result
+
+    def call_tool_sync(self, tool_use_id, name, arguments=None, *args, **kwargs):
+        start = time.perf_counter()
+        cached, generation = self.result_cache.lookup(self.server_type, name, arguments)
+        if cached is not None:
+            self._record_call(name, start, cached=True)
+            return self._compact(name, dict(cached, toolUseId=tool_use_id))
+        try:
+            result = super().call_tool_sync(tool_use_id, name, arguments, *args, **kwargs)
+        except BaseException:
+            self.result_cache.record_failure(self.server_type, name)
+            raise
+        self.result_cache.record(self.server_type, name, arguments, result, generation)
+        self._record_call(name, start, cached=False)
+        return self._compact(name, result)
+
+    async def call_tool_async(self, tool_use_id, name, arguments=None, *args, **kwargs):
+        start = time.perf_counter()
+        cached, generation = self.result_cache.lookup(self.server_type, name, arguments)
+        if cached is not None:
+            self._record_call(name, start, cached=True)
+            return self._compact(name, dict(cached, toolUseId=tool_use_id))
+        try:
+            result = await super().call_tool_async(tool_use_id, name, arguments, *args, **kwargs)
+        except BaseException:
+            self.result_cache.record_failure(self.server_type, name)
+            raise
+        self.result_cache.record(self.server_type, name, arguments, result, generation)
+        self._record_call(name, start, cached=False)
+        return self._compact(name, result)
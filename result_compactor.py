@@ -0,0 +1,206 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from strands import tool
+
+from profiling import profile_span
+
+TOOL_RESULT_COMPACTION = os.environ.get('TOOL_RESULT_COMPACTION', '1') != '0'
+# A list result is compacted when it has more items or more characters than this
+COMPACT_MAX_ITEMS = int(os.environ.get('TOOL_RESULT_COMPACT_ITEMS', '10'))
+COMPACT_MAX_CHARS = int(os.environ.get('TOOL_RESULT_COMPACT_CHARS', '6000'))
+COMPACT_PREVIEW_ITEMS = 3
+COMPACT_TOP_VALUES = 5
+# Fields with more distinct values than this are ids or free text, not worth a distribution
+COMPACT_MAX_DISTINCT = 20
+
+HANDLE_TTL_SECONDS = 1800
+HANDLE_MAX_ENTRIES = 64
+PAGE_MAX_ITEMS = 50
+
+PAGE_TOOL_NAME = "page_tool_result"
+
+
+def _result_items(result: dict) -> Optional[List[Any]]:
+    """The list a tool returned, or None when the result is not a list"""
+    structured = result.get("structuredContent")
+    if isinstance(structured, dict) and isinstance(structured.get("result"), list):
+        return structured["result"]
+    texts = [c["text"] for c in result.get("content", []) if "text" in c]
+    if len(texts) != len(result.get("content", [])) or not texts:
+        return None
+    try:
+        values = [json.loads(text) for text in texts]
+    except ValueError:
+        return None
+    # FastMCP sends a list as one text block per item
+    if len(values) == 1:
+        return values[0] if isinstance(values[0], list) else None
+    return values
+
+
+def _scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def _shallow(item: Any) -> Any:
+    """An item with nested objects and lists replaced by their size"""
+    if not isinstance(item, dict):
+        return item
+    shallow = {}
+    for key, value in item.items():
+        if isinstance(value, dict):
+            shallow[key] = f"{{{len(value)} fields}}"
+        elif isinstance(value, list):
+            shallow[key] = f"[{len(value)} items]"
+        else:
+            shallow[key] = value
+    return shallow
+
+
+def summarize_items(items: List[Any]) -> Dict[str, Any]:
+    """Counts, per-field value distributions and numeric ranges of a list of records"""
+    fields: Dict[str, Dict[str, Any]] = {}
+    records = [item for item in items if isinstance(item, dict)]
+    keys: Dict[str, None] = {}
+    for record in records:
+        keys.update(dict.fromkeys(record))
+    for key in keys:
+        values = [record[key] for record in records if key in record]
+        if not all(_scalar(v) for v in values):
+            fields[key] = {"present": len(values), "type": "nested"}
+            continue
+        numbers = [v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+        counts = Counter(json.dumps(v) if not isinstance(v, str) else v for v in values)
+        summary: Dict[str, Any] = {"present": len(values), "distinct": len(counts)}
+        if numbers and len(numbers) == len(values):
+            summary.update(min=min(numbers), max=max(numbers), mean=round(sum(numbers) / len(numbers), 3))
+        elif len(counts) <= COMPACT_MAX_DISTINCT:
+            summary["top"] = counts.most_common(COMPACT_TOP_VALUES)
+        fields[key] = summary
+    return {"total_items": len(items), "fields": fields}
+
+
+class HandleStore:
+    """TTL + LRU store of full tool results, addressed by handle"""
+
+    def __init__(self, ttl: float = HANDLE_TTL_SECONDS, max_entries: int = HANDLE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str, List[Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, tool_name: str, items: List[Any], text: str) -> str:
+        # Identical results (e.g. served from the result cache) share a handle
+        handle = f"{tool_name}-{hashlib.sha1(text.encode('utf-8')).hexdigest()[:10]}"
+        with self._lock:
+            self._entries[handle] = (time.monotonic() + self.ttl, tool_name, items)
+            self._entries.move_to_end(handle)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return handle
+
+    def get(self, handle: str) -> Optional[Tuple[str, List[Any]]]:
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[handle]
+                return None
+            self._entries.move_to_end(handle)
+            return entry[1], entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class ResultCompactor:
+    """Replaces large list results with a summary before they reach the model.
+
+    The full list is kept in a HandleStore; the summary carries its handle,
+    counts, per-field distributions and the first few items, and the model
+    pages through the rest with the page_tool_result tool.
+    """
+
+    def __init__(self, store: Optional[HandleStore] = None, max_items: int = COMPACT_MAX_ITEMS,
+                 max_chars: int = COMPACT_MAX_CHARS, enabled: bool = TOOL_RESULT_COMPACTION):
+        self.store = store or HandleStore()
+        self.max_items = max_items
+        self.max_chars = max_chars
+        self.enabled = enabled
+        self.compacted = 0
+        self.chars_saved = 0
+
+    def compact(self, name: str, result: dict) -> dict:
+        """Return result unchanged, or compacted when it is a large list"""
+        if not self.enabled or result.get("status") != "success":
+            return result
+        items = _result_items(result)
+        if items is None:
+            return result
+        text = json.dumps(items, default=str)
+        if len(items) <= self.max_items and len(text) <= self.max_chars:
+            return result
+        with profile_span(f"compact {name}", "tool") as span_args:
+            handle = self.store.put(name, items, text)
+            summary = dict(handle=handle, tool=name, **summarize_items(items))
+            summary["preview"] = [_shallow(item) for item in items[:COMPACT_PREVIEW_ITEMS]]
+            summary["note"] = (
+                f"Showing {min(len(items), COMPACT_PREVIEW_ITEMS)} of {len(items)} items. "
+                f"Call {PAGE_TOOL_NAME} with this handle to read the full items."
+            )
+            compact_text = json.dumps(summary, default=str)
+            span_args.update(items=len(items), chars=len(text), compact_chars=len(compact_text))
+        self.compacted += 1
+        self.chars_saved += max(len(text) - len(compact_text), 0)
+        compacted = {k: v for k, v in result.items() if k != "structuredContent"}
+        compacted["content"] = [{"text": compact_text}]
+        return compacted
+
+    def page(self, handle: str, offset: int = 0, limit: int = 20, fields: Optional[List[str]] = None) -> dict:
+        entry = self.store.get(handle)
+        if entry is None:
+            return {"error": f"Unknown or expired handle {handle}; call the original tool again"}
+        _, items = entry
+        offset = max(offset, 0)
+        limit = min(max(limit, 1), PAGE_MAX_ITEMS)
+        page = items[offset:offset + limit]
+        if fields:
+            page = [{k: v for k, v in item.items() if k in fields} if isinstance(item, dict) else item
+                    for item in page]
+        next_offset = offset + len(page)
+        return {
+            "handle": handle,
+            "total_items": len(items),
+            "offset": offset,
+            "items": page,
+            "next_offset": next_offset if next_offset < len(items) else None,
+        }
+
+    def as_tool(self):
+        """Expose paging through compacted results to the model"""
+        compactor = self
+
+        @tool
+        def page_tool_result(handle: str, offset: int = 0, limit: int = 20, fields: Optional[List[str]] = None) -> dict:
+            """Read items of a large tool result that was summarized with a handle.
+
+            Args:
+                handle: The handle from the summarized result
+                offset: Index of the first item to return
+                limit: Number of items to return (at most 50)
+                fields: Only return these fields of each item, to keep the page small
+            """
+            return compactor.page(handle, offset, limit, fields)
+
+        return page_tool_result
@@ -0,0 +1,74 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from profiling import TurnProfiler, profile_span
+
+
+def to_stream_event(event: Dict[str, Any], seen_tools: set) -> Optional[Dict[str, Any]]:
+    """Map a strands stream event to the compact event sent to clients"""
+    if "data" in event:
+        return {"type": "token", "text": event["data"]}
+    if "current_tool_use" in event:
+        tool_use = event["current_tool_use"]
+        tool_use_id = tool_use.get("toolUseId")
+        # The model streams tool input incrementally; announce each tool once
+        if tool_use_id and tool_use_id not in seen_tools:
+            seen_tools.add(tool_use_id)
+            return {"type": "tool_start", "toolUseId": tool_use_id, "name": tool_use.get("name")}
+        return None
+    if "message" in event:
+        results = [
+            block["toolResult"] for block in event["message"].get("content", []) if "toolResult" in block
+        ]
+        if results:
+            return {
+                "type": "tool_result",
+                "results": [{"toolUseId": r.get("toolUseId"), "status": r.get("status")} for r in results]
+            }
+        return None
+    if "result" in event:
+        result = event["result"]
+        return {"type": "done", "message": result.message, "stopReason": str(result.stop_reason)}
+    return None
+
+
+async def stream_agent_response(setup: Callable[[], Tuple[Any, List[Any]]], user_input: str,
+                                profile: bool = False) -> AsyncIterator[Dict[str, Any]]:
+    """Run the agent and yield tokens and tool progress as they happen.
+
+    Returned from the AgentCore entrypoint, the runtime sends each yielded
+    dict to the caller as a server-sent event. setup() returns the agent and
+    its MCP clients; it runs, and a profiled turn begins, only once the
+    stream is consumed, so a stream that never is leaves nothing behind.
+    With profile set the last event is {"type": "profile", "trace": ...}.
+    """
+    start = time.perf_counter()
+    profiler = TurnProfiler.begin() if profile else None
+    entered = []
+    try:
+        # Flush something before the MCP sessions and the first model call
+        yield {"type": "start"}
+
+        with profile_span("get agent", "setup"):
+            agent, mcp_clients = await asyncio.to_thread(setup)
+        for client in mcp_clients:
+            await asyncio.to_thread(client.__enter__)
+            entered.append(client)
+
+        seen_tools: set = set()
+        async for event in agent.stream_async(user_input):
+            stream_event = to_stream_event(event, seen_tools)
+            if stream_event:
+                if stream_event["type"] == "done":
+                    stream_event["elapsedMs"] = round((time.perf_counter() - start) * 1000)
+                yield stream_event
+    finally:
+        for client in reversed(entered):
+            await asyncio.to_thread(client.__exit__, None, None, None)
+        trace = profiler.finish() if profiler else None
+    if trace:
+        yield {"type": "profile", "trace": trace}
@@ -0,0 +1,312 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""Per-tool spans and metrics for MCP and strands tool handlers.
+
+Decorate a handler with @instrument_tool (below @mcp.tool() or @tool) to
+record its latency, errors and result cardinality, and the request and
+response payload sizes. Sizing serializes the payload, so it is done for
+every call only while the Prometheus endpoint runs; otherwise for calls
+whose trace is sampled plus a TOOL_PAYLOAD_SAMPLE_RATE share of the rest.
+Metrics and spans go through the OpenTelemetry API, so under
+opentelemetry-instrument they are exported over OTLP; without an SDK they
+are no-ops. The same numbers are kept in-process and, when TOOL_METRICS_PORT
+is set, served in Prometheus text format on /metrics.
+"""
+
+import asyncio
+import functools
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from opentelemetry import metrics as otel_metrics
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_metrics = None
+    otel_trace = None
+
+TOOL_TELEMETRY = os.environ.get('TOOL_TELEMETRY', '1') != '0'
+TOOL_METRICS_PORT = os.environ.get('TOOL_METRICS_PORT')
+TOOL_SERVER_NAME = os.environ.get('TOOL_SERVER_NAME', 'tools')
+# Share of calls whose payloads are sized regardless of trace sampling
+TOOL_PAYLOAD_SAMPLE_RATE = float(os.environ.get('TOOL_PAYLOAD_SAMPLE_RATE', '0.1'))
+
+# Latency histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def payload_size(value: Any) -> int:
+    """Size in bytes of a value as it would travel as JSON"""
+    try:
+        return len(json.dumps(value, default=str).encode('utf-8'))
+    except (TypeError, ValueError):
+        return len(str(value).encode('utf-8'))
+
+
+def result_cardinality(result: Any) -> int:
+    """Number of items a tool returned: list length, or the largest list inside a dict"""
+    if result is None:
+        return 0
+    if isinstance(result, (list, tuple, set)):
+        return len(result)
+    if isinstance(result, dict):
+        lists = [len(v) for v in result.values() if isinstance(v, (list, tuple))]
+        return max(lists) if lists else 1
+    return 1
+
+
+def _is_error(result: Any) -> bool:
+    # Handlers report lookups that fail as {"error": ...} rather than raising
+    return isinstance(result, dict) and "error" in result
+
+
+class ToolStats:
+    """In-process counters and latency histogram for one tool"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency_sum_ms = 0.0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        # Calls whose payloads were sized
+        self.sized_calls = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.items = 0
+
+    def observe(self, latency_ms: float, bytes_in: Optional[int], bytes_out: Optional[int], items: int,
+                error: bool):
+        self.calls += 1
+        self.errors += int(error)
+        self.latency_sum_ms += latency_ms
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                self.latency_buckets[i] += 1
+                break
+        else:
+            self.latency_buckets[-1] += 1
+        if bytes_in is not None:
+            self.sized_calls += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out or 0
+        self.items += items
+
+
+class ToolTelemetry:
+    """Records tool calls to OpenTelemetry and to an in-process registry"""
+
+    def __init__(self, server: str = TOOL_SERVER_NAME):
+        self.server = server
+        self._stats: Dict[str, ToolStats] = {}
+        self._lock = threading.Lock()
+        self._http_server = None
+        self._tracer = otel_trace.get_tracer("oran.tools") if otel_trace else None
+        if otel_metrics:
+            meter = otel_metrics.get_meter("oran.tools")
+            self._duration = meter.create_histogram("tool.duration", unit="ms", description="Tool handler latency")
+            self._request_size = meter.create_histogram("tool.request.size", unit="By", description="Tool arguments size")
+            self._response_size = meter.create_histogram("tool.response.size", unit="By", description="Tool result size")
+            self._items = meter.create_histogram("tool.result.items", description="Items returned per call")
+            self._calls = meter.create_counter("tool.calls", description="Tool calls")
+            self._errors = meter.create_counter("tool.errors", description="Tool calls that raised or returned an error")
+
+    def record(self, tool: str, latency_ms: float, bytes_in: Optional[int], bytes_out: Optional[int], items: int,
+               error: bool):
+        """Record one call; bytes_in and bytes_out are None when the payloads were not sized"""
+        with self._lock:
+            stats = self._stats.setdefault(tool, ToolStats())
+            stats.observe(latency_ms, bytes_in, bytes_out, items, error)
+        if otel_metrics:
+            attributes = {"tool": tool, "server": self.server}
+            self._duration.record(latency_ms, attributes)
+            if bytes_in is not None:
+                self._request_size.record(bytes_in, attributes)
+                self._response_size.record(bytes_out or 0, attributes)
+            self._items.record(items, attributes)
+            self._calls.add(1, attributes)
+            if error:
+                self._errors.add(1, attributes)
+
+    def should_size(self, span) -> bool:
+        """Whether to size this call's payloads"""
+        if self._http_server is not None or (span is not None and span.is_recording()):
+            return True
+        return random.random() < TOOL_PAYLOAD_SAMPLE_RATE
+
+    def span(self, tool: str):
+        if self._tracer is None:
+            return _NullSpan()
+        return self._tracer.start_as_current_span(
+            f"tool {tool}", attributes={"tool.name": tool, "tool.server": self.server}
+        )
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Per-tool totals, slowest tools first"""
+        with self._lock:
+            rows = {
+                tool: {
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "latency_ms_total": round(s.latency_sum_ms, 3),
+                    "latency_ms_avg": round(s.latency_sum_ms / s.calls, 2) if s.calls else 0.0,
+                    "sized_calls": s.sized_calls,
+                    "bytes_in": s.bytes_in,
+                    "bytes_out": s.bytes_out,
+                    "items": s.items,
+                }
+                for tool, s in self._stats.items()
+            }
+        return dict(sorted(rows.items(), key=lambda row: -row[1]["latency_ms_total"]))
+
+    def prometheus(self) -> str:
+        """Registry in Prometheus text exposition format"""
+        with self._lock:
+            stats = sorted(self._stats.items())
+            lines: List[str] = ["# TYPE tool_duration_ms histogram"]
+            for tool, s in stats:
+                labels = f'tool="{tool}",server="{self.server}"'
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS_MS, s.latency_buckets):
+                    cumulative += count
+                    lines.append(f'tool_duration_ms_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'tool_duration_ms_bucket{{{labels},le="+Inf"}} {s.calls}')
+                lines.append(f"tool_duration_ms_sum{{{labels}}} {s.latency_sum_ms:.3f}")
+                lines.append(f"tool_duration_ms_count{{{labels}}} {s.calls}")
+            counters = (
+                ("tool_calls_total", "calls"), ("tool_errors_total", "errors"), ("tool_sized_calls_total", "sized_calls"),
+                ("tool_request_bytes_total", "bytes_in"), ("tool_response_bytes_total", "bytes_out"),
+                ("tool_result_items_total", "items"),
+            )
+            for metric, attribute in counters:
+                lines.append(f"# TYPE {metric} counter")
+                for tool, s in stats:
+                    lines.append(f'{metric}{{tool="{tool}",server="{self.server}"}} {getattr(s, attribute)}')
+        return "\n".join(lines) + "\n"
+
+    def serve_prometheus(self, port: int):
+        """Serve /metrics on a daemon thread"""
+        if self._http_server is not None:
+            return
+        telemetry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = telemetry.prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._http_server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+        threading.Thread(target=self._http_server.serve_forever, name='tool-metrics', daemon=True).start()
+        print(f"Tool metrics on http://0.0.0.0:{port}/metrics")
+
+
+class _NullSpan:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_telemetry = ToolTelemetry()
+
+
+def configure_telemetry(server: Optional[str] = None, metrics_port: Optional[int] = None) -> ToolTelemetry:
+    """Set the server label and start the Prometheus endpoint if a port is configured"""
+    if server:
+        _telemetry.server = server
+    port = metrics_port or (int(TOOL_METRICS_PORT) if TOOL_METRICS_PORT else None)
+    if port:
+        try:
+            _telemetry.serve_prometheus(port)
+        except OSError as e:
+            print(f"Tool metrics endpoint error: {e}")
+    return _telemetry
+
+
+def get_telemetry() -> ToolTelemetry:
+    return _telemetry
+
+
+def _request_size(span, args: tuple, kwargs: dict) -> Optional[int]:
+    """Request payload size if this call is sized, else None"""
+    if not _telemetry.should_size(span):
+        return None
+    return payload_size([args, kwargs] if args else kwargs)
+
+
+def _finish(span, name: str, start: float, bytes_in: Optional[int], result: Any, error: bool):
+    latency_ms = (time.perf_counter() - start) * 1000
+    bytes_out = None
+    if bytes_in is not None:
+        bytes_out = payload_size(result) if result is not None else 0
+    items = result_cardinality(result)
+    error = error or _is_error(result)
+    _telemetry.record(name, latency_ms, bytes_in, bytes_out, items, error)
+    if span is not None:
+        if bytes_in is not None:
+            span.set_attribute("tool.request.bytes", bytes_in)
+            span.set_attribute("tool.response.bytes", bytes_out)
+        span.set_attribute("tool.result.items", items)
+        span.set_attribute("tool.error", error)
+
+
+def instrument_tool(func: Callable = None, *, name: Optional[str] = None):
+    """Record a span and metrics for every call of a tool handler.
+
+    Place it directly above the function, under @mcp.tool() or @tool, so the
+    framework registers the instrumented handler with the original signature.
+    """
+    if func is None:
+        return functools.partial(instrument_tool, name=name)
+    if not TOOL_TELEMETRY:
+        return func
+    tool_name = name or func.__name__
+
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with _telemetry.span(tool_name) as span:
+                bytes_in = _request_size(span, args, kwargs)
+                start = time.perf_counter()
+                result, error = None, False
+                try:
+                    result = await func(*args, **kwargs)
+                    return result
+                except Exception:
+                    error = True
+                    raise
+                finally:
+                    _finish(span, tool_name, start, bytes_in, result, error)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _telemetry.span(tool_name) as span:
+            bytes_in = _request_size(span, args, kwargs)
+            start = time.perf_counter()
+            result, error = None, False
+            try:
+                result = func(*args, **kwargs)
+                return result
+            except Exception:
+                error = True
+                raise
+            finally:
+                _finish(span, tool_name, start, bytes_in, result, error)
+    return wrapper
@@ -1,42 +1,37 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 
-import boto3
 import json
 import requests
 import sys
+import time
 
 # Global constant for request timeout
 REQUEST_TIMEOUT_SECONDS = 300
 import urllib.parse
 
-# Accept agent name as argument, default to oran_agent
-agent_name = sys.argv[1] if len(sys.argv) > 1 else "oran_agent"
+from token_provider import get_token_provider
+
+# Accept agent name as argument, default to oran_agent; --stream prints the response as it is generated,
+# --profile saves a Chrome trace of the turn
+args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+agent_name = args[0] if args else "oran_agent"
+stream = '--stream' in sys.argv
+profile = '--profile' in sys.argv
 print(f"Testing agent: {agent_name}")
 
-# Initialize AWS clients
-ssm_client = boto3.client('ssm', region_name='us-east-1')
-secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-cognito_client = boto3.client('cognito-idp', region_name='us-east-1')
+# SSM parameters, secrets and tokens are cached by the shared provider
+provider = get_token_provider('us-east-1')
 
 # Get agent ARN from SSM parameter
-agent_arn = ssm_client.get_parameter(Name=f'/agent/{agent_name}/runtime/agent_arn')["Parameter"]["Value"]
+agent_arn = provider.get_parameter(f'/agent/{agent_name}/runtime/agent_arn')
 print(f"Using Agent ARN: {agent_arn}")
 
 # Get Cognito credentials from Secrets Manager
-cognito_secret = secrets_client.get_secret_value(SecretId=f'/agent/{agent_name}/cognito/credentials')
-cognito_creds = json.loads(cognito_secret['SecretString'])
+cognito_creds = json.loads(provider.get_secret(f'/agent/{agent_name}/cognito/credentials'))
 
 # Get authentication token
-auth_response = cognito_client.initiate_auth(
-    ClientId=cognito_creds['client_id'],
-    AuthFlow='USER_PASSWORD_AUTH',
-    AuthParameters={
-        'USERNAME': 'testuser',
-        'PASSWORD': 'MyPassword123!'
-    }
-)
-token = auth_response['AuthenticationResult']['AccessToken']
+token = provider.get_token(cognito_creds['client_id'])
 
 # Use requests for OAuth support
 url = f"https://bedrock-agentcore.us-east-1.amazonaws.com/runtimes/{urllib.parse.quote(agent_arn, safe='')}/invocations"
@@ -45,14 +40,66 @@ headers = {
     'Content-Type': 'application/json'
 }
 payload = {"prompt": "Using the O2 interface, do I have any O-Cloud resources supplied by Intel?"}
+if profile:
+    payload["profile"] = True
+
+
+def save_profile(trace):
+    """Write a turn trace for chrome://tracing or Perfetto and print its summary"""
+    path = f"turn-profile-{int(time.time())}.json"
+    with open(path, 'w') as f:
+        json.dump(trace, f)
+    print(f"\nTurn profile: {json.dumps(trace.get('otherData', {}))}")
+    print(f"Trace saved to {path}")
+
+
+def stream_response(url, headers, payload):
+    """Print server-sent events from a streaming invocation as they arrive"""
+    start = time.perf_counter()
+    first_event = None
+    headers = dict(headers, Accept='text/event-stream')
+    with requests.post(url, headers=headers, json=dict(payload, stream=True), stream=True,
+                       timeout=(10, REQUEST_TIMEOUT_SECONDS)) as response:
+        response.raise_for_status()
+        print(f"Response status: {response.status_code}")
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith('data: '):
+                continue
+            if first_event is None:
+                first_event = time.perf_counter() - start
+                print(f"Time to first event: {first_event:.2f}s\n")
+            event = json.loads(line[len('data: '):])
+            if not isinstance(event, dict):
+                continue
+            if event.get('type') == 'token':
+                print(event['text'], end='', flush=True)
+            elif event.get('type') == 'tool_start':
+                print(f"\n🔧 {event['name']}...", flush=True)
+            elif event.get('type') == 'tool_result':
+                for result in event['results']:
+                    print(f"   {result['status']}", flush=True)
+            elif event.get('type') == 'done':
+                print(f"\n\nCompleted in {event['elapsedMs'] / 1000:.2f}s ({event['stopReason']})")
+            elif event.get('type') == 'profile':
+                save_profile(event['trace'])
+            elif 'error' in event:
+                print(f"\nError: {event['error']}")
+
 
 print(f"USER PROMPT: {payload['prompt']}")
+if stream:
+    stream_response(url, headers, payload)
+    sys.exit(0)
+
 response = requests.post(url, headers=headers, json=payload, timeout=REQUEST_TIMEOUT_SECONDS)
 response.raise_for_status()
 print(f"Response status: {response.status_code}")
 
 if response.status_code == 200:
     response_data = response.json()
+    if profile and isinstance(response_data, dict) and 'profile' in response_data:
+        save_profile(response_data.pop('profile'))
+        response_data = response_data['message']
     assistant_text = response_data
     print("\n" + "="*50)
     print("AGENT RESPONSE:")
@@ -0,0 +1,230 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import boto3
+from botocore.exceptions import ClientError
+
+from profiling import profile_span
+
+# Test user provisioned by cognito_utils.setup_cognito_user_pool()
+COGNITO_USERNAME = 'testuser'
+COGNITO_PASSWORD = 'MyPassword123!'
+
+# Tokens are refreshed in the background this long before they expire
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+# Callers never get a token that expires within this window
+TOKEN_EXPIRY_SKEW_SECONDS = 30
+# SSM parameters (agent ARN, client id) only change on redeploy
+PARAMETER_TTL_SECONDS = 900
+
+
+class CognitoTokenProvider:
+    """Shared credential provider for MCP and agent runtime clients.
+
+    Caches SSM parameters and Cognito access tokens, refreshes tokens in the
+    background with REFRESH_TOKEN_AUTH before they expire, and coalesces
+    concurrent refreshes for the same client into a single Cognito call.
+    The SSM, Secrets Manager and Cognito clients can be injected so the
+    provider can run against local fakes (see fakes.py).
+    """
+
+    def __init__(self, region: Optional[str] = None, ssm_client=None, cognito_client=None,
+                 secrets_client=None, username: str = COGNITO_USERNAME, password: str = COGNITO_PASSWORD,
+                 refresh_margin: float = TOKEN_REFRESH_MARGIN_SECONDS,
+                 expiry_skew: float = TOKEN_EXPIRY_SKEW_SECONDS,
+                 parameter_ttl: float = PARAMETER_TTL_SECONDS,
+                 background_refresh: bool = True):
+        self.region = region or boto3.Session().region_name
+        self._ssm_client = ssm_client
+        self._cognito_client = cognito_client
+        self._secrets_client = secrets_client
+        self.username = username
+        self.password = password
+        self.refresh_margin = refresh_margin
+        self.expiry_skew = expiry_skew
+        self.parameter_ttl = parameter_ttl
+        self.background_refresh = background_refresh
+
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._parameters: Dict[str, Tuple[str, float]] = {}
+        self._secrets: Dict[str, Tuple[str, float]] = {}
+        self._tokens: Dict[str, dict] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+        self._closed = False
+
+    @property
+    def ssm_client(self):
+        if self._ssm_client is None:
+            self._ssm_client = boto3.client('ssm', region_name=self.region)
+        return self._ssm_client
+
+    @property
+    def cognito_client(self):
+        if self._cognito_client is None:
+            self._cognito_client = boto3.client('cognito-idp', region_name=self.region)
+        return self._cognito_client
+
+    @property
+    def secrets_client(self):
+        if self._secrets_client is None:
+            self._secrets_client = boto3.client('secretsmanager', region_name=self.region)
+        return self._secrets_client
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def _cached_lookup(self, cache: Dict[str, Tuple[str, float]], key: str, fetch) -> str:
+        cached = cache.get(key)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        with self._key_lock(key):
+            # Another thread may have fetched the value while we waited
+            cached = cache.get(key)
+            if cached and cached[1] > time.monotonic():
+                return cached[0]
+            with profile_span(f"fetch {key}", "auth", nested=True):
+                value = fetch()
+            cache[key] = (value, time.monotonic() + self.parameter_ttl)
+            return value
+
+    def get_parameter(self, name: str) -> str:
+        """Get an SSM parameter value, cached for parameter_ttl seconds"""
+        return self._cached_lookup(
+            self._parameters, f"ssm:{name}",
+            lambda: self.ssm_client.get_parameter(Name=name)['Parameter']['Value']
+        )
+
+    def get_secret(self, secret_id: str) -> str:
+        """Get a Secrets Manager secret string, cached for parameter_ttl seconds"""
+        return self._cached_lookup(
+            self._secrets, f"secret:{secret_id}",
+            lambda: self.secrets_client.get_secret_value(SecretId=secret_id)['SecretString']
+        )
+
+    def get_token(self, client_id: str) -> str:
+        """Get a valid Cognito access token for the app client"""
+        entry = self._tokens.get(client_id)
+        if entry and time.monotonic() < entry['expires_at'] - self.expiry_skew:
+            return entry['access_token']
+
+        with self._key_lock(f"token:{client_id}"):
+            # Coalesce: whoever held the lock before us already refreshed
+            entry = self._tokens.get(client_id)
+            if entry and time.monotonic() < entry['expires_at'] - self.expiry_skew:
+                return entry['access_token']
+            with profile_span("cognito token refresh", "auth", nested=True):
+                return self._refresh(client_id)['access_token']
+
+    def invalidate_token(self, client_id: str):
+        """Drop a cached token, e.g. after the runtime rejected it with a 401"""
+        with self._key_lock(f"token:{client_id}"):
+            self._tokens.pop(client_id, None)
+
+    def _refresh(self, client_id: str) -> dict:
+        """Fetch a new token; caller must hold the client's token lock"""
+        previous = self._tokens.get(client_id)
+        result = None
+        if previous and previous.get('refresh_token'):
+            try:
+                result = self.cognito_client.initiate_auth(
+                    ClientId=client_id,
+                    AuthFlow='REFRESH_TOKEN_AUTH',
+                    AuthParameters={'REFRESH_TOKEN': previous['refresh_token']}
+                )['AuthenticationResult']
+            except ClientError as e:
+                print(f"Token refresh failed, re-authenticating: {e}")
+
+        if result is None:
+            result = self.cognito_client.initiate_auth(
+                ClientId=client_id,
+                AuthFlow='USER_PASSWORD_AUTH',
+                AuthParameters={'USERNAME': self.username, 'PASSWORD': self.password}
+            )['AuthenticationResult']
+
+        now = time.monotonic()
+        lifetime = result.get('ExpiresIn', 3600)
+        entry = {
+            'access_token': result['AccessToken'],
+            # REFRESH_TOKEN_AUTH does not return a new refresh token
+            'refresh_token': result.get('RefreshToken') or (previous or {}).get('refresh_token'),
+            'expires_at': now + lifetime,
+            # Short-lived tokens are refreshed half way through their lifetime
+            'refresh_at': now + lifetime - min(self.refresh_margin, lifetime / 2),
+        }
+        self._tokens[client_id] = entry
+        self._schedule_refresh(client_id, entry)
+        return entry
+
+    def _schedule_refresh(self, client_id: str, entry: dict):
+        if not self.background_refresh or self._closed:
+            return
+        delay = max(entry['refresh_at'] - time.monotonic(), 0)
+        timer = threading.Timer(delay, self._background_refresh, args=(client_id,))
+        timer.daemon = True
+        with self._lock:
+            previous = self._timers.pop(client_id, None)
+            if previous:
+                previous.cancel()
+            self._timers[client_id] = timer
+        timer.start()
+
+    def _background_refresh(self, client_id: str):
+        with self._key_lock(f"token:{client_id}"):
+            if self._closed:
+                return
+            entry = self._tokens.get(client_id)
+            # Skip if a caller already refreshed after this timer was armed
+            if entry and time.monotonic() < entry['refresh_at']:
+                return
+            try:
+                self._refresh(client_id)
+            except Exception as e:
+                # Callers fall back to a synchronous refresh once the token expires
+                print(f"Background token refresh failed: {e}")
+
+    def get_runtime_url(self, agent_arn: str) -> str:
+        encoded_arn = agent_arn.replace(':', '%3A').replace('/', '%2F')
+        return f"https://bedrock-agentcore.{self.region}.amazonaws.com/runtimes/{encoded_arn}/invocations?qualifier=DEFAULT"
+
+    def get_mcp_connection(self, server_type: str) -> Tuple[str, Dict[str, str]]:
+        """Return (mcp_url, headers) for an MCP server deployed to AgentCore Runtime"""
+        with profile_span(f"credentials {server_type}", "auth"):
+            agent_arn = self.get_parameter(f'/mcp_server/{server_type}/runtime/agent_arn')
+            client_id = self.get_parameter(f'/mcp_server/{server_type}/runtime/client_id')
+            headers = {
+                "authorization": f"Bearer {self.get_token(client_id)}",
+                "Content-Type": "application/json",
+                "Accept": "application/json, text/event-stream"
+            }
+        return self.get_runtime_url(agent_arn), headers
+
+    def close(self):
+        """Cancel pending background refreshes"""
+        with self._lock:
+            self._closed = True
+            timers = list(self._timers.values())
+            self._timers.clear()
+        for timer in timers:
+            timer.cancel()
+
+
+_providers: Dict[str, CognitoTokenProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_token_provider(region: Optional[str] = None) -> CognitoTokenProvider:
+    """Process-wide provider for a region, shared by all MCP clients in that region"""
+    region = region or boto3.Session().region_name
+    with _providers_lock:
+        if region not in _providers:
+            _providers[region] = CognitoTokenProvider(region=region)
+        return _providers[region]
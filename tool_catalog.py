@@ -0,0 +1,187 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from mcp.types import Tool as MCPTool
+from strands.tools.mcp.mcp_agent_tool import MCPAgentTool
+from strands.tools.registry import ToolRegistry
+
+# Bump when the on-disk layout changes; older files are ignored
+TOOL_CATALOG_VERSION = 1
+DEFAULT_CATALOG_PATH = os.environ.get(
+    'TOOL_CATALOG_PATH', os.path.join(tempfile.gettempdir(), 'oran_agent_tool_catalog.json')
+)
+
+
+def tool_list_hash(tools: List[dict]) -> str:
+    """Stable hash of a tool list, independent of server ordering"""
+    canonical = json.dumps(sorted(tools, key=lambda t: t.get('name', '')), sort_keys=True)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ToolCatalogCache:
+    """Versioned on-disk cache of MCP tool schemas keyed by server ARN"""
+
+    def __init__(self, path: str = DEFAULT_CATALOG_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._servers: Dict[str, dict] = self._load()
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != TOOL_CATALOG_VERSION:
+            return {}
+        return data.get('servers', {})
+
+    def get(self, server_arn: str) -> Optional[dict]:
+        """Return {"hash", "tools", "updated"} for a server, if cached"""
+        entry = self._servers.get(server_arn)
+        if not entry or tool_list_hash(entry.get('tools', [])) != entry.get('hash'):
+            return None
+        return entry
+
+    def put(self, server_arn: str, tools: List[dict]) -> bool:
+        """Store a server's tools; returns True if the tool list changed"""
+        digest = tool_list_hash(tools)
+        with self._lock:
+            previous = self._servers.get(server_arn)
+            if previous and previous.get('hash') == digest:
+                return False
+            self._servers[server_arn] = {'hash': digest, 'tools': tools, 'updated': time.time()}
+            self._save()
+        return True
+
+    def _save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': TOOL_CATALOG_VERSION, 'servers': self._servers}, f)
+            # Atomic so concurrent starts never read a half-written file
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Tool catalog save error: {e}")
+
+
+class ToolCatalog:
+    """Loads MCP tools from the cache and revalidates them in the background.
+
+    servers maps a server type ('r1', 'o2') to the MCPClient the agent serves
+    requests with; tools are always bound to those clients. Discovery uses a
+    separate client from client_factory so it never collides with an open
+    serving session.
+    """
+
+    def __init__(self, servers: Dict[str, object], client_factory: Callable[[str], object],
+                 arn_resolver: Callable[[str], str], cache: Optional[ToolCatalogCache] = None):
+        self.servers = servers
+        self.client_factory = client_factory
+        self.arn_resolver = arn_resolver
+        self.cache = cache or ToolCatalogCache()
+        self._stale: List[str] = []
+        # Bound tools currently served, per server type
+        self.tools: Dict[str, List[MCPAgentTool]] = {}
+
+    def _bind(self, server_type: str, tools: List[dict]) -> List[MCPAgentTool]:
+        client = self.servers[server_type]
+        return [MCPAgentTool(MCPTool.model_validate(t), client) for t in tools]
+
+    def _discover(self, server_type: str) -> List[dict]:
+        client = self.client_factory(server_type)
+        with client:
+            tools = client.list_tools_sync()
+        tool_dicts = [t.mcp_tool.model_dump(mode='json', by_alias=True, exclude_none=True) for t in tools]
+        self.cache.put(self.arn_resolver(server_type), tool_dicts)
+        return tool_dicts
+
+    def load_tools(self) -> List[MCPAgentTool]:
+        """Return tools for every server, discovering uncached servers in parallel"""
+        cached: Dict[str, List[dict]] = {}
+        missing: List[str] = []
+        for server_type in self.servers:
+            try:
+                entry = self.cache.get(self.arn_resolver(server_type))
+            except Exception as e:
+                print(f"Failed to resolve {server_type.upper()} server ARN: {e}")
+                continue
+            if entry:
+                cached[server_type] = entry['tools']
+            else:
+                missing.append(server_type)
+        self._stale = list(cached)
+
+        discovered = self._discover_all(missing)
+        for server_type in self.servers:
+            tools = cached.get(server_type) or discovered.get(server_type) or []
+            self.tools[server_type] = self._bind(server_type, tools)
+        return self.all_tools()
+
+    def all_tools(self) -> List[MCPAgentTool]:
+        """Every server's current tools, in server order"""
+        return [t for server_type in self.servers for t in self.tools.get(server_type, [])]
+
+    def _discover_all(self, server_types: List[str]) -> Dict[str, List[dict]]:
+        results: Dict[str, List[dict]] = {}
+        if not server_types:
+            return results
+        with ThreadPoolExecutor(max_workers=len(server_types)) as pool:
+            futures = {server_type: pool.submit(self._discover, server_type) for server_type in server_types}
+            for server_type, future in futures.items():
+                try:
+                    results[server_type] = future.result()
+                except Exception as e:
+                    print(f"Failed to get {server_type.upper()} tools: {e}")
+        return results
+
+    def revalidate_async(self, on_change: Optional[Callable[[str, List[MCPAgentTool]], None]] = None) -> threading.Thread:
+        """Re-list tools of servers served from cache; call on_change for servers whose tools changed.
+
+        self.tools already holds the new list when on_change runs.
+        """
+        stale = list(self._stale)
+
+        def revalidate():
+            previous = {}
+            for server_type in stale:
+                try:
+                    entry = self.cache.get(self.arn_resolver(server_type))
+                except Exception as e:
+                    print(f"Failed to resolve {server_type.upper()} server ARN: {e}")
+                    entry = None
+                # A missing entry (invalidated or unreadable cache) counts as changed
+                previous[server_type] = tool_list_hash(entry['tools']) if entry else None
+            for server_type, tools in self._discover_all(stale).items():
+                if tool_list_hash(tools) != previous[server_type]:
+                    print(f"{server_type.upper()} tool list changed, refreshing agent tools")
+                    self.tools[server_type] = self._bind(server_type, tools)
+                    if on_change:
+                        on_change(server_type, self.tools[server_type])
+
+        thread = threading.Thread(target=revalidate, name='tool-catalog-revalidate', daemon=True)
+        thread.start()
+        return thread
+
+
+def refresh_agent_tools(agent, tools: List) -> None:
+    """Rebuild a running agent's tool registry from its full tool list.
+
+    Tools a server stopped listing are dropped. The new registry is swapped
+    in as a whole, so a turn in flight keeps a consistent view.
+    """
+    registry = ToolRegistry()
+    registry.process_tools(tools)
+    registry.initialize_tools()
+    agent.tool_registry = registry
@@ -0,0 +1,141 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+from strands import tool
+
+# Concurrent calls allowed per MCP server session
+DEFAULT_SERVER_CONCURRENCY = 4
+
+
+class MultiServerToolExecutor:
+    """Dispatches a batch of MCP tool calls concurrently across servers.
+
+    Calls to different servers run in parallel, calls to the same server are
+    capped by a per-server semaphore, and a call listing ids in depends_on
+    only starts once all of those calls have finished successfully.
+    """
+
+    def __init__(self, servers: Dict[str, Any], max_concurrency: Optional[Dict[str, int]] = None,
+                 default_concurrency: int = DEFAULT_SERVER_CONCURRENCY):
+        self.servers = servers
+        limits = max_concurrency or {}
+        self._semaphores = {
+            server_type: threading.BoundedSemaphore(limits.get(server_type, default_concurrency))
+            for server_type in servers
+        }
+        self._tool_servers: Dict[str, str] = {}
+        self._pool = ThreadPoolExecutor(
+            max_workers=sum(limits.get(s, default_concurrency) for s in servers),
+            thread_name_prefix='mcp-tool'
+        )
+
+    def register_tools(self, tools):
+        """Learn which server owns each MCP tool from the agent's full tool list.
+
+        Tools missing from the list, e.g. ones a server stopped listing, are forgotten.
+        """
+        clients = {id(client): server_type for server_type, client in self.servers.items()}
+        tool_servers = {}
+        for agent_tool in tools:
+            server_type = clients.get(id(getattr(agent_tool, 'mcp_client', None)))
+            if server_type:
+                tool_servers[agent_tool.tool_name] = server_type
+        self._tool_servers = tool_servers
+
+    def set_tool_server(self, tool_name: str, server_type: str):
+        self._tool_servers[tool_name] = server_type
+
+    def _call(self, call: dict) -> dict:
+        server_type = call.get('server') or self._tool_servers.get(call['name'])
+        if server_type not in self.servers:
+            return {"status": "error", "content": [{"text": f"Unknown tool or server for {call['name']}"}]}
+        with self._semaphores[server_type]:
+            start = time.perf_counter()
+            result = self.servers[server_type].call_tool_sync(
+                tool_use_id=call['id'], name=call['name'], arguments=call.get('arguments') or {}
+            )
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        return {
+            "status": result.get("status"),
+            "content": result.get("content", []),
+            "server": server_type,
+            "elapsedMs": round(elapsed_ms, 1)
+        }
+
+    def run(self, calls: List[dict]) -> List[dict]:
+        """Execute calls [{"id", "name", "arguments", "depends_on", "server"}], results in input order"""
+        calls = [dict(c, id=c.get('id') or f"call-{uuid.uuid4().hex[:8]}") for c in calls]
+        by_id = {c['id']: c for c in calls}
+        if len(by_id) != len(calls):
+            # Results and depends_on are keyed by id, so the whole batch is refused
+            seen, duplicates = set(), []
+            for call in calls:
+                if call['id'] in seen and call['id'] not in duplicates:
+                    duplicates.append(call['id'])
+                seen.add(call['id'])
+            error = {"status": "error", "content": [{"text": f"Duplicate call ids {duplicates}; nothing was run"}]}
+            return [dict(error, id=call['id'], name=call['name']) for call in calls]
+        results: Dict[str, dict] = {}
+
+        for call in calls:
+            unknown = [d for d in call.get('depends_on') or [] if d not in by_id]
+            if unknown:
+                results[call['id']] = {"status": "error", "content": [{"text": f"Unknown dependencies {unknown}"}]}
+
+        running = {}
+        started = set()
+        while True:
+            for call in calls:
+                if call['id'] in results or call['id'] in started:
+                    continue
+                deps = call.get('depends_on') or []
+                if all(d in results for d in deps):
+                    failed = [d for d in deps if results[d].get('status') != 'success']
+                    if failed:
+                        results[call['id']] = {"status": "error", "content": [{"text": f"Skipped: dependencies failed {failed}"}]}
+                    else:
+                        running[self._pool.submit(self._call, call)] = call['id']
+                        started.add(call['id'])
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                call_id = running.pop(future)
+                try:
+                    results[call_id] = future.result()
+                except Exception as e:
+                    results[call_id] = {"status": "error", "content": [{"text": str(e)}]}
+
+        # Anything left unresolved is part of a dependency cycle
+        ordered = []
+        for call in calls:
+            result = results.get(call['id']) or {"status": "error", "content": [{"text": "Dependency cycle"}]}
+            ordered.append(dict(result, id=call['id'], name=call['name']))
+        return ordered
+
+    def as_tool(self):
+        """Expose the executor to the model as a batch tool"""
+        executor = self
+
+        @tool
+        def run_tools_in_parallel(calls: List[Dict[str, Any]]) -> List[dict]:
+            """Run several R1/O2 tools in one step instead of one tool per turn.
+
+            Independent calls run concurrently across the R1 and O2 servers.
+            Use depends_on to order a call after others it needs to see first.
+
+            Args:
+                calls: List of {"id": str, "name": tool name, "arguments": dict, "depends_on": [ids]}
+            """
+            return executor.run(calls)
+
+        return run_tools_in_parallel
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)